@@ -1,21 +1,37 @@
 from ..utils.colors import RGB_Color, DARK_YELLOW, DARK_RED
 from ..move import Move
 from ..logics import (
-    get_possible_moves,
+    Position,
+    ZobristKeys,
     possition_under_attack,
-    is_valid,
     any_valid_moves,
     get_valid_moves,
 )
+from ..logics.bitboard import (
+    WHITE,
+    BLACK,
+    WHITE_SHORT_CASTLE,
+    WHITE_LONG_CASTLE,
+    BLACK_SHORT_CASTLE,
+    BLACK_LONG_CASTLE,
+    color_names,
+    get_square,
+    get_pos,
+)
+from ..logics.position import START_FEN
 from ..engine import (
     get_best_move,
+    create_worker_pool,
+    WorkerPool,
+    TranspositionTable,
+    SearchStats,
+    OpeningBook,
 )
 
 from typing import Literal
 from random import choice
 
 import sys
-import json
 import pygame
 
 pygame.init()
@@ -32,6 +48,7 @@ class Board:
         highlight_color: RGB_Color,
         font_color: RGB_Color,
         background_color: RGB_Color,
+        start_fen: str = START_FEN,
     ) -> None:
         """initialize a board and store it's arguments.
 
@@ -44,6 +61,7 @@ class Board:
             highlight_color (RGB_Color): highlight_color
             font_color (RGB_Color): font_color
             background_color (RGB_Color): background_color
+            start_fen (str): FEN of the possition the games start from
 
         Returns:
             None:
@@ -110,17 +128,11 @@ class Board:
             "bK",
         ]
 
-        # initial state of a chess board. "__" represent empty squares.
-        self.board_state: list[list[str]] = [
-            ["bR", "bN", "bB", "bQ", "bK", "bB", "bN", "bR"],
-            ["bP", "bP", "bP", "bP", "bP", "bP", "bP", "bP"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["wP", "wP", "wP", "wP", "wP", "wP", "wP", "wP"],
-            ["wR", "wN", "wB", "wQ", "wK", "wB", "wN", "wR"],
-        ]
+        # state of the chess board set up by load_fen. "__" represent empty squares.
+        self.board_state: list[list[str]] = []
+
+        # FEN of the possition the games start from, loaded again by reset_board
+        self.start_fen: str = start_fen
 
         # a uniqe integer representing the board state for each possition.
         self.board_hash: int = 0
@@ -134,13 +146,10 @@ class Board:
         # a string representing from which side the board is shown. "w" for white and "b" for black
         self.view: str = "w"
 
-        # initial possition of kings in the board state
-        self.king_possitions: dict[str, tuple[int, int]] = {"w": (7, 4), "b": (0, 4)}
+        # possition of kings in the board state
+        self.king_possitions: dict[str, tuple[int, int]] = {}
 
-        self.castle_rights: dict[str, dict[str, bool]] = {
-            "w": {"short": True, "long": True},
-            "b": {"short": True, "long": True},
-        }
+        self.castle_rights: dict[str, dict[str, bool]] = {}
 
         self.checks: dict[str, bool] = {"w": False, "b": False}
 
@@ -183,6 +192,13 @@ class Board:
 
         self.fifty_move_rule: int = 0
 
+        # bitboard possition used by the move generator and the engine
+        self.position: Position = Position()
+
+        # possition the game started from, it keeps the en_passant square and the
+        # move number of the FEN that can't be found from the board_state.
+        self.start_position: Position = Position()
+
         self.piece_images: dict[str, pygame.surface.Surface] = {}
 
         self.load_piece_images()
@@ -193,48 +209,40 @@ class Board:
         # possition of selected_piece in board_state
         self.selected_piece: tuple[int, int] | None = None
 
-        with open(r"./packages/utils/openings_list.json", "r") as openings_data_file:
-            # a list of known opening database
-            self.openings: list[dict[str, str | list[str]]] = json.load(
-                openings_data_file
-            )
-
-        with open(r"./packages/utils/zobrist_hash_keys.json", "r") as zobrist_hash_file:
-            # hash keys generated to create board_hash
-            self.zobrist_hash_keys: dict[str, int] = json.load(zobrist_hash_file)
+        # compiled opening book, probed with the board_hash
+        self.opening_book: OpeningBook | None = OpeningBook.from_file(
+            r"./packages/utils/opening_book.bin"
+        )
 
-        with open(r"./packages/utils/transposition_table.json", "r") as hash_file:
-            # database of stored board possitions
-            self.transposition_table: dict[str, float] = json.load(hash_file)
+        # hash keys generated to create board_hash
+        self.zobrist_hash_keys: ZobristKeys = ZobristKeys.from_file(
+            r"./packages/utils/zobrist_hash_keys.json"
+        )
 
-        self.initialize_board_hash()
+        # engine worker processes, started once and reused for every engine move.
+        # the workers split the root moves, so the transposition_table and the draw
+        # avoidance of the root are used. lazy_smp=True searches with Lazy SMP instead.
+        self.worker_pool: WorkerPool = create_worker_pool(self.zobrist_hash_keys)
 
-        pygame.display.set_caption("Chess Game")
+        # scores of the possitions after the root moves of the engine searches, the
+        # workers keep the deeper possitions in their own tables that aren't saved.
+        # the file is created on the first run.
+        self.transposition_table: TranspositionTable = TranspositionTable.from_file(
+            r"./packages/utils/transposition_table.bin", 4
+        )
 
-    def initialize_board_hash(self) -> None:
-        """create the the hash for initial possition.
+        # seconds the engine searches for a move
+        self.engine_move_time: float = 3.0
 
-        Args:
+        # statistics of the last engine search
+        self.search_stats: SearchStats = SearchStats()
 
-        Returns:
-            None:
-        """
-        self.board_hash = 0
+        # write the statistics of every engine search to search_stats.json
+        self.save_search_stats: bool = False
 
-        for row in range(8):
-            for col in range(8):
-                piece = self.board_state[row][col]
-                if piece != "__":
-                    self.board_hash = (
-                        self.board_hash
-                        ^ self.zobrist_hash_keys[f"{piece}_({row},{col})"]
-                    )
+        self.load_fen(self.start_fen)
 
-        for piece in ["wK", "wQ", "bK", "bQ"]:
-            self.board_hash = (
-                self.board_hash ^ self.zobrist_hash_keys[f"{piece}_castle_rights"]
-            )
-        self.board_hash_list = [self.board_hash]
+        pygame.display.set_caption("Chess Game")
 
     def load_piece_images(self) -> None:
         """creating a Surface Image for each piece and scalling them to the size of the cells on the board.
@@ -360,13 +368,7 @@ class Board:
         if not self.new_move:
             return
         self.new_move = False
-        if any_valid_moves(
-            self.board_state,
-            self.turn_to_move,
-            self.king_possitions[self.turn_to_move],
-            self.get_last_move(),
-            self.castle_rights[self.turn_to_move],
-        ):
+        if any_valid_moves(self.position):
             return
 
         if self.checks[self.turn_to_move]:
@@ -400,7 +402,7 @@ class Board:
             self.draw_status_type = "50 move rule"
             return
 
-        if self.board_hash_list.count(self.board_hash) >= 3:
+        if self.position.get_repetition_count() >= 3:
 
             self.draw_status = True
             self.draw_status_type = "Repetition"
@@ -448,54 +450,86 @@ class Board:
         Returns:
             str:
         """
+        return Move.set_row_col_move_notation(move, self.position)
 
-        row_col_notation: str = ""
-        move_list: list[Move] = []
-        row_flag: bool = False
-        col_flag: bool = False
+    def update_position(self) -> None:
+        """update the bitboard possition and the board_hash from the board_state after it's changed.
 
-        if move.moved_piece[1] in ["P", "K"]:
-            return row_col_notation
+        board_hash_list has the hashes of the previous possitions when it's called, without the new one.
 
-        for row in range(8):
-            for col in range(8):
+        Args:
 
-                if (
-                    self.board_state[row][col] == move.moved_piece
-                    and (row, col) != move.start_pos
-                ):
-                    moves_to_check = get_possible_moves(
-                        self.board_state,
-                        (row, col),
-                        self.turn_to_move,
-                        self.get_last_move(),
-                        self.castle_rights[self.turn_to_move],
-                    )
-                    for check_move in moves_to_check:
-                        if move.end_pos == check_move.end_pos and is_valid(
-                            self.board_state,
-                            check_move,
-                            self.turn_to_move,
-                            self.king_possitions[self.turn_to_move],
-                        ):
-                            move_list.append(check_move)
+        Returns:
+            None:
+        """
+        if len(self.move_log) == 0:
+            self.position = self.start_position.copy()
+        else:
+            self.position = Position.from_board_state(
+                self.board_state,
+                self.turn_to_move,
+                self.castle_rights,
+                self.get_last_move(),
+                self.fifty_move_rule,
+            )
+            self.position.full_move_number = (
+                self.start_position.full_move_number
+                + (len(self.move_log) + self.start_position.turn) // 2
+            )
+            self.position.set_zobrist_hash_keys(self.zobrist_hash_keys)
+        self.position.set_hash_history(self.board_hash_list)
+        self.board_hash = self.position.hash
+
+    def load_fen(self, fen: str) -> None:
+        """set up the board from a FEN string and start a new game from it.
+
+        Args:
+            fen (str): fen
 
-        for check_move in move_list:
-            if col_flag is False and move.start_pos[0] == check_move.start_pos[0]:
-                col_flag = True
-            if row_flag is False and move.start_pos[1] == check_move.start_pos[1]:
-                row_flag = True
+        Returns:
+            None:
+        """
+        self.start_position = Position.from_fen(fen, self.zobrist_hash_keys)
+        position = self.start_position
+
+        self.board_state = position.board_state
+        self.turn_to_move = position.turn_to_move
+        self.king_possitions = {
+            color_names[color]: get_pos(position.king_squares[color])
+            for color in [WHITE, BLACK]
+        }
+        self.castle_rights = {
+            side: {
+                "short": bool(position.castle_rights & short_castle),
+                "long": bool(position.castle_rights & long_castle),
+            }
+            for side, short_castle, long_castle in [
+                ("w", WHITE_SHORT_CASTLE, WHITE_LONG_CASTLE),
+                ("b", BLACK_SHORT_CASTLE, BLACK_LONG_CASTLE),
+            ]
+        }
+        self.fifty_move_rule = position.fifty_move_rule
+        self.move_log.clear()
 
-            if row_flag and col_flag:
-                break
+        self.board_hash_list = []
+        self.update_position()
+        self.board_hash_list = [self.board_hash]
 
-        if col_flag:
-            row_col_notation = self.col_to_file[move.start_pos[1]]
+    def get_encoded_move(self, move: Move) -> int | None:
+        """return the valid encoded move with the same start_pos and end_pos as the move.
 
-        if row_flag:
-            row_col_notation += str(self.row_to_rank[move.start_pos[0]])
+        Args:
+            move (Move): move
 
-        return row_col_notation
+        Returns:
+            int | None:
+        """
+        start = get_square(move.start_pos)
+        end = get_square(move.end_pos)
+        for encoded_move in get_valid_moves(self.position):
+            if encoded_move & 63 == start and (encoded_move >> 6) & 63 == end:
+                return encoded_move
+        return None
 
     def get_last_move(self) -> Move | None:
         """get last_move if available.
@@ -525,23 +559,19 @@ class Board:
             move.start_pos != move.end_pos
         ):
 
-            available_moves: list[Move] = get_possible_moves(
-                self.board_state,
-                move.start_pos,
-                self.turn_to_move,
-                self.get_last_move(),
-                self.castle_rights[self.turn_to_move],
-            )
+            if move.is_castle:
+                move.update_end_pos()
+
+            encoded_move = self.get_encoded_move(move)
 
-            if move in available_moves:
+            if encoded_move is not None:
 
+                move.encoded_move = encoded_move
                 move.row_col_notation = self.set_row_col_move_notation(move)
 
                 temp_board_state: list[list[str]] = [
                     list_item.copy() for list_item in self.board_state
                 ]
-                if move.is_castle:
-                    move.update_end_pos()
 
                 p_row, p_col = move.start_pos
 
@@ -552,7 +582,7 @@ class Board:
                     if self.players[self.turn_to_move] == "Human":
                         temp_board_state[s_row][s_col] = self.pawn_promotion()
                     else:
-                        temp_board_state[s_row][s_col] = f"{self.turn_to_move}Q"
+                        temp_board_state[s_row][s_col] = move.promoted_piece
                 else:
                     temp_board_state[s_row][s_col] = move.moved_piece
 
@@ -583,54 +613,52 @@ class Board:
                         ]
                         temp_board_state[s_row][s_col - 2] = "__"
 
-                if not possition_under_attack(
-                    temp_board_state, king_pos, self.turn_to_move
-                ):
+                self.board_state: list[list[str]] = [
+                    list_item.copy() for list_item in temp_board_state
+                ]
 
-                    self.board_state: list[list[str]] = [
-                        list_item.copy() for list_item in temp_board_state
-                    ]
+                move.castle_rights = {
+                    side: self.castle_rights[side].copy()
+                    for side in self.castle_rights.keys()
+                }
 
-                    move.castle_rights = {
-                        side: self.castle_rights[side].copy()
-                        for side in self.castle_rights.keys()
-                    }
+                if king_pos != self.king_possitions[self.turn_to_move]:
 
-                    if king_pos != self.king_possitions[self.turn_to_move]:
+                    self.castle_rights[self.turn_to_move]["short"] = False
+                    self.castle_rights[self.turn_to_move]["long"] = False
 
-                        self.castle_rights[self.turn_to_move]["short"] = False
+                elif move.moved_piece[1] == "R":
+                    if move.start_pos[1] == 0:
                         self.castle_rights[self.turn_to_move]["long"] = False
+                    elif move.start_pos[1] == 7:
+                        self.castle_rights[self.turn_to_move]["short"] = False
 
-                    elif move.moved_piece[1] == "R":
-                        if move.start_pos[1] == "0":
-                            self.castle_rights[self.turn_to_move]["long"] = False
-                        elif move.start_pos[1] == "7":
-                            self.castle_rights[self.turn_to_move]["short"] = False
+                self.king_possitions[self.turn_to_move] = king_pos
+                self.checks[self.turn_to_move] = False
 
-                    self.king_possitions[self.turn_to_move] = king_pos
-                    self.checks[self.turn_to_move] = False
+                self.switch_turn()
 
-                    self.switch_turn()
+                move.set_fifty_move_rule(self.fifty_move_rule)
+                self.fifty_move_rule = move.fifty_move_rule
 
-                    if possition_under_attack(
-                        self.board_state,
-                        self.king_possitions[self.turn_to_move],
-                        self.turn_to_move,
-                    ):
-                        self.checks[self.turn_to_move] = True
-                        move.update_notation("+")
+                if len(self.move_log) > 0:
+                    move.opening_name = self.move_log[-1].opening_name
 
-                    move.set_fifty_move_rule(self.fifty_move_rule)
-                    self.fifty_move_rule = move.fifty_move_rule
+                self.update_move_log(move)
+                self.update_position()
+                self.board_hash_list.append(self.board_hash)
 
-                    if len(self.move_log) > 0:
-                        move.opening_name = self.move_log[-1].opening_name
+                if possition_under_attack(
+                    self.position,
+                    self.position.king_squares[self.position.turn],
+                    self.position.turn,
+                ):
+                    self.checks[self.turn_to_move] = True
+                    move.update_notation("+")
 
-                    self.update_move_log(move)
-                    self.update_board_hash(move)
-                    self.new_move = True
-                    self.update_openings()
-                    self.move_sound(move, self.checks[self.turn_to_move])
+                self.new_move = True
+                self.update_opening_name()
+                self.move_sound(move, self.checks[self.turn_to_move])
 
             self.selected_cell = None
             self.selected_piece = None
@@ -649,8 +677,8 @@ class Board:
         self.new_move = True
         if self.move_log:
 
-            self.board_hash_list.pop()
-            self.board_hash = self.board_hash_list[-1]
+            # the hash of the possition before the move is added again after update_position
+            del self.board_hash_list[-2:]
 
             move = self.move_log.pop()
             self.checkmate = False
@@ -659,7 +687,7 @@ class Board:
             self.draw_status_type = None
 
             if len(self.move_log) == 0:
-                self.fifty_move_rule = 0
+                self.fifty_move_rule = self.start_position.fifty_move_rule
             else:
                 self.fifty_move_rule = self.move_log[-1].fifty_move_rule
 
@@ -691,6 +719,8 @@ class Board:
                 side: move.castle_rights[side].copy()
                 for side in move.castle_rights.keys()
             }
+            self.update_position()
+            self.board_hash_list.append(self.board_hash)
             self.piece_move_sound.play()
             self.play_game_over_sound = True
 
@@ -739,105 +769,32 @@ class Board:
         Returns:
             None:
         """
-        with open(r"./packages/utils/transposition_table.json", "w") as hash_file:
-            json.dump(self.transposition_table, hash_file, indent=2)
+        self.transposition_table.flush()
 
-    def update_board_hash(self, move: Move | None) -> None:
-        """update board_hash after a move.
+    def is_search_cancelled(self) -> bool:
+        """check the events while the engine searches, a key press or quit cancels the search.
 
         Args:
-            move (Move | None): move
 
         Returns:
-            None:
+            bool:
         """
-        if move is None:
-            return
-        s_row, s_col = move.start_pos
-        self.board_hash = (
-            self.board_hash
-            ^ self.zobrist_hash_keys[f"{move.moved_piece}_({s_row},{s_col})"]
-        )
-
-        e_row, e_col = move.end_pos
-        if move.is_en_passant:
-            p_row, p_col = move.en_passant_pos
-            piece = "wP" if move.moved_piece[0] == "b" else "bP"
-            self.board_hash = (
-                self.board_hash ^ self.zobrist_hash_keys[f"{piece}_({p_row},{p_col})"]
-            )
-            self.board_hash = (
-                self.board_hash ^ self.zobrist_hash_keys[f"en_passant_file_{p_col}"]
-            )
-        elif move.captured_piece != "__":
-            self.board_hash = (
-                self.board_hash
-                ^ self.zobrist_hash_keys[f"{move.captured_piece}_({e_row},{e_col})"]
-            )
-        elif move.is_castle:
-            castle_type = move.get_castle_type()
-            side = move.moved_piece[0]
-
-            if castle_type == "short" and side == "w":
-                s_row, s_col = (7, 7)
-                e_row, e_col = (7, 5)
-                self.board_hash = (
-                    self.board_hash ^ self.zobrist_hash_keys["wK_castle_rights"]
-                )
-
-            elif castle_type == "long" and side == "w":
-                s_row, s_col = (7, 0)
-                e_row, e_col = (7, 3)
-                self.board_hash = (
-                    self.board_hash ^ self.zobrist_hash_keys["wQ_castle_rights"]
-                )
-
-            elif castle_type == "short" and side == "b":
-                s_row, s_col = (0, 0)
-                e_row, e_col = (0, 5)
-                self.board_hash = (
-                    self.board_hash ^ self.zobrist_hash_keys["bK_castle_rights"]
-                )
-
-            elif castle_type == "long" and side == "b":
-                s_row, s_col = (0, 0)
-                e_row, e_col = (0, 3)
-                self.board_hash = (
-                    self.board_hash ^ self.zobrist_hash_keys["bQ_castle_rights"]
-                )
-            else:
-                raise ValueError
+        # the engine can't wait for events, it's only checking the ones in the queue.
+        # only the key presses are taken, the other events are left for the game loop
+        # and a quit event is kept so the game is closed once the search has returned.
+        if pygame.event.peek(pygame.QUIT):
+            return True
+        return len(pygame.event.get(pygame.KEYDOWN)) > 0
 
-            self.board_hash = (
-                self.board_hash ^ self.zobrist_hash_keys[f"{side}R_({s_row},{s_col})"]
-            )
-            self.board_hash = (
-                self.board_hash ^ self.zobrist_hash_keys[f"{side}R_({e_row},{e_col})"]
-            )
-        e_row, e_col = move.end_pos
-        self.board_hash = (
-            self.board_hash
-            ^ self.zobrist_hash_keys[f"{move.moved_piece}_({e_row},{e_col})"]
-        )
-        if move.is_two_square_pawn_move():
-            opponent_side = "w" if move.moved_piece[0] == "b" else "b"
-            if e_col - 1 in range(8):
-                if self.board_state[e_row][e_col - 1] == f"{opponent_side}P":
-
-                    self.board_hash = (
-                        self.board_hash
-                        ^ self.zobrist_hash_keys[f"en_passant_file_{e_col - 1}"]
-                    )
-            if e_col + 1 in range(8):
-                if self.board_state[e_row][e_col + 1] == f"{opponent_side}P":
+    def update_search_stats_file(self) -> None:
+        """write the search statistics of the last engine move to it's file.
 
-                    self.board_hash = (
-                        self.board_hash
-                        ^ self.zobrist_hash_keys[f"en_passant_file_{e_col + 1}"]
-                    )
+        Args:
 
-        self.board_hash = self.board_hash ^ self.zobrist_hash_keys["black_to_move"]
-        self.board_hash_list.append(self.board_hash)
+        Returns:
+            None:
+        """
+        self.search_stats.flush(r"./packages/utils/search_stats.json")
 
     def update_move_log(self, move: Move) -> None:
         """add given move to the move log.
@@ -850,43 +807,24 @@ class Board:
         """
         self.move_log.append(move)
 
-    def update_openings(self) -> None:
-        """remove openings from the openings list if they don't match the move log.
+    def update_opening_name(self) -> None:
+        """set the opening name of the last move if it ends an opening of the book.
 
         Args:
 
         Returns:
             None:
         """
-        index = len(self.move_log) - 1
-        if index < 0:
+        if self.opening_book is None or len(self.move_log) == 0:
             return
-        remaining_openings = []
-        for opening in self.openings:
-            if opening["moves"][index] == self.move_log[-1].notation:
-                if index == len(opening["moves"]) - 1:
-                    self.move_log[-1].opening_name = opening["name"]
-                if index + 1 < len(opening["moves"]):
-                    remaining_openings.append(opening)
-
-        self.openings = [opening.copy() for opening in remaining_openings]
-
-    def get_move_depth(self) -> int:
-        """get depth of calculation for engine move based on the possition.
-
-        Args:
-
-        Returns:
-            int:
-        """
-        number_of_pieces = 0
-        for row in range(8):
-            for col in range(8):
-                if self.board_state[row][col] != "__":
-                    number_of_pieces += 1
-        if number_of_pieces <= 4:
-            return 4
-        return 3
+        move = self.move_log[-1]
+        opening_name = self.opening_book.get_opening_name(
+            self.board_hash_list[-2],
+            get_square(move.start_pos),
+            get_square(move.end_pos),
+        )
+        if opening_name is not None:
+            move.opening_name = opening_name
 
     def update_board_state(self) -> None:
         """update board and game status.
@@ -914,35 +852,25 @@ class Board:
             and self.draw_status is False
         ):
 
-            opponent = "w" if self.turn_to_move == "b" else "b"
-            move_to_make = get_best_move(
-                get_valid_moves(
-                    self.board_state,
-                    self.turn_to_move,
-                    self.king_possitions[self.turn_to_move],
-                    self.castle_rights[self.turn_to_move],
-                    self.get_last_move(),
-                ),
-                self.board_state,
-                self.board_hash,
-                self.turn_to_move,
-                self.king_possitions[self.turn_to_move],
-                self.castle_rights[self.turn_to_move],
-                self.king_possitions[opponent],
-                self.castle_rights[opponent],
-                self.openings,
-                len(self.move_log),
-                self.get_last_move(),
-                self.zobrist_hash_keys,
+            move_to_make, move_search_stats = get_best_move(
+                get_valid_moves(self.position),
+                self.position,
+                self.opening_book,
+                self.worker_pool,
                 self.transposition_table,
-                self.board_hash_list,
-                self.fifty_move_rule,
-                3,
+                move_time=self.engine_move_time,
+                is_search_cancelled=self.is_search_cancelled,
             )
+            if pygame.event.peek(pygame.QUIT):
+                pygame.quit()
+                sys.exit()
             # a short delay between engine moves
             pygame.time.delay(200)
 
+            self.search_stats = move_search_stats
             self.update_transposition_table_file()
+            if self.save_search_stats:
+                self.update_search_stats_file()
 
             self.make_move(
                 move_to_make,
@@ -1078,25 +1006,12 @@ class Board:
         if self.selected_piece is None:
             return
 
-        possible_moves = get_possible_moves(
-            self.board_state,
-            self.selected_piece,
-            self.turn_to_move,
-            self.get_last_move(),
-            self.castle_rights[self.turn_to_move],
-        )
+        start = get_square(self.selected_piece)
 
-        for move in possible_moves:
-            if is_valid(
-                self.board_state,
-                move,
-                self.turn_to_move,
-                self.king_possitions[self.turn_to_move],
-            ):
-                if move.is_castle:
-                    move.update_end_pos()
+        for move in get_valid_moves(self.position):
+            if move & 63 == start:
 
-                row, col = move.end_pos
+                row, col = get_pos((move >> 6) & 63)
 
                 cell_rect: pygame.Rect = pygame.Rect(
                     self.row_col_switch(col) * self.cell_size,
@@ -1627,27 +1542,9 @@ class Board:
         if self.game_pause:
             return
 
-        self.board_state: list[list[str]] = [
-            ["bR", "bN", "bB", "bQ", "bK", "bB", "bN", "bR"],
-            ["bP", "bP", "bP", "bP", "bP", "bP", "bP", "bP"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["__", "__", "__", "__", "__", "__", "__", "__"],
-            ["wP", "wP", "wP", "wP", "wP", "wP", "wP", "wP"],
-            ["wR", "wN", "wB", "wQ", "wK", "wB", "wN", "wR"],
-        ]
-
         self.selected_cell = None
         self.selected_piece = None
-        self.turn_to_move = "w"
         self.view = "w"
-        self.king_possitions = {"w": (7, 4), "b": (0, 4)}
-
-        self.castle_rights = {
-            "w": {"short": True, "long": True},
-            "b": {"short": True, "long": True},
-        }
 
         self.checks = {"w": False, "b": False}
 
@@ -1655,8 +1552,6 @@ class Board:
         self.stalemate = False
         self.draw_status = False
         self.draw_status_type = None
-        self.fifty_move_rule = 0
-        self.move_log.clear()
         self.new_move = True
 
         self.game_type = None
@@ -1664,8 +1559,6 @@ class Board:
 
         self.play_game_over_sound = True
 
-        with open(r"./packages/utils/openings_list.json", "r") as openings_data_file:
-            self.openings = json.load(openings_data_file)
-        self.initialize_board_hash()
+        self.load_fen(self.start_fen)
 
         self.set_game_type()
@@ -1 +1,5 @@
 from .best_move import get_best_move
+from .worker_pool import create_worker_pool, WorkerPool
+from .transposition_table import TranspositionTable
+from .search_stats import SearchStats
+from .opening_book import OpeningBook
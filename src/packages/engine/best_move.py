@@ -1,241 +1,541 @@
-from .move_evaluation import get_move_evaluation
+from .worker_pool import (
+    WorkerPool,
+    evaluate_move,
+    search_position_task,
+    get_task_position,
+)
 from .random_move import get_random_move
 from .engine_move import is_move_draw
+from .transposition_table import (
+    TranspositionTable,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    get_table_score,
+)
+from .search_stats import SearchStats
+from .time_control import MAX_SEARCH_DEPTH, SearchTimeout, get_search_deadlines
+from .position_search import ASPIRATION_WINDOW
+from .board_evaluation import NULL_WINDOW
+from .move_order_list import get_move_order_list
+from .move_heuristics import MoveHeuristics
+from .opening_book import OpeningBook
 from ..move import Move
+from ..move.encoding import get_uci_notation
+from ..logics import Position
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
-import pygame
-import sys
-import json
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Iterator
+import time
 
 
 def get_best_move(
-    valid_moves: list[Move],
-    board_state: list[list[str]],
-    board_hash: int,
-    turn_to_move: str,
-    king_pos: tuple[int, int],
-    castle_rights: dict[str, bool],
-    opponent_king_pos: tuple[int, int],
-    opponent_castle_rights: dict[str, bool],
-    openings: list[dict[str, str | list[str]]],
-    opening_index: int,
-    last_move: Move | None,
-    zobrist_hash_keys: dict[str, int],
-    hash_table: dict[str, float],
-    hash_list: list[int],
-    fifty_move_rule: int,
-    depth: int,
-) -> Move | None:
+    valid_moves: list[int],
+    position: Position,
+    opening_book: OpeningBook | None,
+    worker_pool: WorkerPool,
+    hash_table: TranspositionTable,
+    max_depth: int = MAX_SEARCH_DEPTH,
+    move_time: float | None = None,
+    time_left: float | None = None,
+    increment: float = 0,
+    moves_to_go: int | None = None,
+    is_search_cancelled: Callable[[], bool] | None = None,
+) -> tuple[Move | None, SearchStats]:
     """finding and returning the best move based on the possition.
 
+    the root moves are searched with iterative deepening until max_depth or the time
+    budget is used. the best move of the last fully searched depth is returned and
+    it's principal variation is kept in the search_stats. a search stopped before the
+    first depth is finished returns the first move of the move ordering.
+
+    every depth after the first is searched with an aspiration window around the score
+    of the previous depth, the window is opened on the side the score falls out of it.
+
     Args:
-        valid_moves (list[Move]): valid_moves
-        board_state (list[list[str]]): board_state
-        board_hash (int): board_hash
-        turn_to_move (str): turn_to_move
-        king_pos (tuple[int, int]): king_pos
-        castle_rights (dict[str, bool]): castle_rights
-        opponent_king_pos (tuple[int, int]): opponent_king_pos
-        opponent_castle_rights (dict[str, bool]): opponent_castle_rights
-        openings (list[dict[str, str | list[str]]]): openings
-        opening_index (int): opening_index
-        last_move (Move | None): last_move
-        zobrist_hash_keys (dict[str, int]): zobrist_hash_keys
-        hash_table (dict[str, float]): hash_table
-        hash_list (list[int]): hash_list
-        fifty_move_rule (int): fifty_move_rule
-        depth (int): depth
+        valid_moves (list[int]): valid_moves
+        position (Position): position
+        opening_book (OpeningBook | None): opening_book
+        worker_pool (WorkerPool): worker_pool
+        hash_table (TranspositionTable): table of the root search, only the possitions
+        after the root moves are stored in it, the workers keep the deeper ones in their
+        own tables
+        max_depth (int): max_depth
+        move_time (float | None): fixed time of the move in seconds
+        time_left (float | None): time left on the clock of the engine in seconds
+        increment (float): increment in seconds
+        moves_to_go (int | None): moves left until the next time control
+        is_search_cancelled (Callable[[], bool] | None): checked while the results of the
+        workers are awaited, the search is cancelled without a move once it returns True
 
     Returns:
-        Move | None:
+        tuple[Move | None, SearchStats]: the best move and the statistics of the search
     """
 
-    best_moves: list[Move] = []
-    secondary_moves: list[Move] = []
+    best_moves: list[int] = []
+    secondary_moves: list[int] = []
 
+    turn_to_move = position.turn_to_move
     min_max_eval = float("inf") if turn_to_move == "b" else -float("inf")
 
+    search_stats = SearchStats()
+
     if len(valid_moves) == 0:
-        return None
+        return (None, search_stats)
 
-    if len(openings) != 0:
-        move_list: list[Move] = []
-        for opening in openings:
-            if len(opening["moves"]) > opening_index:
-                move_to_add = Move.from_notation(
-                    opening["moves"][opening_index],
-                    board_state,
-                    turn_to_move,
-                    last_move,
-                    castle_rights,
-                    king_pos,
-                )
-                if move_to_add is not None:
-                    move_list.append(move_to_add)
-
-        if len(move_list) > 0:
-            return get_random_move(move_list)
-
-    with ProcessPoolExecutor() as executer:
-        eval_results = [
-            executer.submit(
-                get_move_evaluation,
-                move,
-                board_state,
-                board_hash,
-                turn_to_move,
-                king_pos,
-                castle_rights,
-                opponent_king_pos,
-                opponent_castle_rights,
-                zobrist_hash_keys,
-                hash_table,
-                depth,
+    if opening_book is not None:
+        book_move = opening_book.get_move(position)
+        if book_move is not None:
+            return (get_engine_move(book_move, position), search_stats)
+
+    soft_stop_time, hard_stop_time = get_search_deadlines(
+        time.time(), move_time, time_left, increment, moves_to_go
+    )
+
+    # only the possition and the root move are sent to the workers,
+    # the static data is given to them once when the pool is created.
+    task_position = get_task_position(position)
+    worker_pool.set_search_stop(False)
+
+    if worker_pool.lazy_smp:
+        try:
+            search_result = search_lazy_smp(
+                task_position,
+                worker_pool,
+                max_depth,
+                soft_stop_time,
+                hard_stop_time,
+                search_stats,
+                is_search_cancelled,
+            )
+        except SearchTimeout:
+            return (
+                get_engine_move(
+                    get_fallback_move(valid_moves, position, hash_table), position
+                ),
+                search_stats,
             )
-            for move in valid_moves
+        if search_result is None:
+            return (None, search_stats)
+        search_stats.principal_variation = [
+            get_uci_notation(move) for move in search_result[2]
         ]
+        return (get_engine_move(search_result[2][0], position), search_stats)
+    move_hashes: dict[int, int] = {}
+
+    for move in valid_moves:
+        position.push(move)
+        move_hashes[move] = position.hash
+        position.pop()
+
+    root_moves = list(valid_moves)
+    move_pvs: dict[int, list[int]] = {}
+
+    for depth in range(1, max_depth + 1):
+        depth_start_time = time.perf_counter()
+
+        alpha, beta = -float("inf"), float("inf")
+        if abs(min_max_eval) != float("inf"):
+            alpha = min_max_eval - ASPIRATION_WINDOW
+            beta = min_max_eval + ASPIRATION_WINDOW
+
+        try:
+            while True:
+                depth_result = search_root_moves(
+                    root_moves,
+                    position,
+                    task_position,
+                    move_hashes,
+                    worker_pool,
+                    hash_table,
+                    depth,
+                    alpha,
+                    beta,
+                    hard_stop_time,
+                    search_stats,
+                    is_search_cancelled,
+                )
+                if depth_result is None:
+                    return (None, search_stats)
+
+                depth_eval = depth_result[2]
+                if depth_eval <= alpha and alpha != -float("inf"):
+                    alpha = -float("inf")
+                elif depth_eval >= beta and beta != float("inf"):
+                    beta = float("inf")
+                else:
+                    break
+        except SearchTimeout:
+            break
+
+        search_stats.depth_times[depth] = time.perf_counter() - depth_start_time
+        best_moves, secondary_moves, min_max_eval, move_evals, move_pvs = depth_result
+
+        # the best moves of this depth are searched first in the next one
+        root_moves.sort(key=move_evals.get, reverse=turn_to_move == "w")
 
-        for result in as_completed(eval_results):
+        if time.time() >= soft_stop_time:
+            break
 
-            event = pygame.event.wait(timeout=1)
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
+    if len(best_moves) == 0 and len(secondary_moves) == 0:
+        best_move = get_fallback_move(valid_moves, position, hash_table)
+    elif turn_to_move == "w" and min_max_eval < 0 and len(secondary_moves) > 0:
+        best_move = get_random_move(secondary_moves)
+    elif turn_to_move == "b" and min_max_eval > 0 and len(secondary_moves) > 0:
+        best_move = get_random_move(secondary_moves)
+    elif len(best_moves) == 0:
+        best_move = get_random_move(secondary_moves)
+    else:
+        best_move = get_random_move(best_moves)
+
+    search_stats.principal_variation = [
+        get_uci_notation(move) for move in move_pvs.get(best_move, [])
+    ]
+
+    return (get_engine_move(best_move, position), search_stats)
+
+
+def search_root_moves(
+    root_moves: list[int],
+    position: Position,
+    task_position: Position,
+    move_hashes: dict[int, int],
+    worker_pool: WorkerPool,
+    hash_table: TranspositionTable,
+    depth: int,
+    alpha: float,
+    beta: float,
+    stop_time: float,
+    search_stats: SearchStats,
+    is_search_cancelled: Callable[[], bool] | None = None,
+) -> tuple[list[int], list[int], float, dict[int, float], dict[int, list[int]]] | None:
+    """search every root move to the given depth and window in the worker processes.
+
+    the first root move is searched alone and the others are given to the workers with
+    the bound it sets. every better move found tightens the bound the workers share.
+    a move that scores the same as the best move is only a best move if it's score is
+    exact, the other ones are searched again with a window around the best score.
+
+    Args:
+        root_moves (list[int]): root_moves
+        position (Position): position
+        task_position (Position): copy of the possition sent to the workers
+        move_hashes (dict[int, int]): board hash after each root move
+        worker_pool (WorkerPool): worker_pool
+        hash_table (TranspositionTable): hash_table
+        depth (int): depth
+        alpha (float): alpha
+        beta (float): beta
+        stop_time (float): stop_time
+        search_stats (SearchStats): search_stats
+        is_search_cancelled (Callable[[], bool] | None): is_search_cancelled
+
+    Returns:
+        tuple[list[int], list[int], float, dict[int, float], dict[int, list[int]]] | None:
+        the best moves, the moves that are only kept for a draw, the best evaluation,
+        the evaluation and the principal variation of every root move.
+        None if the search was cancelled.
+        SearchTimeout is raised if the stop_time is reached before every move is searched.
+    """
+
+    best_moves: list[int] = []
+    secondary_moves: list[int] = []
+    move_evals: dict[int, float] = {}
+    move_pvs: dict[int, list[int]] = {}
+    # moves with an exact score from the table, and moves that scored the same as the
+    # best move but were searched with a window that can't tell if they are as good
+    exact_moves: set[int] = set()
+    tied_moves: list[int] = []
+
+    turn_to_move = position.turn_to_move
+    min_max_eval = float("inf") if turn_to_move == "b" else -float("inf")
+
+    worker_pool.set_root_bounds(alpha, beta)
+
+    for root_move_group in [root_moves[:1], root_moves[1:]]:
+        eval_results: list[Future] = []
+
+        for move in root_move_group:
+            search_stats.tt_probes += 1
+            hash_entry = hash_table.probe(move_hashes[move])
+            if hash_entry is not None:
+                search_stats.tt_hits += 1
+            if (
+                hash_entry is not None
+                and hash_entry[0] >= depth
+                and hash_entry[2] == EXACT
+            ):
+                search_stats.tt_cutoffs += 1
+                exact_moves.add(move)
+                result: Future = Future()
+                result.set_result((hash_entry[1], move, [move], SearchStats()))
+                eval_results.append(result)
+            else:
+                eval_results.append(
+                    worker_pool.submit(
+                        evaluate_move,
+                        move,
+                        task_position,
+                        depth,
+                        alpha,
+                        beta,
+                        stop_time,
+                    )
+                )
+
+        for result in get_completed_results(eval_results, is_search_cancelled):
+            if result is None:
+                stop_root_tasks(worker_pool, eval_results)
                 return None
 
-            move_eval, move_hash, move = result.result()
-            move_hash = int(move_hash)
+            try:
+                move_eval, move, move_pv, move_stats = result.result()
+            except SearchTimeout:
+                stop_root_tasks(worker_pool, eval_results)
+                raise
 
-            if move_hash not in hash_table:
-                hash_table[move_hash] = move_eval
+            # the scores from the table are float32, the searched ones are rounded the
+            # same way so the scores of equal moves are also equal.
+            move_eval = get_table_score(move_eval)
+            search_stats.merge(move_stats)
+            move_hash = move_hashes[move]
+            if move in exact_moves:
+                bound = EXACT
+            elif move_eval <= alpha:
+                bound = UPPER_BOUND
+            elif move_eval >= beta:
+                bound = LOWER_BOUND
             else:
-                update_hashed_moves_count()
+                bound = EXACT
+            # the best reply of the opponent is stored as the move of the possition
+            hash_table.store(
+                move_hash,
+                depth,
+                move_eval,
+                bound,
+                move_pv[1] if len(move_pv) > 1 else 0,
+            )
+            move_evals[move] = move_eval
+            move_pvs[move] = move_pv
 
             if turn_to_move == "b" and move_eval < min_max_eval:
-                if is_move_draw(
-                    # board_state,
-                    # turn_to_move,
-                    move,
-                    move_hash,
-                    hash_list,
-                    fifty_move_rule,
-                    # opponent_king_pos,
-                    # opponent_castle_rights,
-                ):
+                if is_move_draw(position, move):
                     secondary_moves.append(move)
                     continue
                 best_moves = [move]
                 min_max_eval = move_eval
+                beta = min(beta, move_eval)
+                worker_pool.set_root_bounds(alpha, beta)
             elif turn_to_move == "w" and move_eval > min_max_eval:
-                if is_move_draw(
-                    # board_state,
-                    # turn_to_move,
-                    move,
-                    move_hash,
-                    hash_list,
-                    fifty_move_rule,
-                    # opponent_king_pos,
-                    # opponent_castle_rights,
-                ):
+                if is_move_draw(position, move):
                     secondary_moves.append(move)
                     continue
                 best_moves = [move]
                 min_max_eval = move_eval
+                alpha = max(alpha, move_eval)
+                worker_pool.set_root_bounds(alpha, beta)
 
             elif move_eval == min_max_eval:
-                best_moves.append(move)
-
-        # for index, result in enumerate(eval_results):
-        #     event = pygame.event.wait(timeout=1)
-        #     if event.type == pygame.QUIT:
-        #         pygame.quit()
-        #         sys.exit()
-        #     move = valid_moves[index]
-        #     move_eval, move_hash = result.result()
-        #     if move_hash not in hash_table:
-        #         hash_table[move_hash] = move_eval
-        #
-        #     # for move in valid_moves:
-        #     #
-        #     #     move_eval = get_move_evaluation(
-        #     #         move,
-        #     #         board_state,
-        #     #         board_hash,
-        #     #         turn_to_move,
-        #     #         king_pos,
-        #     #         castle_rights,
-        #     #         opponent_king_pos,
-        #     #         opponent_castle_rights,
-        #     #         zobrist_hash_keys,
-        #     #         hash_table,
-        #     #         depth,
-        #     #     )
-        #     #
-        #     if turn_to_move == "b" and move_eval < min_max_eval:
-        #         if -1000 < move_eval <= -1.5 and is_move_draw(
-        #             board_state,
-        #             turn_to_move,
-        #             move,
-        #             move_hash,
-        #             hash_list,
-        #             fifty_move_rule,
-        #             opponent_king_pos,
-        #             opponent_castle_rights,
-        #         ):
-        #             secondary_moves.append(move)
-        #             continue
-        #         best_moves = [move]
-        #         min_max_eval = move_eval
-        #     elif turn_to_move == "w" and move_eval > min_max_eval:
-        #         if 1.5 <= move_eval < 1000 and is_move_draw(
-        #             board_state,
-        #             turn_to_move,
-        #             move,
-        #             move_hash,
-        #             hash_list,
-        #             fifty_move_rule,
-        #             opponent_king_pos,
-        #             opponent_castle_rights,
-        #         ):
-        #             secondary_moves.append(move)
-        #             continue
-        #         best_moves = [move]
-        #         min_max_eval = move_eval
-        #
-        #     elif move_eval == min_max_eval:
-        #         best_moves.append(move)
-        #
-    # print(time.perf_counter() - start_time)
-    # if len(best_moves) == 0:
-    #     print("secondary_moves")
-    #     return get_random_move(secondary_moves)
-
-    if turn_to_move == "w" and min_max_eval < 0 and len(secondary_moves) > 0:
-        return get_random_move(secondary_moves)
-
-    if turn_to_move == "b" and min_max_eval > 0 and len(secondary_moves) > 0:
-        return get_random_move(secondary_moves)
-
-    if len(best_moves) == 0:
-        return get_random_move(secondary_moves)
-
-    return get_random_move(best_moves)
-
-
-def update_hashed_moves_count() -> None:
-    """increase the number of hashed moves counter by 1
+                # a move that failed low on the shared bound scores exactly the bound
+                if bound == EXACT:
+                    best_moves.append(move)
+                else:
+                    tied_moves.append(move)
+
+    # the tied moves are searched again with a window around the best score, without
+    # the shared bounds, and only the ones that really score the same are kept.
+    tied_moves = [move for move in tied_moves if move_evals[move] == min_max_eval]
+    worker_pool.set_root_bounds(-float("inf"), float("inf"))
+    tie_alpha = min_max_eval - NULL_WINDOW
+    tie_beta = min_max_eval + NULL_WINDOW
+    eval_results = [
+        worker_pool.submit(
+            evaluate_move,
+            move,
+            task_position,
+            depth,
+            tie_alpha,
+            tie_beta,
+            stop_time,
+            False,
+        )
+        for move in tied_moves
+    ]
+    for result in get_completed_results(eval_results, is_search_cancelled):
+        if result is None:
+            stop_root_tasks(worker_pool, eval_results)
+            return None
+
+        try:
+            move_eval, move, move_pv, move_stats = result.result()
+        except SearchTimeout:
+            stop_root_tasks(worker_pool, eval_results)
+            raise
+
+        move_eval = get_table_score(move_eval)
+        search_stats.merge(move_stats)
+        if not tie_alpha < move_eval < tie_beta:
+            continue
+        hash_table.store(
+            move_hashes[move],
+            depth,
+            move_eval,
+            EXACT,
+            move_pv[1] if len(move_pv) > 1 else 0,
+        )
+        move_evals[move] = move_eval
+        move_pvs[move] = move_pv
+        if move_eval == min_max_eval:
+            best_moves.append(move)
+
+    return (best_moves, secondary_moves, min_max_eval, move_evals, move_pvs)
+
+
+def get_completed_results(
+    eval_results: list[Future], is_search_cancelled: Callable[[], bool] | None
+) -> Iterator[Future | None]:
+    """yield the results of the workers once they are finished.
+
+    the cancel callback is polled while the results are awaited, even when a single
+    root move is searched, and None is yielded once it returns True.
+
+    Args:
+        eval_results (list[Future]): eval_results
+        is_search_cancelled (Callable[[], bool] | None): is_search_cancelled
+
+    Returns:
+        Iterator[Future | None]:
+    """
+    pending_results = set(eval_results)
+    while len(pending_results) > 0:
+        if is_search_cancelled is not None and is_search_cancelled():
+            yield None
+            return
+        done_results, pending_results = wait(
+            pending_results, timeout=0.01, return_when=FIRST_COMPLETED
+        )
+        yield from done_results
+
+
+def stop_root_tasks(worker_pool: WorkerPool, eval_results: list[Future]) -> None:
+    """stop the root move searches and wait for the ones that already started.
+
+    the stop flag is cleared by the next search, a task still running at that time
+    would search to the end and keep a worker busy.
 
     Args:
+        worker_pool (WorkerPool): worker_pool
+        eval_results (list[Future]): eval_results
 
     Returns:
         None:
     """
+    worker_pool.set_search_stop(True)
+    for eval_result in eval_results:
+        eval_result.cancel()
+    wait(eval_results)
+
 
-    with open(r"./packages/utils/hashed_moves_counter.json", "r") as json_file:
-        counter = json.load(json_file)
-        counter["count"] += 1
+def search_lazy_smp(
+    task_position: Position,
+    worker_pool: WorkerPool,
+    max_depth: int,
+    soft_stop_time: float,
+    hard_stop_time: float,
+    search_stats: SearchStats,
+    is_search_cancelled: Callable[[], bool] | None = None,
+) -> tuple[float, int, list[int]] | None:
+    """search the possition with every worker at once, sharing one transposition table.
 
-    with open(r"./packages/utils/hashed_moves_counter.json", "w") as json_file:
-        json.dump(counter, json_file, indent=2)
+    the first worker is the main one, the others search one depth deeper on odd workers
+    and are stopped once the main worker is done. the deepest finished result is used.
+
+    Args:
+        task_position (Position): copy of the possition sent to the workers
+        worker_pool (WorkerPool): worker_pool
+        max_depth (int): max_depth
+        soft_stop_time (float): soft_stop_time
+        hard_stop_time (float): hard_stop_time
+        search_stats (SearchStats): search_stats
+        is_search_cancelled (Callable[[], bool] | None): is_search_cancelled
+
+    Returns:
+        tuple[float, int, list[int]] | None:
+        the evaluation, the depth and the principal variation of the best result.
+        None if the search was cancelled.
+        SearchTimeout is raised if no worker finished the first depth.
+    """
+    search_results = [
+        worker_pool.submit(
+            search_position_task,
+            task_position,
+            max_depth,
+            soft_stop_time,
+            hard_stop_time,
+            worker_index & 1,
+        )
+        for worker_index in range(worker_pool.worker_count)
+    ]
+
+    while not search_results[0].done():
+        if is_search_cancelled is not None and is_search_cancelled():
+            worker_pool.set_search_stop(True)
+            wait(search_results)
+            return None
+        wait(search_results[:1], timeout=0.01)
+
+    worker_pool.set_search_stop(True)
+
+    best_result: tuple[float, int, list[int]] | None = None
+    for worker_index, result in enumerate(search_results):
+        search_result, worker_stats = result.result()
+        search_stats.merge(worker_stats)
+        if worker_index == 0:
+            main_depth_times = worker_stats.depth_times
+        if search_result is not None and (
+            best_result is None or search_result[1] > best_result[1]
+        ):
+            best_result = search_result
+
+    # the helpers search at the same time, only the time of the main worker is kept
+    search_stats.depth_times = main_depth_times
+
+    if best_result is None:
+        raise SearchTimeout()
+    return best_result
+
+
+def get_fallback_move(
+    valid_moves: list[int], position: Position, hash_table: TranspositionTable
+) -> int:
+    """return the first move of the move ordering, for a search stopped before it
+    finished the first depth. the move of the possition in the table is ordered first.
+
+    Args:
+        valid_moves (list[int]): valid_moves
+        position (Position): position
+        hash_table (TranspositionTable): hash_table
+
+    Returns:
+        int:
+    """
+    hash_entry = hash_table.probe(position.hash)
+    hash_move = hash_entry[3] if hash_entry is not None else 0
+    return get_move_order_list(
+        position, valid_moves, hash_move, 0, None, MoveHeuristics()
+    )[0]
+
+
+def get_engine_move(move: int | None, position: Position) -> Move | None:
+    """convert the move chosen by the engine to a move object.
+
+    Args:
+        move (int | None): move
+        position (Position): position
+
+    Returns:
+        Move | None:
+    """
+    if move is None:
+        return None
+    return Move.from_encoded(move, position.board_state, position.turn_to_move)
@@ -1,48 +1,79 @@
-from ..move import Move
-from ..logics import any_valid_moves, get_valid_moves, possition_under_attack
-from .engine_move import get_switched_turn, get_castle_rights, get_king_pos, make_move
-from .square_evaluation import get_piece_square_evaluation
+from ..logics import Position, any_valid_moves, get_valid_moves, possition_under_attack
+from ..logics.bitboard import (
+    WHITE,
+    BLACK,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+)
+from ..logics.bitboard import EMPTY
+from ..move.encoding import CASTLE, PROMOTION, EN_PASSANT
+from .square_evaluation import get_material_evaluation
 from .move_order_list import get_move_order_list
 from .king_safty_evaluation import get_king_safty_eval
-from ..utils.piece_square_tables import piece_evaluation
+from .transposition_table import (
+    TranspositionTable,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+)
+from .search_stats import SearchStats
+from .move_heuristics import MoveHeuristics
+from .static_exchange_evaluation import get_static_exchange_evaluation
+from .move_heuristics import is_quiet_move
+from .time_control import count_search_node
+from ..utils.piece_square_tables import piece_type_evaluation
 
+import ctypes
 
-def get_game_stage(board_state: list[list[str]]) -> tuple[str, int]:
+# score of a checkmate, multiplied by the depth left so the closer mates score higher
+MATE_SCORE: float = 1000
+
+# search quiet moves that give check at the first ply of the quiescence search
+QUIESCENCE_CHECKS: bool = True
+
+# width of the window the moves after the first one are searched with in the principal variation search
+NULL_WINDOW: float = 0.001
+
+# a capture is skipped if even winning the captured piece with this margin can't reach alpha
+DELTA_MARGIN: float = 2
+
+# the null move is only tried at this depth or deeper, it's searched this much shallower
+# than the other moves and one more ply shallower from NULL_MOVE_DEEP_DEPTH
+NULL_MOVE_MIN_DEPTH: int = 3
+NULL_MOVE_REDUCTION: int = 2
+NULL_MOVE_DEEP_DEPTH: int = 7
+
+# quiet moves from LATE_MOVE_INDEX in the move order are searched shallower from this depth
+LATE_MOVE_MIN_DEPTH: int = 3
+LATE_MOVE_INDEX: int = 3
+
+
+def get_game_stage(position: Position) -> tuple[str, int]:
     """return game stage based on the possition.
 
     Args:
-        board_state (list[list[str]]): board_state
+        position (Position): position
 
     Returns:
         tuple[str, int]:
     """
-    wQ_count = 0
-    bQ_count = 0
-    wR_count = 0
-    bR_count = 0
-    wP_count = 0
-    bP_count = 0
-    white_minor_pieces_count = 0
-    black_minor_pieces_count = 0
-
-    for row in range(8):
-        for col in range(8):
-            if board_state[row][col] == "wQ":
-                wQ_count += 1
-            elif board_state[row][col] == "bQ":
-                bQ_count += 1
-            elif board_state[row][col] == "wR":
-                wR_count += 1
-            elif board_state[row][col] == "bR":
-                bR_count += 1
-            elif board_state[row][col] == "wP":
-                wP_count += 1
-            elif board_state[row][col] == "bP":
-                bP_count += 1
-            elif board_state[row][col] in ["wB", "wN"]:
-                white_minor_pieces_count += 1
-            elif board_state[row][col] in ["bB", "bN"]:
-                black_minor_pieces_count += 1
+    bitboards = position.bitboards
+    wQ_count = bitboards[WHITE * 6 + QUEEN].bit_count()
+    bQ_count = bitboards[BLACK * 6 + QUEEN].bit_count()
+    wR_count = bitboards[WHITE * 6 + ROOK].bit_count()
+    bR_count = bitboards[BLACK * 6 + ROOK].bit_count()
+    wP_count = bitboards[WHITE * 6 + PAWN].bit_count()
+    bP_count = bitboards[BLACK * 6 + PAWN].bit_count()
+    white_minor_pieces_count = (
+        bitboards[WHITE * 6 + BISHOP] | bitboards[WHITE * 6 + KNIGHT]
+    ).bit_count()
+    black_minor_pieces_count = (
+        bitboards[BLACK * 6 + BISHOP] | bitboards[BLACK * 6 + KNIGHT]
+    ).bit_count()
+
     number_of_pieces = (
         wQ_count
         + wR_count
@@ -84,92 +115,112 @@ def get_game_stage(board_state: list[list[str]]) -> tuple[str, int]:
 
         return ("end game", number_of_pieces)
     if wQ_count == 0 and bQ_count == 0 and wR_count == 0 and bR_count == 0:
-        return "end game"
+        return ("end game", number_of_pieces)
 
     return ("middle game", number_of_pieces)
 
 
+def has_non_pawn_material(position: Position, side: int) -> bool:
+    """check if the side has a piece other than it's king and pawns.
+
+    a side with only pawns is often in zugzwang, so it can't pass the turn in the null move pruning.
+
+    Args:
+        position (Position): position
+        side (int): side
+
+    Returns:
+        bool:
+    """
+    bitboards = position.bitboards
+    return (
+        bitboards[side * 6 + KNIGHT]
+        | bitboards[side * 6 + BISHOP]
+        | bitboards[side * 6 + ROOK]
+        | bitboards[side * 6 + QUEEN]
+    ) != 0
+
+
+def get_late_move_reduction(depth: int, move_index: int) -> int:
+    """return how many plies shallower a quiet move is searched based on it's place in the move order.
+
+    Args:
+        depth (int): depth
+        move_index (int): move_index
+
+    Returns:
+        int:
+    """
+    if depth < LATE_MOVE_MIN_DEPTH or move_index < LATE_MOVE_INDEX:
+        return 0
+    if depth >= 6 and move_index >= 2 * LATE_MOVE_INDEX:
+        return 2
+    return 1
+
+
 def get_board_evaluation(
-    board_state: list[list[str]],
-    turn_to_move: str,
-    king_pos: tuple[int, int],
-    castle_rights: dict[str, bool],
-    last_move: Move | None,
+    position: Position,
+    last_move: int | None,
+    valid_moves: list[int] | None = None,
 ) -> tuple[float, str, bool]:
     """get the static board evaluation.
 
     Args:
-        board_state (list[list[str]]): board_state
-        turn_to_move (str): turn_to_move
-        king_pos (tuple[int, int]): king_pos
-        castle_rights (dict[str, bool]): castle_rights
-        last_move (Move | None): last_move
+        position (Position): position
+        last_move (int | None): last_move
+        valid_moves (list[int] | None): moves of the possition if they are already
+        generated, checkmate and stalemate are found from them instead of a new search
 
     Returns:
         tuple[float, str, bool]:
     """
 
-    checkmate_index = -1 if turn_to_move == "w" else 1
-    w_king_pos: tuple[int, int] | None = None
-    b_king_pos: tuple[int, int] | None = None
+    turn_to_move = position.turn
+    checkmate_index = -1 if turn_to_move == WHITE else 1
 
     check: bool = False
-    game_stage, number_of_pieces = get_game_stage(board_state)
+    game_stage, number_of_pieces = get_game_stage(position)
 
-    if possition_under_attack(board_state, king_pos, turn_to_move):
+    if possition_under_attack(
+        position, position.king_squares[turn_to_move], turn_to_move
+    ):
         check = True
 
-    if not any_valid_moves(
-        board_state, turn_to_move, king_pos, last_move, castle_rights
-    ):
+    if valid_moves is None:
+        has_valid_moves = any_valid_moves(position)
+    else:
+        has_valid_moves = len(valid_moves) > 0
+    if not has_valid_moves:
         if check:
-            return (1000 * checkmate_index, game_stage, True)
+            return (MATE_SCORE * checkmate_index, game_stage, True)
 
         return (0, game_stage, True)
 
     evaluation: float = 0
-    square_index = 0
 
     if check:
         evaluation += checkmate_index * 0.15
 
-    if last_move is not None and last_move.is_castle and game_stage == "middle game":
-        evaluation += checkmate_index * 0.3
-    if last_move is not None and last_move.is_castle and game_stage == "end game":
-        evaluation += checkmate_index * 0.1
-
-    for row in range(8):
-        for col in range(8):
-            piece = board_state[row][col]
-            if piece == "wK":
-                w_king_pos = (row, col)
-            elif piece == "bK":
-                b_king_pos = (row, col)
-            if piece[0] == "w":
-                square_index = 1
-                evaluation += square_index * piece_evaluation[
-                    piece[1]
-                ] + get_piece_square_evaluation(
-                    piece,
-                    (row, col),
-                    game_stage,
-                )
-            elif piece[0] == "b":
-                square_index = -1
-                evaluation += square_index * piece_evaluation[
-                    piece[1]
-                ] + get_piece_square_evaluation(piece, (row, col), game_stage)
+    if last_move is not None and (last_move >> 14) & 3 == CASTLE:
+        if game_stage == "middle game":
+            evaluation += checkmate_index * 0.3
+        elif game_stage == "end game":
+            evaluation += checkmate_index * 0.1
+
+    evaluation += get_material_evaluation(position, game_stage)
+
+    w_king_pos, b_king_pos = position.king_squares
     w_king_safty, w_king_mobility = get_king_safty_eval(
-        board_state, "w", w_king_pos, game_stage
+        position, WHITE, w_king_pos, game_stage
     )
     b_king_safty, b_king_mobility = get_king_safty_eval(
-        board_state, "b", b_king_pos, game_stage
+        position, BLACK, b_king_pos, game_stage
     )
 
     evaluation += w_king_safty + b_king_safty
 
-    king_distance = abs(w_king_pos[0] - b_king_pos[0]) + abs(
-        w_king_pos[1] - b_king_pos[1]
+    king_distance = abs((w_king_pos >> 3) - (b_king_pos >> 3)) + abs(
+        (w_king_pos & 7) - (b_king_pos & 7)
     )
 
     if evaluation > 0:
@@ -186,107 +237,503 @@ def get_board_evaluation(
     return (evaluation, game_stage, False)
 
 
-def get_minimax_evaluation(
-    board_state: list[list[str]],
-    turn_to_move: str,
-    king_pos: tuple[int, int],
-    castle_rights: dict[str, bool],
-    opponent_king_pos: tuple[int, int],
-    opponent_castle_rights: dict[str, bool],
-    last_move: Move | None,
+def get_quiescence_evaluation(
+    position: Position,
+    last_move: int | None,
     alpha: float,
     beta: float,
-    depth: float,
+    search_stats: SearchStats,
+    stop_time: float = float("inf"),
+    include_checks: bool = False,
 ) -> float:
-    """get the dynamic board evaluation based on the minimax algorithem.
+    """get the board evaluation after the captures and promotions of the possition are resolved.
+
+    the side to move can stand pat on the static evaluation unless it's in check.
 
     Args:
-        board_state (list[list[str]]): board_state
-        turn_to_move (str): turn_to_move
-        king_pos (tuple[int, int]): king_pos
-        castle_rights (dict[str, bool]): castle_rights
-        opponent_king_pos (tuple[int, int]): opponent_king_pos
-        opponent_castle_rights (dict[str, bool]): opponent_castle_rights
-        last_move (Move | None): last_move
+        position (Position): position
+        last_move (int | None): last_move
         alpha (float): alpha
         beta (float): beta
-        depth (float): depth
+        search_stats (SearchStats): search_stats
+        stop_time (float): stop_time
+        include_checks (bool): also search the quiet moves that give check
 
     Returns:
         float:
     """
 
-    current_board_eval = get_board_evaluation(
-        board_state,
-        turn_to_move,
-        king_pos,
-        castle_rights,
-        last_move,
+    search_stats.qnodes += 1
+    count_search_node(stop_time)
+
+    valid_moves = get_valid_moves(position)
+    board_eval, game_stage, game_over = get_board_evaluation(
+        position, last_move, valid_moves
     )
+    if game_over:
+        return board_eval
+
+    turn_to_move = position.turn
+    in_check = possition_under_attack(
+        position, position.king_squares[turn_to_move], turn_to_move
+    )
+
+    # the evaluation is a lower bound for white and an upper bound for black,
+    # since the side to move doesn't have to capture. in check every evasion is searched.
+    best_eval = board_eval
+    if in_check:
+        best_eval = -float("inf") if turn_to_move == WHITE else float("inf")
+    elif turn_to_move == WHITE:
+        if board_eval >= beta:
+            return board_eval
+        alpha = max(alpha, board_eval)
+    else:
+        if board_eval <= alpha:
+            return board_eval
+        beta = min(beta, board_eval)
+
+    moves: list[tuple[float, int]] = []
+    for move in valid_moves:
+        captured_piece = (move >> 20) & 15
+        move_type = (move >> 14) & 3
+        if captured_piece != EMPTY or move_type == EN_PASSANT:
+            captured_value = piece_type_evaluation[
+                PAWN if captured_piece == EMPTY else captured_piece % 6
+            ]
+        elif move_type == PROMOTION:
+            captured_value = 0
+        elif in_check:
+            captured_value = 0
+        elif include_checks:
+            position.push(move)
+            gives_check = possition_under_attack(
+                position, position.king_squares[turn_to_move ^ 1], turn_to_move ^ 1
+            )
+            position.pop()
+            if not gives_check:
+                continue
+            captured_value = 0
+        else:
+            continue
+
+        if move_type == PROMOTION:
+            captured_value += piece_type_evaluation[((move >> 12) & 3) + 1] - 1
+
+        # delta pruning, not used in check or in the end game where the material is low
+        if not in_check and game_stage != "end game":
+            if (
+                turn_to_move == WHITE
+                and board_eval + captured_value + DELTA_MARGIN < alpha
+            ) or (
+                turn_to_move != WHITE
+                and board_eval - captured_value - DELTA_MARGIN > beta
+            ):
+                continue
+
+        # captures that lose material in the exchange on the square are not searched
+        if (
+            not in_check
+            and captured_value
+            and captured_value < piece_type_evaluation[((move >> 16) & 15) % 6]
+            and get_static_exchange_evaluation(position, move) < 0
+        ):
+            continue
+
+        # most valuable victim first, then least valuable attacker
+        moves.append(
+            (
+                captured_value - piece_type_evaluation[((move >> 16) & 15) % 6] / 100,
+                move,
+            )
+        )
+
+    moves.sort(key=lambda move_value: move_value[0], reverse=True)
 
-    game_stage = current_board_eval[1]
+    for _, move in moves:
+        position.push(move)
+        board_eval = get_quiescence_evaluation(
+            position, move, alpha, beta, search_stats, stop_time
+        )
+        position.pop()
 
-    if depth == 0 or current_board_eval[2]:
-        if current_board_eval[2]:
-            return current_board_eval[0] * (depth + 1)
-        return current_board_eval[0]
+        if turn_to_move == WHITE:
+            best_eval = max(best_eval, board_eval)
+            alpha = max(alpha, board_eval)
+        else:
+            best_eval = min(best_eval, board_eval)
+            beta = min(beta, board_eval)
+        if beta <= alpha:
+            break
 
-    opponent_turn = get_switched_turn(turn_to_move)
+    return best_eval
 
-    valid_moves = get_valid_moves(
-        board_state, turn_to_move, king_pos, castle_rights, last_move
+
+def get_root_window(
+    root_bounds: ctypes.Array,
+    alpha: float,
+    beta: float,
+    search_alpha: float,
+    search_beta: float,
+) -> tuple[float, float, float, float]:
+    """narrow the window of a node after the root move to the shared bounds of the root search.
+
+    Args:
+        root_bounds (ctypes.Array): root_bounds
+        alpha (float): alpha
+        beta (float): beta
+        search_alpha (float): alpha the node was searched with
+        search_beta (float): beta the node was searched with
+
+    Returns:
+        tuple[float, float, float, float]:
+    """
+    root_alpha, root_beta = root_bounds[0], root_bounds[1]
+    return (
+        max(alpha, root_alpha),
+        min(beta, root_beta),
+        max(search_alpha, root_alpha),
+        min(search_beta, root_beta),
     )
 
+
+def get_minimax_evaluation(
+    position: Position,
+    last_move: int | None,
+    alpha: float,
+    beta: float,
+    depth: int,
+    ply: int,
+    transposition_table: TranspositionTable,
+    move_heuristics: MoveHeuristics,
+    search_stats: SearchStats,
+    stop_time: float = float("inf"),
+    root_bounds: ctypes.Array | None = None,
+) -> float:
+    """get the dynamic board evaluation based on the minimax algorithem with principal variation search.
+
+    Args:
+        position (Position): position
+        last_move (int | None): last_move
+        alpha (float): alpha
+        beta (float): beta
+        depth (int): depth
+        ply (int): distance from the root of the search
+        transposition_table (TranspositionTable): transposition_table
+        move_heuristics (MoveHeuristics): move_heuristics
+        search_stats (SearchStats): search_stats
+        stop_time (float): time.time() value the search is stopped at with SearchTimeout
+        root_bounds (ctypes.Array | None): alpha and beta of the root search shared by the
+        workers, read by the nodes right after the root move
+
+    Returns:
+        float:
+    """
+
+    search_stats.nodes += 1
+    count_search_node(stop_time)
+
+    # a possition that already occurred on the way to this node is scored as a draw
+    if ply > 0 and (position.is_repetition() or position.fifty_move_rule >= 100):
+        return 0
+
+    search_stats.tt_probes += 1
+
+    hash_move = 0
+    hash_entry = transposition_table.probe(position.hash)
+    if hash_entry is not None:
+        search_stats.tt_hits += 1
+        hash_depth, hash_eval, bound, hash_move = hash_entry
+        if hash_depth >= depth:
+            if bound == EXACT:
+                search_stats.tt_cutoffs += 1
+                return hash_eval
+            if bound == LOWER_BOUND:
+                alpha = max(alpha, hash_eval)
+            elif bound == UPPER_BOUND:
+                beta = min(beta, hash_eval)
+            if beta <= alpha:
+                search_stats.tt_cutoffs += 1
+                return hash_eval
+
+    # the leaves are searched until the captures are resolved to avoid the horizon effect
+    if depth == 0:
+        return get_quiescence_evaluation(
+            position,
+            last_move,
+            alpha,
+            beta,
+            search_stats,
+            stop_time,
+            QUIESCENCE_CHECKS,
+        )
+
+    turn_to_move = position.turn
+    in_check = possition_under_attack(
+        position, position.king_squares[turn_to_move], turn_to_move
+    )
+
+    # null move pruning, if passing the turn still beats beta a real move will too.
+    # it's not used after another null move, in check or in possitions with only pawns.
+    if (
+        ply > 0
+        and depth >= NULL_MOVE_MIN_DEPTH
+        and last_move
+        and not in_check
+        and has_non_pawn_material(position, turn_to_move)
+    ):
+        null_move_eval = get_null_move_evaluation(
+            position,
+            alpha,
+            beta,
+            depth,
+            ply,
+            transposition_table,
+            move_heuristics,
+            search_stats,
+            stop_time,
+        )
+        if null_move_eval is not None:
+            return null_move_eval
+
+    valid_moves = get_valid_moves(position)
+
+    # checkmate or stalemate, the static evaluation is only needed at the leaves
+    if len(valid_moves) == 0:
+        return get_board_evaluation(position, last_move, valid_moves)[0] * (depth + 1)
+
     valid_moves = get_move_order_list(
-        valid_moves, turn_to_move, game_stage, current_board_eval[0]
+        position, valid_moves, hash_move, ply, last_move, move_heuristics
     )
 
-    if turn_to_move == "w":
-        max_eval = -float("inf")
-        for move in valid_moves:
-            opponent_board_state = make_move(board_state, turn_to_move, move)
-
-            king_pos = get_king_pos(move, king_pos)
-            temp_castle_rights = get_castle_rights(move, castle_rights)
-            board_eval = get_minimax_evaluation(
-                opponent_board_state,
-                opponent_turn,
-                opponent_king_pos,
-                opponent_castle_rights,
-                king_pos,
-                temp_castle_rights,
-                move,
-                alpha,
-                beta,
-                depth - 1,
-            )
-            max_eval = max(max_eval, board_eval)
+    search_alpha = alpha
+    search_beta = beta
+    best_move = 0
+
+    # principal variation search, the first move is searched with the full window and the
+    # others with a null window that only tests if they're better. a move that turns out
+    # to be better is searched again with the full window.
+    if position.turn == WHITE:
+        best_eval = -float("inf")
+        for move_index, move in enumerate(valid_moves):
+            window_beta = beta
+            if move_index > 0 and alpha != -float("inf"):
+                window_beta = min(alpha + NULL_WINDOW, beta)
+
+            position.push(move)
+            search_depth = depth - 1
+            if alpha != -float("inf") and ply > 0:
+                search_depth -= get_move_reduction(
+                    position, move, depth, move_index, in_check
+                )
+            while True:
+                board_eval = get_minimax_evaluation(
+                    position,
+                    move,
+                    alpha,
+                    window_beta,
+                    search_depth,
+                    ply + 1,
+                    transposition_table,
+                    move_heuristics,
+                    search_stats,
+                    stop_time,
+                )
+                # a reduced move that beats alpha is searched again with the full depth
+                if search_depth < depth - 1:
+                    if board_eval <= alpha:
+                        break
+                    search_depth = depth - 1
+                    continue
+                if window_beta == beta or board_eval <= alpha or board_eval >= beta:
+                    break
+                window_beta = beta
+            position.pop()
+            if board_eval > best_eval:
+                best_eval = board_eval
+                best_move = move
             alpha = max(alpha, board_eval)
             if beta <= alpha:
+                search_stats.add_beta_cutoff(move_index)
+                move_heuristics.update(
+                    move, ply, depth, last_move, valid_moves[:move_index]
+                )
                 break
-        return max_eval
-
-    if turn_to_move == "b":
-        min_eval = float("inf")
-        for move in valid_moves:
-            opponent_board_state = make_move(board_state, turn_to_move, move)
-
-            king_pos = get_king_pos(move, king_pos)
-            temp_castle_rights = get_castle_rights(move, castle_rights)
-            board_eval = get_minimax_evaluation(
-                opponent_board_state,
-                opponent_turn,
-                opponent_king_pos,
-                opponent_castle_rights,
-                king_pos,
-                temp_castle_rights,
-                move,
-                alpha,
-                beta,
-                depth - 1,
-            )
-            min_eval = min(min_eval, board_eval)
+            if root_bounds is not None and ply == 1:
+                alpha, beta, search_alpha, search_beta = get_root_window(
+                    root_bounds, alpha, beta, search_alpha, search_beta
+                )
+                # the root move can't be better than the best one of the other workers
+                if beta <= alpha:
+                    break
+    else:
+        best_eval = float("inf")
+        for move_index, move in enumerate(valid_moves):
+            window_alpha = alpha
+            if move_index > 0 and beta != float("inf"):
+                window_alpha = max(beta - NULL_WINDOW, alpha)
+
+            position.push(move)
+            search_depth = depth - 1
+            if beta != float("inf") and ply > 0:
+                search_depth -= get_move_reduction(
+                    position, move, depth, move_index, in_check
+                )
+            while True:
+                board_eval = get_minimax_evaluation(
+                    position,
+                    move,
+                    window_alpha,
+                    beta,
+                    search_depth,
+                    ply + 1,
+                    transposition_table,
+                    move_heuristics,
+                    search_stats,
+                    stop_time,
+                )
+                # a reduced move that beats beta is searched again with the full depth
+                if search_depth < depth - 1:
+                    if board_eval >= beta:
+                        break
+                    search_depth = depth - 1
+                    continue
+                if window_alpha == alpha or board_eval <= alpha or board_eval >= beta:
+                    break
+                window_alpha = alpha
+            position.pop()
+            if board_eval < best_eval:
+                best_eval = board_eval
+                best_move = move
             beta = min(beta, board_eval)
             if beta <= alpha:
+                search_stats.add_beta_cutoff(move_index)
+                move_heuristics.update(
+                    move, ply, depth, last_move, valid_moves[:move_index]
+                )
                 break
-        return min_eval
+            if root_bounds is not None and ply == 1:
+                alpha, beta, search_alpha, search_beta = get_root_window(
+                    root_bounds, alpha, beta, search_alpha, search_beta
+                )
+                # the root move can't be better than the best one of the other workers
+                if beta <= alpha:
+                    break
+
+    if best_eval <= search_alpha:
+        bound = UPPER_BOUND
+    elif best_eval >= search_beta:
+        bound = LOWER_BOUND
+    else:
+        bound = EXACT
+    transposition_table.store(position.hash, depth, best_eval, bound, best_move)
+
+    return best_eval
+
+
+def get_null_move_evaluation(
+    position: Position,
+    alpha: float,
+    beta: float,
+    depth: int,
+    ply: int,
+    transposition_table: TranspositionTable,
+    move_heuristics: MoveHeuristics,
+    search_stats: SearchStats,
+    stop_time: float = float("inf"),
+) -> float | None:
+    """search the possition after the side to move passes the turn with a reduced depth.
+
+    Args:
+        position (Position): position
+        alpha (float): alpha
+        beta (float): beta
+        depth (int): depth
+        ply (int): ply
+        transposition_table (TranspositionTable): transposition_table
+        move_heuristics (MoveHeuristics): move_heuristics
+        search_stats (SearchStats): search_stats
+        stop_time (float): stop_time
+
+    Returns:
+        float | None:
+        the score the node is cut off with, None if the null move doesn't cause a cutoff.
+    """
+    turn_to_move = position.turn
+    if turn_to_move == WHITE and beta == float("inf"):
+        return None
+    if turn_to_move == BLACK and alpha == -float("inf"):
+        return None
+
+    # the null move is only tried if the side to move is already doing well on the
+    # material and square values, checkmate and stalemate are left to the search after it
+    board_eval = get_material_evaluation(position, get_game_stage(position)[0])
+    if (turn_to_move == WHITE and board_eval < beta) or (
+        turn_to_move == BLACK and board_eval > alpha
+    ):
+        return None
+
+    reduction = NULL_MOVE_REDUCTION + (depth >= NULL_MOVE_DEEP_DEPTH)
+    position.push_null_move()
+    if turn_to_move == WHITE:
+        null_move_eval = get_minimax_evaluation(
+            position,
+            0,
+            beta - NULL_WINDOW,
+            beta,
+            max(depth - 1 - reduction, 0),
+            ply + 1,
+            transposition_table,
+            move_heuristics,
+            search_stats,
+            stop_time,
+        )
+    else:
+        null_move_eval = get_minimax_evaluation(
+            position,
+            0,
+            alpha,
+            alpha + NULL_WINDOW,
+            max(depth - 1 - reduction, 0),
+            ply + 1,
+            transposition_table,
+            move_heuristics,
+            search_stats,
+            stop_time,
+        )
+    position.pop_null_move()
+
+    # the score of the null move search is returned, so it's only equal to the bound by
+    # chance. a mate found after passing the turn isn't a real mate, the bound is returned.
+    if turn_to_move == WHITE and null_move_eval >= beta:
+        return beta if null_move_eval >= MATE_SCORE else null_move_eval
+    if turn_to_move == BLACK and null_move_eval <= alpha:
+        return alpha if null_move_eval <= -MATE_SCORE else null_move_eval
+    return None
+
+
+def get_move_reduction(
+    position: Position, move: int, depth: int, move_index: int, in_check: bool
+) -> int:
+    """return the late move reduction of a move that was just pushed.
+
+    captures, promotions, moves in check and moves that give check aren't reduced.
+
+    Args:
+        position (Position): possition after the move
+        move (int): move
+        depth (int): depth
+        move_index (int): move_index
+        in_check (bool): the side that made the move was in check
+
+    Returns:
+        int:
+    """
+    reduction = get_late_move_reduction(depth, move_index)
+    if reduction == 0 or in_check or not is_quiet_move(move):
+        return 0
+    turn_to_move = position.turn
+    if possition_under_attack(
+        position, position.king_squares[turn_to_move], turn_to_move
+    ):
+        return 0
+    return reduction
@@ -1,67 +1,56 @@
 from .board_evaluation import get_minimax_evaluation
-from .engine_move import get_switched_turn, get_castle_rights, get_king_pos, make_move
-from .board_hash import get_board_hash
-from ..move import Move
+from .transposition_table import TranspositionTable
+from .search_stats import SearchStats
+from .move_heuristics import MoveHeuristics
+from ..logics import Position
+
+import ctypes
 
 
 def get_move_evaluation(
-    move: Move,
-    board_state: list[list[str]],
-    board_hash: int,
-    turn_to_move: str,
-    king_pos: tuple[int, int],
-    castle_rights: dict[str, bool],
-    opponent_king_pos: tuple[int, int],
-    opponent_castle_rights: dict[str, bool],
-    zobrist_hash_keys: dict[str, int],
-    hash_table: dict[str, float],
+    move: int,
+    position: Position,
     depth: int,
-) -> tuple[float, int, Move]:
+    alpha: float,
+    beta: float,
+    transposition_table: TranspositionTable,
+    move_heuristics: MoveHeuristics,
+    search_stats: SearchStats,
+    stop_time: float = float("inf"),
+    root_bounds: ctypes.Array | None = None,
+) -> tuple[float, int]:
     """return the move and it's minimax evaluation.
 
     Args:
-        move (Move): move
-        board_state (list[list[str]]): board_state
-        board_hash (int): board_hash
-        turn_to_move (str): turn_to_move
-        king_pos (tuple[int, int]): king_pos
-        castle_rights (dict[str, bool]): castle_rights
-        opponent_king_pos (tuple[int, int]): opponent_king_pos
-        opponent_castle_rights (dict[str, bool]): opponent_castle_rights
-        zobrist_hash_keys (dict[str, int]): zobrist_hash_keys
-        hash_table (dict[str, float]): hash_table
+        move (int): move
+        position (Position): position
         depth (int): depth
+        alpha (float): alpha
+        beta (float): beta
+        transposition_table (TranspositionTable): transposition_table
+        move_heuristics (MoveHeuristics): move_heuristics
+        search_stats (SearchStats): search_stats
+        stop_time (float): stop_time
+        root_bounds (ctypes.Array | None): shared alpha and beta of the root search
 
     Returns:
-        tuple[float, int, Move]:
+        tuple[float, int]:
     """
 
-    generated_board_state = make_move(board_state, turn_to_move, move)
-
-    if move.is_castle:
-        move.update_end_pos()
-
-    king_pos = get_king_pos(move, king_pos)
-    temp_castle_rights = get_castle_rights(move, castle_rights)
-
-    generated_hash = str(
-        get_board_hash(generated_board_state, board_hash, move, zobrist_hash_keys)
-    )
-
-    if generated_hash in hash_table.keys():
-        return (hash_table[generated_hash], generated_hash, move)
-
+    position.push(move)
     move_eval = get_minimax_evaluation(
-        generated_board_state,
-        get_switched_turn(turn_to_move),
-        opponent_king_pos,
-        opponent_castle_rights,
-        king_pos,
-        temp_castle_rights,
+        position,
         move,
-        -float("inf"),
-        float("inf"),
+        alpha,
+        beta,
         depth,
+        1,
+        transposition_table,
+        move_heuristics,
+        search_stats,
+        stop_time,
+        root_bounds,
     )
+    position.pop()
 
-    return (move_eval, generated_hash, move)
+    return (move_eval, move)
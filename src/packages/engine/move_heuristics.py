@@ -0,0 +1,122 @@
+from ..logics.bitboard import EMPTY
+from ..move.encoding import PROMOTION, EN_PASSANT, SHORT_MOVE_MASK
+
+# deepest ply that has killer move slots
+MAX_PLY: int = 64
+
+# the history scores are halved once one of them gets bigger than this limit
+HISTORY_LIMIT: int = 1 << 16
+
+
+class MoveHeuristics:
+    # quiet moves that caused beta cutoffs, used to order the moves of later searches
+    __slots__ = ("killers", "history", "countermoves")
+
+    def __init__(self) -> None:
+        """initialize empty killer, history and countermove tables.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        # two killer moves for every ply
+        self.killers: list[list[int]] = [[0, 0] for _ in range(MAX_PLY)]
+
+        # butterfly history indexed by piece * 4096 + start * 64 + end
+        self.history: list[int] = [0] * (12 * 64 * 64)
+
+        # the move that refuted the last move, indexed by it's piece * 64 + end
+        self.countermoves: list[int] = [0] * (12 * 64)
+
+    def get_history_score(self, move: int) -> int:
+        """return the history score of a quiet move.
+
+        Args:
+            move (int): move
+
+        Returns:
+            int:
+        """
+        return self.history[((move >> 16) & 15) << 12 | move & 0xFFF]
+
+    def get_countermove(self, last_move: int | None) -> int:
+        """return the short move that refuted last_move, 0 if there is none.
+
+        Args:
+            last_move (int | None): last_move
+
+        Returns:
+            int:
+        """
+        if not last_move:
+            return 0
+        return self.countermoves[((last_move >> 16) & 15) << 6 | (last_move >> 6) & 63]
+
+    def update(
+        self,
+        move: int,
+        ply: int,
+        depth: int,
+        last_move: int | None,
+        searched_moves: list[int],
+    ) -> None:
+        """update the tables after move caused a beta cutoff.
+
+        only quiet moves are stored, the other quiet moves searched before it
+        get a history penalty.
+
+        Args:
+            move (int): move
+            ply (int): ply
+            depth (int): depth
+            last_move (int | None): last_move
+            searched_moves (list[int]): moves searched before move
+
+        Returns:
+            None:
+        """
+        if not is_quiet_move(move):
+            return
+
+        short_move = move & SHORT_MOVE_MASK
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != short_move:
+                killers[1] = killers[0]
+                killers[0] = short_move
+
+        if last_move:
+            self.countermoves[((last_move >> 16) & 15) << 6 | (last_move >> 6) & 63] = (
+                short_move
+            )
+
+        history = self.history
+        bonus = depth * depth
+        history_index = ((move >> 16) & 15) << 12 | move & 0xFFF
+        history[history_index] += bonus
+        for searched_move in searched_moves:
+            if is_quiet_move(searched_move):
+                history[
+                    ((searched_move >> 16) & 15) << 12 | searched_move & 0xFFF
+                ] -= bonus
+
+        if history[history_index] > HISTORY_LIMIT:
+            self.history = [score // 2 for score in history]
+
+
+def is_quiet_move(move: int) -> bool:
+    """check if the move is not a capture, en_passant or promotion.
+
+    Args:
+        move (int): move
+
+    Returns:
+        bool:
+    """
+    move_type = (move >> 14) & 3
+    return (
+        (move >> 20) & 15 == EMPTY
+        and move_type != PROMOTION
+        and move_type != EN_PASSANT
+    )
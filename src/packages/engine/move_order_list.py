@@ -1,69 +1,81 @@
-from ..move import Move
-from ..utils.piece_square_tables import piece_evaluation
-
-# from .square_evaluation import get_piece_square_evaluation
+from ..logics import Position
+from ..logics.bitboard import PAWN, EMPTY
+from ..move.encoding import PROMOTION, EN_PASSANT, SHORT_MOVE_MASK
+from .move_heuristics import MoveHeuristics, MAX_PLY
+from .static_exchange_evaluation import get_static_exchange_evaluation
+from ..utils.piece_square_tables import piece_type_evaluation
+
+# order scores of the move groups, the hash move is searched first, then the captures
+# and promotions that don't lose material, the killer moves, the countermove,
+# the losing captures and the other quiet moves by history.
+HASH_MOVE_SCORE: int = 1 << 30
+CAPTURE_SCORE: int = 1 << 28
+KILLER_MOVE_SCORE: int = 1 << 27
+COUNTERMOVE_SCORE: int = 1 << 26
+LOSING_CAPTURE_SCORE: int = 1 << 25
 
 
 def get_move_order_list(
-    move_list: list[Move], turn_to_move: str, game_stage: str, board_eval: float
-) -> list[Move]:
+    position: Position,
+    move_list: list[int],
+    hash_move: int,
+    ply: int,
+    last_move: int | None,
+    move_heuristics: MoveHeuristics,
+) -> list[int]:
     """reorder the moves to optimize the minimax algorithem.
 
     Args:
-        move_list (list[Move]): move_list
-        turn_to_move (str): turn_to_move
-        game_stage (str): game_stage
-        board_eval (float): board_eval
+        position (Position): position
+        move_list (list[int]): move_list
+        hash_move (int): short move stored in the transposition table, 0 if there is none
+        ply (int): ply
+        last_move (int | None): last_move
+        move_heuristics (MoveHeuristics): move_heuristics
 
     Returns:
-        list[Move]:
+        list[int]:
     """
-    evaluation_index = 1 if turn_to_move == "w" else -1
-    move_value_list: list[tuple[int, float]] = []
-
-    for index, move in enumerate(move_list):
-        if move is None:
-            continue
-
-        capture_score = 0
-
-        start_pos_score = evaluation_index * piece_evaluation[move.moved_piece[1]]
-
-        if move.is_pawn_promotion:
-
-            end_pos_score = evaluation_index * piece_evaluation[move.promoted_piece[1]]
+    killers = move_heuristics.killers[ply] if ply < MAX_PLY else [0, 0]
+    countermove = move_heuristics.get_countermove(last_move)
+    move_value_list: list[tuple[int, int]] = []
+
+    for move in move_list:
+        short_move = move & SHORT_MOVE_MASK
+        captured_piece = (move >> 20) & 15
+        move_type = (move >> 14) & 3
+
+        if short_move == hash_move:
+            move_score = HASH_MOVE_SCORE
+        elif captured_piece != EMPTY or move_type in [PROMOTION, EN_PASSANT]:
+            # most valuable victim first, then least valuable attacker
+            if captured_piece != EMPTY:
+                victim_value = piece_type_evaluation[captured_piece % 6]
+            elif move_type == EN_PASSANT:
+                victim_value = piece_type_evaluation[PAWN]
+            else:
+                victim_value = 0
+            if move_type == PROMOTION:
+                victim_value += piece_type_evaluation[((move >> 12) & 3) + 1]
+            attacker_value = piece_type_evaluation[((move >> 16) & 15) % 6]
+            move_score = CAPTURE_SCORE + int(victim_value * 1000 - attacker_value)
+
+            # taking a piece worth at least the attacker can't lose material
+            if victim_value < attacker_value:
+                exchange_value = get_static_exchange_evaluation(position, move)
+                if exchange_value < 0:
+                    move_score = LOSING_CAPTURE_SCORE + int(exchange_value * 1000)
+        elif short_move == killers[0]:
+            move_score = KILLER_MOVE_SCORE + 1
+        elif short_move == killers[1]:
+            move_score = KILLER_MOVE_SCORE
+        elif short_move == countermove:
+            move_score = COUNTERMOVE_SCORE
         else:
+            move_score = move_heuristics.get_history_score(move)
 
-            end_pos_score = evaluation_index * piece_evaluation[move.moved_piece[1]]
-
-        if move.captured_piece != "__":
-            capture_score = evaluation_index * piece_evaluation[move.captured_piece[1]]
-            if (
-                piece_evaluation[move.moved_piece[1]]
-                - piece_evaluation[move.captured_piece[1]]
-                < 0.5
-            ):
-                capture_score += evaluation_index
-
-        move_eval = board_eval - start_pos_score + end_pos_score + capture_score
-
-        move_value_list.append((index, move_eval))
-
-        # if turn_to_move == "w" and move_eval - board_eval > -2:
-        #
-        #     move_value_list.append((index, move_eval))
-        # elif turn_to_move == "b" and move_eval - board_eval < 2:
-        #     move_value_list.append((index, move_eval))
-
-    reverse_list = True if turn_to_move == "w" else False
-
-    sorted_move_value_list = sorted(
-        move_value_list, key=lambda li: li[1], reverse=reverse_list
-    )
-
-    sorted_move_list: list[Move] = []
+        move_value_list.append((move_score, move))
 
-    for index, _ in sorted_move_value_list:
-        sorted_move_list.append(move_list[index])
+    move_value_list.sort(key=lambda move_value: move_value[0], reverse=True)
 
-    return sorted_move_list
+    return [move for _, move in move_value_list]
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from ..logics import Position, ZobristKeys, get_valid_moves
+from ..logics.bitboard import PAWN
+from ..logics.position import START_FEN
+from ..move.encoding import PROMOTION, CASTLE, SHORT_MOVE_MASK
+
+from random import choices
+from struct import Struct
+import json
+import mmap
+import sys
+
+# the book starts with a header (magic, entry count), followed by the entries sorted by
+# hash and the opening names separated by new lines.
+BOOK_MAGIC: bytes = b"GCAIBOOK"
+HEADER: Struct = Struct(">8sI")
+# an entry is (board hash, 16 bit move, weight, name index) like a polyglot entry,
+# the name is the opening that ends with the move, NO_NAME if there is none.
+ENTRY: Struct = Struct(">QHHI")
+NO_NAME: int = 0xFFFFFFFF
+
+
+class OpeningBook:
+    # memory mapped book file, probed with a binary search over the board hashes
+    __slots__ = ("book_file", "book_data", "entry_count", "names")
+
+    def __init__(self, file_path: str) -> None:
+        """open and memory map a compiled book file.
+
+        Args:
+            file_path (str): file_path
+
+        Returns:
+            None:
+        """
+        self.book_file = open(file_path, "rb")
+        self.book_data: mmap.mmap = mmap.mmap(
+            self.book_file.fileno(), 0, access=mmap.ACCESS_READ
+        )
+
+        magic, self.entry_count = HEADER.unpack_from(self.book_data, 0)
+        if magic != BOOK_MAGIC:
+            raise ValueError(f"{file_path} is not an opening book")
+
+        names_offset = HEADER.size + self.entry_count * ENTRY.size
+        self.names: list[str] = (
+            self.book_data[names_offset:].decode("utf-8").split("\n")
+        )
+
+    @staticmethod
+    def from_file(file_path: str) -> OpeningBook | None:
+        """open the book file, None if it doesn't exist.
+
+        Args:
+            file_path (str): file_path
+
+        Returns:
+            OpeningBook | None:
+        """
+        try:
+            return OpeningBook(file_path)
+        except FileNotFoundError:
+            return None
+
+    def probe(self, board_hash: int) -> list[tuple[int, int, str | None]]:
+        """return the (short move, weight, opening name) entries of the possition.
+
+        Args:
+            board_hash (int): board_hash
+
+        Returns:
+            list[tuple[int, int, str | None]]:
+        """
+        book_data = self.book_data
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            key = ENTRY.unpack_from(book_data, HEADER.size + middle * ENTRY.size)[0]
+            if key < board_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        entries: list[tuple[int, int, str | None]] = []
+        for index in range(low, self.entry_count):
+            key, move, weight, name_index = ENTRY.unpack_from(
+                book_data, HEADER.size + index * ENTRY.size
+            )
+            if key != board_hash:
+                break
+            entries.append(
+                (
+                    move,
+                    weight,
+                    None if name_index == NO_NAME else self.names[name_index],
+                )
+            )
+        return entries
+
+    def get_move(self, position: Position) -> int | None:
+        """return a random book move of the possition chosen by weight, None if it's not in the book.
+
+        Args:
+            position (Position): position
+
+        Returns:
+            int | None:
+        """
+        entries = self.probe(position.hash)
+        if len(entries) == 0:
+            return None
+
+        # the short moves of the book are matched with the valid moves, so a hash
+        # collision can't make the engine play an illegal move.
+        valid_moves = {
+            move & SHORT_MOVE_MASK: move for move in get_valid_moves(position)
+        }
+        book_moves = [
+            (valid_moves[move], weight)
+            for move, weight, _ in entries
+            if move in valid_moves
+        ]
+        if len(book_moves) == 0:
+            return None
+
+        return choices(
+            [move for move, _ in book_moves], [weight for _, weight in book_moves]
+        )[0]
+
+    def get_opening_name(self, board_hash: int, start: int, end: int) -> str | None:
+        """return the name of the opening that ends with the move from start to end.
+
+        Args:
+            board_hash (int): hash of the possition before the move
+            start (int): start square
+            end (int): end square
+
+        Returns:
+            str | None:
+        """
+        for move, _, name in self.probe(board_hash):
+            if move & 63 == start and (move >> 6) & 63 == end:
+                return name
+        return None
+
+    def close(self) -> None:
+        """close the memory map and the book file.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        self.book_data.close()
+        self.book_file.close()
+
+
+def get_notation_move(notation: str, position: Position) -> int | None:
+    """return the valid move of the possition written in SAN, None if there is none.
+
+    both "O-O" and "0-0" are accepted for castling, a disambiguation that isn't needed is accepted too.
+
+    Args:
+        notation (str): notation
+        position (Position): position
+
+    Returns:
+        int | None:
+    """
+    notation = notation.rstrip("+#")
+    valid_moves = get_valid_moves(position)
+
+    if notation in ["O-O", "0-0", "O-O-O", "0-0-0"]:
+        for move in valid_moves:
+            if (move >> 14) & 3 == CASTLE and (
+                ((move >> 6) & 63 > move & 63) == (len(notation) == 3)
+            ):
+                return move
+        return None
+
+    promotion_type = 0
+    if "=" in notation:
+        notation, promoted_piece = notation.split("=")
+        promotion_type = "NBRQ".index(promoted_piece[0]) + 1
+
+    piece_type = PAWN
+    if notation[0] in "NBRQK":
+        piece_type = "PNBRQK".index(notation[0])
+        notation = notation[1:]
+    notation = notation.replace("x", "")
+
+    end = (8 - int(notation[-1])) * 8 + "abcdefgh".index(notation[-2])
+    disambiguation = notation[:-2]
+
+    for move in valid_moves:
+        start = move & 63
+        if (move >> 6) & 63 != end or ((move >> 16) & 15) % 6 != piece_type:
+            continue
+        if (move >> 14) & 3 == PROMOTION:
+            if ((move >> 12) & 3) + 1 != promotion_type:
+                continue
+        elif promotion_type:
+            continue
+        if any(
+            (char.isdigit() and start >> 3 != 8 - int(char))
+            or (char.isalpha() and start & 7 != "abcdefgh".index(char))
+            for char in disambiguation
+        ):
+            continue
+        return move
+    return None
+
+
+def compile_opening_book(
+    openings_path: str, book_path: str, zobrist_hash_keys: ZobristKeys
+) -> int:
+    """replay every opening line once and write the book entries sorted by hash.
+
+    every (possition, move) of the lines is one entry, it's weight is the number of lines
+    playing the move from the possition, so the transpositions are merged.
+
+    Args:
+        openings_path (str): json file of the openings with their moves in SAN
+        book_path (str): book_path
+        zobrist_hash_keys (ZobristKeys): keys the possitions are hashed with
+
+    Returns:
+        int: number of entries
+    """
+    with open(openings_path, "r") as openings_file:
+        openings: list[dict[str, str | list[str]]] = json.load(openings_file)
+
+    weights: dict[tuple[int, int], int] = {}
+    name_indexes: dict[tuple[int, int], int] = {}
+    names: list[str] = []
+    known_names: dict[str, int] = {}
+    # the lines share their first moves, every notation is only parsed once per possition
+    parsed_moves: dict[tuple[int, str], int | None] = {}
+
+    for opening in openings:
+        position = Position.from_fen(START_FEN, zobrist_hash_keys)
+
+        opening_moves = opening["moves"]
+        for move_index, notation in enumerate(opening_moves):
+            parsed_key = (position.hash, notation)
+            if parsed_key not in parsed_moves:
+                parsed_moves[parsed_key] = get_notation_move(notation, position)
+            encoded_move = parsed_moves[parsed_key]
+            if encoded_move is None:
+                print(f"skipped {notation} of {opening['name']}", file=sys.stderr)
+                break
+
+            entry_key = (position.hash, encoded_move & SHORT_MOVE_MASK)
+            weights[entry_key] = weights.get(entry_key, 0) + 1
+            if move_index == len(opening_moves) - 1 and entry_key not in name_indexes:
+                name = opening["name"]
+                if name not in known_names:
+                    known_names[name] = len(names)
+                    names.append(name)
+                name_indexes[entry_key] = known_names[name]
+
+            position.push(encoded_move)
+
+    with open(book_path, "wb") as book_file:
+        book_file.write(HEADER.pack(BOOK_MAGIC, len(weights)))
+        for entry_key in sorted(weights):
+            book_file.write(
+                ENTRY.pack(
+                    entry_key[0],
+                    entry_key[1],
+                    min(weights[entry_key], 0xFFFF),
+                    name_indexes.get(entry_key, NO_NAME),
+                )
+            )
+        book_file.write("\n".join(names).encode("utf-8"))
+
+    return len(weights)
+
+
+if __name__ == "__main__":
+    # python -m packages.engine.opening_book [openings_path] [book_path]
+    entry_count = compile_opening_book(
+        sys.argv[1] if len(sys.argv) > 1 else r"./packages/utils/openings_list.json",
+        sys.argv[2] if len(sys.argv) > 2 else r"./packages/utils/opening_book.bin",
+        ZobristKeys.from_file(r"./packages/utils/zobrist_hash_keys.json"),
+    )
+    print(f"{entry_count} book entries")
@@ -0,0 +1,98 @@
+from .board_evaluation import get_minimax_evaluation
+from .transposition_table import TranspositionTable
+from .move_heuristics import MoveHeuristics
+from .search_stats import SearchStats
+from .principal_variation import get_principal_variation
+from .time_control import SearchTimeout
+
+from ..logics import Position, get_valid_moves
+
+import time
+
+# half width of the window around the score of the previous depth
+ASPIRATION_WINDOW: float = 0.5
+
+
+def search_position(
+    position: Position,
+    max_depth: int,
+    soft_stop_time: float,
+    hard_stop_time: float,
+    depth_offset: int,
+    transposition_table: TranspositionTable,
+    move_heuristics: MoveHeuristics,
+    search_stats: SearchStats,
+) -> tuple[float, int, list[int]] | None:
+    """search the possition with iterative deepening and aspiration windows.
+
+    every Lazy SMP worker runs this search on the same possition, they only share the
+    transposition table. the helpers search one depth deeper than the main worker
+    with depth_offset so they fill the table with results the others can use.
+
+    Args:
+        position (Position): position
+        max_depth (int): max_depth
+        soft_stop_time (float): no new depth is started after this time
+        hard_stop_time (float): the search is stopped at this time
+        depth_offset (int): depth added to every iteration
+        transposition_table (TranspositionTable): transposition_table
+        move_heuristics (MoveHeuristics): move_heuristics
+        search_stats (SearchStats): search_stats
+
+    Returns:
+        tuple[float, int, list[int]] | None:
+        the evaluation, the depth and the principal variation of the last fully searched depth.
+        None if no depth was finished.
+    """
+    search_result: tuple[float, int, list[int]] | None = None
+    valid_moves = get_valid_moves(position)
+    if len(valid_moves) == 0:
+        return None
+
+    for depth in range(1, max_depth + 1):
+        search_depth = min(depth + depth_offset, max_depth)
+        depth_start_time = time.perf_counter()
+
+        alpha, beta = -float("inf"), float("inf")
+        if search_result is not None:
+            alpha = search_result[0] - ASPIRATION_WINDOW
+            beta = search_result[0] + ASPIRATION_WINDOW
+
+        try:
+            while True:
+                board_eval = get_minimax_evaluation(
+                    position,
+                    None,
+                    alpha,
+                    beta,
+                    search_depth,
+                    0,
+                    transposition_table,
+                    move_heuristics,
+                    search_stats,
+                    # the first depth is always finished unless the search is stopped
+                    hard_stop_time if search_result is not None else float("inf"),
+                )
+                if board_eval <= alpha and alpha != -float("inf"):
+                    alpha = -float("inf")
+                elif board_eval >= beta and beta != float("inf"):
+                    beta = float("inf")
+                else:
+                    break
+        except SearchTimeout:
+            break
+
+        principal_variation = get_principal_variation(
+            position, transposition_table, search_depth
+        )
+        if len(principal_variation) == 0:
+            # the root entry was replaced, any legal move keeps the result usable
+            principal_variation = valid_moves[:1]
+
+        search_result = (board_eval, search_depth, principal_variation)
+        search_stats.depth_times[search_depth] = time.perf_counter() - depth_start_time
+
+        if search_depth == max_depth or time.time() >= soft_stop_time:
+            break
+
+    return search_result
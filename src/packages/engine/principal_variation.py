@@ -0,0 +1,44 @@
+from ..logics import Position, get_valid_moves
+from ..move.encoding import SHORT_MOVE_MASK
+from .transposition_table import TranspositionTable
+
+
+def get_principal_variation(
+    position: Position, transposition_table: TranspositionTable, max_length: int
+) -> list[int]:
+    """return the line of best moves stored in the transposition table from the possition.
+
+    Args:
+        position (Position): position
+        transposition_table (TranspositionTable): transposition_table
+        max_length (int): max_length
+
+    Returns:
+        list[int]:
+    """
+    principal_variation: list[int] = []
+    board_hashes: set[int] = {position.hash}
+
+    while len(principal_variation) < max_length:
+        hash_entry = transposition_table.probe(position.hash)
+        if hash_entry is None or not hash_entry[3]:
+            break
+
+        for move in get_valid_moves(position):
+            if move & SHORT_MOVE_MASK == hash_entry[3]:
+                break
+        else:
+            break
+
+        principal_variation.append(move)
+        position.push(move)
+
+        # the line ends once it repeats a possition
+        if position.hash in board_hashes:
+            break
+        board_hashes.add(position.hash)
+
+    for _ in principal_variation:
+        position.pop()
+
+    return principal_variation
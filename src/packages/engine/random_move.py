@@ -3,14 +3,14 @@ from ..move import Move
 from random import choice
 
 
-def get_random_move(move_list: list[Move]) -> Move | None:
+def get_random_move(move_list: list[Move] | list[int]) -> Move | int | None:
     """return a random move from the move list.
 
     Args:
-        move_list (list[Move]): move_list
+        move_list (list[Move] | list[int]): move_list
 
     Returns:
-        Move | None:
+        Move | int | None:
     """
     if len(move_list) == 0:
         return None
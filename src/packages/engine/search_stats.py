@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+
+
+class SearchStats:
+    # counters of a search, kept in memory and only written to a file by flush
+    __slots__ = (
+        "tt_probes",
+        "tt_hits",
+        "tt_cutoffs",
+        "nodes",
+        "qnodes",
+        "beta_cutoffs",
+        "depth_times",
+        "principal_variation",
+    )
+
+    def __init__(self) -> None:
+        """initialize empty search statistics.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        # transposition table lookups, found entries and entries that ended the search of a node
+        self.tt_probes: int = 0
+        self.tt_hits: int = 0
+        self.tt_cutoffs: int = 0
+
+        # searched nodes and quiescence search nodes
+        self.nodes: int = 0
+        self.qnodes: int = 0
+
+        # number of beta cutoffs by the index of the move that caused them
+        self.beta_cutoffs: list[int] = []
+
+        # seconds spent on searching each depth
+        self.depth_times: dict[int, float] = {}
+
+        # expected moves of the game from the possition in uci notation
+        self.principal_variation: list[str] = []
+
+    def add_beta_cutoff(self, move_index: int) -> None:
+        """count a beta cutoff caused by the move at move_index of the move list.
+
+        Args:
+            move_index (int): move_index
+
+        Returns:
+            None:
+        """
+        beta_cutoffs = self.beta_cutoffs
+        while len(beta_cutoffs) <= move_index:
+            beta_cutoffs.append(0)
+        beta_cutoffs[move_index] += 1
+
+    def merge(self, other: SearchStats) -> None:
+        """add the statistics of another search, used for the results of the workers.
+
+        Args:
+            other (SearchStats): other
+
+        Returns:
+            None:
+        """
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+        self.tt_cutoffs += other.tt_cutoffs
+        self.nodes += other.nodes
+        self.qnodes += other.qnodes
+        beta_cutoffs = self.beta_cutoffs
+        beta_cutoffs.extend([0] * (len(other.beta_cutoffs) - len(beta_cutoffs)))
+        for move_index, count in enumerate(other.beta_cutoffs):
+            beta_cutoffs[move_index] += count
+        for depth, depth_time in other.depth_times.items():
+            self.depth_times[depth] = self.depth_times.get(depth, 0) + depth_time
+        if other.principal_variation:
+            self.principal_variation = other.principal_variation
+
+    def to_dict(self) -> dict[str, int | list[int] | dict[int, float] | list[str]]:
+        """return the statistics as a dict.
+
+        Args:
+
+        Returns:
+            dict[str, int | list[int] | dict[int, float] | list[str]]:
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def flush(self, file_path: str) -> None:
+        """write the statistics to a json file.
+
+        Args:
+            file_path (str): file_path
+
+        Returns:
+            None:
+        """
+        with open(file_path, "w") as stats_file:
+            json.dump(self.to_dict(), stats_file, indent=2)
@@ -1,48 +1,24 @@
-from ..utils.piece_square_tables import *
+from ..utils.piece_square_tables import (
+    middle_game_piece_square_values,
+    end_game_piece_square_values,
+)
+from ..logics import Position
 
+from operator import getitem
 
-def get_piece_square_evaluation(
-    piece: str,
-    pos: tuple[int, int],
-    game_stage: str,
-) -> float:
-    """get the value of the piece based on it's possition on the board.
+
+def get_material_evaluation(position: Position, game_stage: str) -> float:
+    """get the material and square value of every piece of the possition.
 
     Args:
-        piece (str): piece
-        pos (tuple[int, int]): pos
+        position (Position): position
         game_stage (str): game_stage
 
     Returns:
         float:
     """
-    row, col = pos
-    if piece == "wP":
-        return wP_table[row][col]
-    if piece == "wN":
-        return wN_table[row][col]
-    if piece == "wB":
-        return wB_table[row][col]
-    if piece == "wR":
-        return wR_table[row][col]
-    if piece == "wQ":
-        return wQ_table[row][col]
-    if piece == "wK" and game_stage == "middle game":
-        return wK_middle_game_table[row][col]
-    if piece == "wK" and game_stage == "end game":
-        return wK_end_game_table[row][col]
-    if piece == "bP":
-        return bP_table[row][col]
-    if piece == "bN":
-        return bN_table[row][col]
-    if piece == "bB":
-        return bB_table[row][col]
-    if piece == "bR":
-        return bR_table[row][col]
-    if piece == "bQ":
-        return bQ_table[row][col]
-    if piece == "bK" and game_stage == "middle game":
-        return bK_middle_game_table[row][col]
-    if piece == "bK" and game_stage == "end game":
-        return bK_end_game_table[row][col]
-    return 0
+    if game_stage == "middle game":
+        piece_square_values = middle_game_piece_square_values
+    else:
+        piece_square_values = end_game_piece_square_values
+    return sum(map(getitem, piece_square_values, position.mailbox))
@@ -0,0 +1,98 @@
+from ..logics import Position, get_square_attackers
+from ..logics.bitboard import (
+    WHITE,
+    BOTH,
+    PAWN,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    EMPTY,
+    square_bitboards,
+    get_bishop_attacks,
+    get_rook_attacks,
+)
+from ..move.encoding import PROMOTION, EN_PASSANT
+from ..utils.piece_square_tables import piece_type_evaluation
+
+
+def get_static_exchange_evaluation(position: Position, move: int) -> float:
+    """return the material the side to move wins with the exchange the move starts on it's end square.
+
+    both sides capture on the square with their least valuable attacker and can stop
+    the exchange when it's not good for them. pieces behind the capturing pieces join
+    the exchange, pins are not taken into account.
+
+    Args:
+        position (Position): position
+        move (int): move
+
+    Returns:
+        float:
+    """
+    bitboards = position.bitboards
+    start = move & 63
+    end = (move >> 6) & 63
+    move_type = (move >> 14) & 3
+    captured_piece = (move >> 20) & 15
+
+    occupied = position.occupancy[BOTH] ^ square_bitboards[start]
+    if move_type == EN_PASSANT:
+        occupied ^= square_bitboards[end + 8 if position.turn == WHITE else end - 8]
+        captured_piece = PAWN
+
+    # gains[n] is the material won by the side making the n-th capture if the exchange stops there
+    gains: list[float] = [
+        0 if captured_piece == EMPTY else piece_type_evaluation[captured_piece % 6]
+    ]
+    piece_value = piece_type_evaluation[((move >> 16) & 15) % 6]
+    if move_type == PROMOTION:
+        promotion_value = piece_type_evaluation[((move >> 12) & 3) + 1]
+        gains[0] += promotion_value - piece_type_evaluation[PAWN]
+        piece_value = promotion_value
+
+    diagonal_pieces = (
+        bitboards[BISHOP]
+        | bitboards[QUEEN]
+        | bitboards[6 + BISHOP]
+        | bitboards[6 + QUEEN]
+    )
+    straight_pieces = (
+        bitboards[ROOK] | bitboards[QUEEN] | bitboards[6 + ROOK] | bitboards[6 + QUEEN]
+    )
+
+    attackers = get_square_attackers(bitboards, end, occupied) & occupied
+    side = position.turn ^ 1
+
+    while True:
+        side_attackers = attackers & position.occupancy[side]
+        if not side_attackers:
+            break
+
+        for piece_type in range(PAWN, KING + 1):
+            piece_attackers = side_attackers & bitboards[side * 6 + piece_type]
+            if piece_attackers:
+                break
+        attacker = piece_attackers & -piece_attackers
+
+        # the king can only capture if the square isn't defended anymore
+        if piece_type == KING and attackers & ~attacker & position.occupancy[side ^ 1]:
+            break
+
+        gains.append(piece_value - gains[-1])
+
+        occupied ^= attacker
+        if piece_type in [PAWN, BISHOP, QUEEN]:
+            attackers |= get_bishop_attacks(end, occupied) & diagonal_pieces
+        if piece_type in [ROOK, QUEEN]:
+            attackers |= get_rook_attacks(end, occupied) & straight_pieces
+        attackers &= occupied
+
+        piece_value = piece_type_evaluation[piece_type]
+        side ^= 1
+
+    # each side only continues the exchange if it's better than stopping
+    for index in range(len(gains) - 1, 0, -1):
+        gains[index - 1] = -max(-gains[index - 1], gains[index])
+
+    return gains[0]
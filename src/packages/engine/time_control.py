@@ -0,0 +1,105 @@
+import ctypes
+import time
+
+# deepest iteration of the iterative deepening search
+MAX_SEARCH_DEPTH: int = 32
+
+# expected number of moves left in the game when the clock has no moves_to_go
+DEFAULT_MOVES_TO_GO: int = 30
+
+# time kept on the clock for the communication with the gui, in seconds
+MOVE_OVERHEAD: float = 0.05
+
+
+# number of nodes searched between two checks of the clock
+CLOCK_CHECK_NODES: int = 256
+
+
+# flag shared with the process that started the search, every search of the process stops once it's set
+search_stop: ctypes.c_bool | None = None
+
+# nodes searched by the process since the clock was checked, it's kept between the
+# searches so the short searches of the root moves in the workers still reach a check.
+searched_nodes: int = 0
+
+
+class SearchTimeout(Exception):
+    """raised inside a search once it's hard deadline is reached."""
+
+
+def get_search_deadlines(
+    start_time: float,
+    move_time: float | None = None,
+    time_left: float | None = None,
+    increment: float = 0,
+    moves_to_go: int | None = None,
+) -> tuple[float, float]:
+    """return the soft and the hard deadline of a search as time.time() values.
+
+    no new iteration is started after the soft deadline and the search is stopped at
+    the hard deadline. a search without move_time and time_left has no deadlines.
+
+    Args:
+        start_time (float): start_time
+        move_time (float | None): fixed time of the move in seconds
+        time_left (float | None): time left on the clock in seconds
+        increment (float): increment in seconds
+        moves_to_go (int | None): moves_to_go
+
+    Returns:
+        tuple[float, float]:
+    """
+    if move_time is not None:
+        hard_time = max(move_time - MOVE_OVERHEAD, 0)
+        return (start_time + hard_time * 0.5, start_time + hard_time)
+
+    if time_left is not None:
+        available_time = max(time_left - MOVE_OVERHEAD, 0)
+        soft_time = available_time / (moves_to_go or DEFAULT_MOVES_TO_GO) + increment
+        soft_time = min(soft_time, available_time * 0.5)
+        hard_time = min(soft_time * 3, available_time * 0.8)
+        return (start_time + soft_time, start_time + hard_time)
+
+    return (float("inf"), float("inf"))
+
+
+def set_search_stop(stop_flag: ctypes.c_bool) -> None:
+    """set the shared flag that stops the searches of the process.
+
+    Args:
+        stop_flag (ctypes.c_bool): stop_flag
+
+    Returns:
+        None:
+    """
+    global search_stop
+    search_stop = stop_flag
+
+
+def check_search_time(stop_time: float) -> None:
+    """raise SearchTimeout if the stop_time has passed or the search was stopped.
+
+    Args:
+        stop_time (float): stop_time
+
+    Returns:
+        None:
+    """
+    if time.time() >= stop_time or (search_stop is not None and search_stop.value):
+        raise SearchTimeout()
+
+
+def count_search_node(stop_time: float) -> None:
+    """count a searched node and check the clock once every CLOCK_CHECK_NODES nodes.
+
+    Args:
+        stop_time (float): stop_time
+
+    Returns:
+        None:
+    """
+    global searched_nodes
+    searched_nodes += 1
+    if searched_nodes >= CLOCK_CHECK_NODES:
+        searched_nodes = 0
+        check_search_time(stop_time)
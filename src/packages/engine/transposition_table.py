@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from array import array
+from struct import pack, unpack
+
+from multiprocessing.shared_memory import SharedMemory
+import mmap
+import os
+
+# bound types of a stored score
+EXACT: int = 0
+# the score is a lower bound, the search failed high (score >= beta)
+LOWER_BOUND: int = 1
+# the score is an upper bound, the search failed low (score <= alpha)
+UPPER_BOUND: int = 2
+
+# an entry is two 64 bit words (hash ^ data, data) and a bucket holds a
+# depth-preferred entry followed by an always-replace entry.
+ENTRY_SIZE: int = 16
+BUCKET_SIZE: int = 2 * ENTRY_SIZE
+
+HASH_MASK: int = 0xFFFFFFFFFFFFFFFF
+
+
+def pack_entry(depth: int, score: float, bound: int, move: int) -> int:
+    """pack an entry in a 64 bit word.
+
+    Args:
+        depth (int): depth
+        score (float): score
+        bound (int): bound
+        move (int): move
+
+    Returns:
+        int:
+        bits 0-15 the 16 bit move, 16-47 the score as a float32,
+        48-55 the depth and 56-57 the bound type.
+    """
+    return (
+        (move & 0xFFFF)
+        | unpack("<I", pack("<f", score))[0] << 16
+        | (depth & 0xFF) << 48
+        | bound << 56
+    )
+
+
+def unpack_entry(data: int) -> tuple[int, float, int, int]:
+    """unpack an entry to depth, score, bound and move.
+
+    Args:
+        data (int): data
+
+    Returns:
+        tuple[int, float, int, int]:
+    """
+    return (
+        (data >> 48) & 0xFF,
+        unpack("<f", pack("<I", (data >> 16) & 0xFFFFFFFF))[0],
+        (data >> 56) & 3,
+        data & 0xFFFF,
+    )
+
+
+def get_table_score(score: float) -> float:
+    """return the score as it's read back from the table, rounded to a float32.
+
+    Args:
+        score (float): score
+
+    Returns:
+        float:
+    """
+    return unpack("<f", pack("<f", score))[0]
+
+
+def get_bucket_count(size_mb: int) -> int:
+    """return the largest power of two number of buckets that fits in the size.
+
+    Args:
+        size_mb (int): size of the table in megabytes
+
+    Returns:
+        int:
+    """
+    bucket_count = 1
+    while bucket_count * 2 * BUCKET_SIZE <= size_mb * 1024 * 1024:
+        bucket_count *= 2
+    return bucket_count
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: int = 16) -> None:
+        """initialize a transposition table with a fixed size.
+
+        Args:
+            size_mb (int): size of the table in megabytes
+
+        Returns:
+            None:
+        """
+        # number of buckets is a power of two so the index is hash & bucket_mask
+        bucket_count = get_bucket_count(size_mb)
+
+        self.bucket_mask: int = bucket_count - 1
+
+        # each entry is stored as hash ^ data followed by data, an entry is only
+        # used if both words give back the hash (lock-less hashing).
+        self.entries: array | memoryview = array("Q", bytes(bucket_count * BUCKET_SIZE))
+
+        # memory map of the table file if the table is stored in a file
+        self.table_file: mmap.mmap | None = None
+
+        # shared memory block of the table if it's shared between processes
+        self.shared_memory: SharedMemory | None = None
+
+    def probe(self, board_hash: int) -> tuple[int, float, int, int] | None:
+        """return the stored depth, score, bound and move of the possition if it's found.
+
+        Args:
+            board_hash (int): board_hash
+
+        Returns:
+            tuple[int, float, int, int] | None:
+        """
+        board_hash &= HASH_MASK
+        entries = self.entries
+        index = (board_hash & self.bucket_mask) * 4
+
+        for slot in [index, index + 2]:
+            data = entries[slot + 1]
+            if entries[slot] ^ data == board_hash and data:
+                return unpack_entry(data)
+        return None
+
+    def store(
+        self, board_hash: int, depth: int, score: float, bound: int, move: int
+    ) -> None:
+        """store the search result of the possition.
+
+        deeper results are kept in the depth-preferred entry of the bucket,
+        everything else goes to the always-replace entry.
+
+        Args:
+            board_hash (int): board_hash
+            depth (int): depth
+            score (float): score
+            bound (int): bound
+            move (int): move
+
+        Returns:
+            None:
+        """
+        board_hash &= HASH_MASK
+        entries = self.entries
+        index = (board_hash & self.bucket_mask) * 4
+        data = pack_entry(depth, score, bound, move)
+
+        stored_data = entries[index + 1]
+        if (
+            entries[index] ^ stored_data == board_hash
+            or depth >= (stored_data >> 48) & 0xFF
+        ):
+            # keep the best move of the possition if the new result doesn't have one
+            if not move and entries[index] ^ stored_data == board_hash:
+                data |= stored_data & 0xFFFF
+            entries[index] = board_hash ^ data
+            entries[index + 1] = data
+        else:
+            entries[index + 2] = board_hash ^ data
+            entries[index + 3] = data
+
+    def clear(self) -> None:
+        """remove every entry of the table.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        self.entries[:] = array("Q", bytes(len(self.entries) * 8))
+
+    def flush(self) -> None:
+        """write the changed entries of a memory mapped table to it's file.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        if self.table_file is not None:
+            self.table_file.flush()
+
+    @staticmethod
+    def from_file(file_path: str, size_mb: int) -> TranspositionTable:
+        """open a transposition table stored in a binary file.
+
+        the file is memory mapped, so opening it doesn't read the entries and
+        every store is written in place. a new file is created if it doesn't
+        exist or if it's size doesn't match the table size.
+
+        Args:
+            file_path (str): file_path
+            size_mb (int): size of the table in megabytes
+
+        Returns:
+            TranspositionTable:
+        """
+        transposition_table = TranspositionTable(0)
+        bucket_count = get_bucket_count(size_mb)
+        table_size = bucket_count * BUCKET_SIZE
+
+        mode = "r+b" if os.path.exists(file_path) else "w+b"
+        with open(file_path, mode) as table_file:
+            if os.path.getsize(file_path) != table_size:
+                table_file.truncate(0)
+                table_file.truncate(table_size)
+            transposition_table.table_file = mmap.mmap(table_file.fileno(), table_size)
+
+        transposition_table.bucket_mask = bucket_count - 1
+        transposition_table.entries = memoryview(transposition_table.table_file).cast(
+            "Q"
+        )
+        return transposition_table
+
+    @staticmethod
+    def from_shared_memory(name: str | None, size_mb: int) -> TranspositionTable:
+        """create a transposition table in shared memory, or attach to the one with the given name.
+
+        the processes using the table don't lock it, an entry that was written by two
+        processes at the same time doesn't give back it's hash and is ignored.
+
+        Args:
+            name (str | None): name of the shared memory block, None to create a new one
+            size_mb (int): size of the table in megabytes
+
+        Returns:
+            TranspositionTable:
+        """
+        transposition_table = TranspositionTable(0)
+        bucket_count = get_bucket_count(size_mb)
+
+        if name is None:
+            shared_memory = SharedMemory(create=True, size=bucket_count * BUCKET_SIZE)
+            shared_memory.buf[:] = bytes(bucket_count * BUCKET_SIZE)
+        else:
+            shared_memory = SharedMemory(name=name)
+
+        transposition_table.shared_memory = shared_memory
+        transposition_table.bucket_mask = bucket_count - 1
+        transposition_table.entries = shared_memory.buf[
+            : bucket_count * BUCKET_SIZE
+        ].cast("Q")
+        return transposition_table
+
+    def close(self, unlink: bool = False) -> None:
+        """release the shared memory of the table.
+
+        Args:
+            unlink (bool): also remove the shared memory block, done by the process that created it
+
+        Returns:
+            None:
+        """
+        if self.shared_memory is None:
+            return
+        self.entries.release()
+        self.entries = array("Q", bytes(BUCKET_SIZE))
+        self.bucket_mask = 0
+        self.shared_memory.close()
+        if unlink:
+            self.shared_memory.unlink()
+        self.shared_memory = None
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+from .best_move import get_best_move
+from .worker_pool import WorkerPool, create_worker_pool
+from .transposition_table import TranspositionTable
+from .search_stats import SearchStats
+from .time_control import MAX_SEARCH_DEPTH
+from .opening_book import OpeningBook
+from .bench import BENCH_DEPTH, run_bench
+from ..logics import Position, ZobristKeys, get_valid_moves
+from ..logics.position import START_FEN
+from ..move.encoding import get_uci_notation
+
+from threading import Event, Thread
+import sys
+import time
+
+ENGINE_NAME: str = "GCAI"
+ENGINE_AUTHOR: str = "Omid Reisi"
+
+
+class UciEngine:
+    # state of a uci session, the searches run in a thread so stop can be read while searching
+    __slots__ = (
+        "zobrist_hash_keys",
+        "worker_pool",
+        "transposition_table",
+        "opening_book",
+        "position",
+        "search_thread",
+        "stop_event",
+    )
+
+    def __init__(self) -> None:
+        """load the engine data and start the worker processes.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        self.zobrist_hash_keys: ZobristKeys = ZobristKeys.from_file(
+            r"./packages/utils/zobrist_hash_keys.json"
+        )
+        self.worker_pool: WorkerPool = create_worker_pool(self.zobrist_hash_keys)
+        # the workers are forked before stdin is read, a worker forked by the search
+        # thread while the main thread holds the lock of stdin would hang when it closes it.
+        self.worker_pool.start_workers()
+        self.transposition_table: TranspositionTable = TranspositionTable(16)
+        self.opening_book: OpeningBook | None = OpeningBook.from_file(
+            r"./packages/utils/opening_book.bin"
+        )
+
+        self.position: Position = self.get_position(START_FEN, [])
+        self.search_thread: Thread | None = None
+        # set by stop, an infinite search only reports it's move once it's set
+        self.stop_event: Event = Event()
+
+    def get_position(self, fen: str, uci_moves: list[str]) -> Position:
+        """return the possition of the fen after the moves in uci notation.
+
+        Args:
+            fen (str): fen
+            uci_moves (list[str]): uci_moves
+
+        Returns:
+            Position:
+        """
+        position = Position.from_fen(fen, self.zobrist_hash_keys)
+        for uci_move in uci_moves:
+            for move in get_valid_moves(position):
+                if get_uci_notation(move) == uci_move:
+                    position.push(move)
+                    break
+            else:
+                print(f"info string illegal move {uci_move}", flush=True)
+                break
+        return position
+
+    def set_position(self, arguments: list[str]) -> None:
+        """handle "position [startpos | fen <fen>] [moves <move> ...]".
+
+        Args:
+            arguments (list[str]): arguments
+
+        Returns:
+            None:
+        """
+        moves_index = (
+            arguments.index("moves") if "moves" in arguments else len(arguments)
+        )
+        if len(arguments) > 0 and arguments[0] == "fen":
+            fen = " ".join(arguments[1:moves_index])
+        else:
+            fen = START_FEN
+        try:
+            self.position = self.get_position(fen, arguments[moves_index + 1 :])
+        except (ValueError, KeyError, IndexError):
+            print(f"info string invalid FEN {fen}", flush=True)
+
+    def start_search(self, arguments: list[str]) -> None:
+        """handle "go", the search is started in a thread and bestmove is printed by it.
+
+        Args:
+            arguments (list[str]): arguments
+
+        Returns:
+            None:
+        """
+        self.wait_search()
+
+        options: dict[str, int] = {}
+        infinite = False
+        for index, argument in enumerate(arguments):
+            if argument == "infinite":
+                infinite = True
+            elif argument in [
+                "depth",
+                "movetime",
+                "wtime",
+                "btime",
+                "winc",
+                "binc",
+                "movestogo",
+            ] and index + 1 < len(arguments):
+                options[argument] = int(arguments[index + 1])
+
+        # the times of uci are in milliseconds
+        side = "w" if self.position.turn_to_move == "w" else "b"
+        move_time = time_left = None
+        increment = 0.0
+        if not infinite:
+            if "movetime" in options:
+                move_time = options["movetime"] / 1000
+            elif f"{side}time" in options:
+                time_left = options[f"{side}time"] / 1000
+                increment = options.get(f"{side}inc", 0) / 1000
+
+        self.stop_event.clear()
+        self.search_thread = Thread(
+            target=self.search,
+            args=(
+                self.position.copy(),
+                options.get("depth", MAX_SEARCH_DEPTH),
+                move_time,
+                time_left,
+                increment,
+                options.get("movestogo"),
+                infinite,
+            ),
+            daemon=True,
+        )
+        self.search_thread.start()
+
+    def search(
+        self,
+        position: Position,
+        max_depth: int,
+        move_time: float | None,
+        time_left: float | None,
+        increment: float,
+        moves_to_go: int | None,
+        infinite: bool,
+    ) -> None:
+        """search the possition and print the info line and the best move.
+
+        Args:
+            position (Position): position
+            max_depth (int): max_depth
+            move_time (float | None): move_time
+            time_left (float | None): time_left
+            increment (float): increment
+            moves_to_go (int | None): moves_to_go
+            infinite (bool): wait for stop before the best move is printed
+
+        Returns:
+            None:
+        """
+        start_time = time.perf_counter()
+        valid_moves = get_valid_moves(position)
+        best_move, search_stats = get_best_move(
+            valid_moves,
+            position,
+            None if infinite else self.opening_book,
+            self.worker_pool,
+            self.transposition_table,
+            max_depth=max_depth,
+            move_time=move_time,
+            time_left=time_left,
+            increment=increment,
+            moves_to_go=moves_to_go,
+        )
+        elapsed_time = time.perf_counter() - start_time
+
+        if search_stats.depth_times:
+            print(get_info_line(search_stats, elapsed_time), flush=True)
+
+        # there is no move only when the game is over
+        if best_move is not None:
+            uci_move = get_uci_notation(best_move.encoded_move)
+        else:
+            uci_move = "0000"
+
+        if infinite:
+            self.stop_event.wait()
+        print(f"bestmove {uci_move}", flush=True)
+
+    def stop_search(self) -> None:
+        """handle "stop", the running search reports the best move it has found.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        self.stop_event.set()
+        # the search clears the flag when it starts, so it's set until the thread is done
+        while self.search_thread is not None and self.search_thread.is_alive():
+            self.worker_pool.set_search_stop(True)
+            self.search_thread.join(0.01)
+        self.search_thread = None
+
+    def wait_search(self) -> None:
+        """wait for the running search to print it's best move.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        if self.search_thread is not None:
+            self.search_thread.join()
+            self.search_thread = None
+
+    def new_game(self) -> None:
+        """handle "ucinewgame", the transposition tables are cleared.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        self.wait_search()
+        self.transposition_table.clear()
+        if self.worker_pool.shared_table is not None:
+            self.worker_pool.shared_table.clear()
+        self.position = self.get_position(START_FEN, [])
+
+    def run(self) -> None:
+        """read the uci commands from stdin until quit or the end of the input.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        for line in sys.stdin:
+            tokens = line.split()
+            if len(tokens) == 0:
+                continue
+            command, arguments = tokens[0], tokens[1:]
+
+            if command == "uci":
+                print(f"id name {ENGINE_NAME}", flush=True)
+                print(f"id author {ENGINE_AUTHOR}", flush=True)
+                print("uciok", flush=True)
+            elif command == "isready":
+                print("readyok", flush=True)
+            elif command == "ucinewgame":
+                self.new_game()
+            elif command == "position":
+                self.wait_search()
+                self.set_position(arguments)
+            elif command == "go":
+                self.start_search(arguments)
+            elif command == "stop":
+                self.stop_search()
+            elif command == "bench":
+                self.wait_search()
+                run_bench(
+                    int(arguments[0]) if len(arguments) > 0 else BENCH_DEPTH,
+                    self.zobrist_hash_keys,
+                )
+            elif command == "quit":
+                break
+
+        self.stop_search()
+        self.worker_pool.shutdown()
+
+
+def get_info_line(search_stats: SearchStats, elapsed_time: float) -> str:
+    """return the uci info line of a finished search.
+
+    Args:
+        search_stats (SearchStats): search_stats
+        elapsed_time (float): elapsed_time in seconds
+
+    Returns:
+        str:
+    """
+    nodes = search_stats.nodes + search_stats.qnodes
+    info_line = (
+        f"info depth {max(search_stats.depth_times)} nodes {nodes} "
+        f"time {int(elapsed_time * 1000)} nps {int(nodes / max(elapsed_time, 1e-9))}"
+    )
+    if search_stats.principal_variation:
+        info_line += " pv " + " ".join(search_stats.principal_variation)
+    return info_line
+
+
+if __name__ == "__main__":
+    # python -m packages.engine.uci
+    UciEngine().run()
@@ -0,0 +1,289 @@
+from .move_evaluation import get_move_evaluation
+from .transposition_table import TranspositionTable
+from .search_stats import SearchStats
+from .principal_variation import get_principal_variation
+from .move_heuristics import MoveHeuristics
+from .position_search import search_position
+from .time_control import set_search_stop, check_search_time
+from ..logics import Position, ZobristKeys
+
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing.sharedctypes import RawArray, RawValue
+from typing import Any, Callable
+import atexit
+import ctypes
+import os
+
+# static engine data of a worker process, set once when the worker starts
+worker_zobrist_hash_keys: ZobristKeys | None = None
+worker_transposition_table: TranspositionTable | None = None
+# killer, history and countermove tables of the worker, kept between the searches
+worker_move_heuristics: MoveHeuristics | None = None
+# alpha and beta of the root search, shared with the process that searches the root
+worker_root_bounds: ctypes.Array | None = None
+
+
+def initialize_worker(
+    zobrist_hash_keys: ZobristKeys,
+    hash_size_mb: int,
+    shared_table_name: str | None,
+    root_bounds: ctypes.Array,
+    stop_flag: ctypes.c_bool,
+) -> None:
+    """store the static engine data in the worker process and create it's transposition table.
+
+    Args:
+        zobrist_hash_keys (ZobristKeys): zobrist_hash_keys
+        hash_size_mb (int): size of the transposition table of the worker in megabytes
+        shared_table_name (str | None): shared memory name of the transposition table
+        shared by the workers, None if every worker has it's own table
+        root_bounds (ctypes.Array): shared alpha and beta of the root search
+        stop_flag (ctypes.c_bool): shared flag that stops the searches of the worker
+
+    Returns:
+        None:
+    """
+    global worker_zobrist_hash_keys, worker_transposition_table, worker_move_heuristics
+    global worker_root_bounds
+    worker_zobrist_hash_keys = zobrist_hash_keys
+    if shared_table_name is None:
+        worker_transposition_table = TranspositionTable(hash_size_mb)
+    else:
+        worker_transposition_table = TranspositionTable.from_shared_memory(
+            shared_table_name, hash_size_mb
+        )
+    worker_move_heuristics = MoveHeuristics()
+    worker_root_bounds = root_bounds
+    set_search_stop(stop_flag)
+
+
+class WorkerPool:
+    def __init__(
+        self, zobrist_hash_keys: ZobristKeys, hash_size_mb: int, lazy_smp: bool
+    ) -> None:
+        """start the engine worker processes.
+
+        Args:
+            zobrist_hash_keys (ZobristKeys): zobrist_hash_keys
+            hash_size_mb (int): size of the transposition table of each worker in megabytes
+            lazy_smp (bool): every worker searches the whole possition with a shared
+            transposition table instead of searching a part of the root moves
+
+        Returns:
+            None:
+        """
+        self.lazy_smp: bool = lazy_smp
+        self.worker_count: int = os.cpu_count() or 1
+
+        # the workers read the bounds while they search, without a lock, so a root move
+        # that can't beat the best move found by the other workers is given up early.
+        self.root_bounds: ctypes.Array = RawArray("d", [-float("inf"), float("inf")])
+
+        # every search of the workers stops once the flag is set
+        self.stop_flag: ctypes.c_bool = RawValue(ctypes.c_bool, False)
+
+        # the Lazy SMP workers share one transposition table in shared memory
+        self.shared_table: TranspositionTable | None = None
+        if lazy_smp:
+            self.shared_table = TranspositionTable.from_shared_memory(
+                None, hash_size_mb
+            )
+
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=self.worker_count,
+            initializer=initialize_worker,
+            initargs=(
+                zobrist_hash_keys,
+                hash_size_mb,
+                (
+                    self.shared_table.shared_memory.name
+                    if self.shared_table is not None
+                    else None
+                ),
+                self.root_bounds,
+                self.stop_flag,
+            ),
+        )
+
+        atexit.register(self.shutdown)
+
+    def submit(self, task: Callable[..., Any], *args: Any) -> Future:
+        """run the task in one of the worker processes.
+
+        Args:
+            task (Callable[..., Any]): task
+            args (Any): arguments of the task
+
+        Returns:
+            Future:
+        """
+        return self.executor.submit(task, *args)
+
+    def start_workers(self) -> None:
+        """start the worker processes now instead of on the first search.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        wait([self.submit(os.getpid) for _ in range(self.worker_count)])
+
+    def set_root_bounds(self, alpha: float, beta: float) -> None:
+        """set the alpha and beta of the root search seen by the workers.
+
+        Args:
+            alpha (float): alpha
+            beta (float): beta
+
+        Returns:
+            None:
+        """
+        self.root_bounds[0] = alpha
+        self.root_bounds[1] = beta
+
+    def set_search_stop(self, stop: bool) -> None:
+        """stop the searches running in the workers, or allow the next ones to run.
+
+        Args:
+            stop (bool): stop
+
+        Returns:
+            None:
+        """
+        self.stop_flag.value = stop
+
+    def shutdown(self) -> None:
+        """stop the worker processes and remove the shared transposition table.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        self.set_search_stop(True)
+        self.executor.shutdown(cancel_futures=True)
+        if self.shared_table is not None:
+            self.shared_table.close(unlink=True)
+            self.shared_table = None
+
+
+def create_worker_pool(
+    zobrist_hash_keys: ZobristKeys, hash_size_mb: int = 16, lazy_smp: bool = False
+) -> WorkerPool:
+    """create the engine worker pool. it's created once and used for every engine move.
+
+    Args:
+        zobrist_hash_keys (ZobristKeys): zobrist_hash_keys
+        hash_size_mb (int): size of the transposition table of each worker in megabytes
+        lazy_smp (bool): use the Lazy SMP search instead of splitting the root moves
+
+    Returns:
+        WorkerPool:
+    """
+    return WorkerPool(zobrist_hash_keys, hash_size_mb, lazy_smp)
+
+
+def get_task_position(position: Position) -> Position:
+    """return a copy of the possition without the static data, to be sent to the workers.
+
+    Args:
+        position (Position): position
+
+    Returns:
+        Position:
+    """
+    task_position = position.copy()
+    task_position.zobrist_hash_keys = None
+    task_position.undo_stack = []
+    # the repetition counts of the game are kept, but the moves before the task can't be
+    # popped, so the task starts after the last irreversible move.
+    task_position.irreversible_index = 0
+    task_position.repetition_stack = []
+    return task_position
+
+
+def evaluate_move(
+    move: int,
+    position: Position,
+    depth: int,
+    alpha: float,
+    beta: float,
+    stop_time: float,
+    use_root_bounds: bool = True,
+) -> tuple[float, int, list[int], SearchStats]:
+    """evaluate a root move in a worker process. the search raises SearchTimeout at stop_time.
+
+    Args:
+        move (int): move
+        position (Position): position
+        depth (int): depth
+        alpha (float): alpha
+        beta (float): beta
+        stop_time (float): stop_time
+        use_root_bounds (bool): narrow the window to the bounds shared by the other workers
+
+    Returns:
+        tuple[float, int, list[int], SearchStats]:
+        the evaluation, the move, it's principal variation and the statistics of it's search
+    """
+    # a task that starts after the deadline or the stop isn't searched at all
+    check_search_time(stop_time)
+
+    position.zobrist_hash_keys = worker_zobrist_hash_keys
+    search_stats = SearchStats()
+    move_eval, move = get_move_evaluation(
+        move,
+        position,
+        depth,
+        alpha,
+        beta,
+        worker_transposition_table,
+        worker_move_heuristics,
+        search_stats,
+        stop_time,
+        worker_root_bounds if use_root_bounds else None,
+    )
+
+    position.push(move)
+    principal_variation = [move] + get_principal_variation(
+        position, worker_transposition_table, depth
+    )
+    position.pop()
+
+    return (move_eval, move, principal_variation, search_stats)
+
+
+def search_position_task(
+    position: Position,
+    max_depth: int,
+    soft_stop_time: float,
+    hard_stop_time: float,
+    depth_offset: int,
+) -> tuple[tuple[float, int, list[int]] | None, SearchStats]:
+    """run a Lazy SMP search of the possition in a worker process.
+
+    Args:
+        position (Position): position
+        max_depth (int): max_depth
+        soft_stop_time (float): soft_stop_time
+        hard_stop_time (float): hard_stop_time
+        depth_offset (int): depth_offset
+
+    Returns:
+        tuple[tuple[float, int, list[int]] | None, SearchStats]:
+        the result of the search and it's statistics
+    """
+    position.zobrist_hash_keys = worker_zobrist_hash_keys
+    search_stats = SearchStats()
+    search_result = search_position(
+        position,
+        max_depth,
+        soft_stop_time,
+        hard_stop_time,
+        depth_offset,
+        worker_transposition_table,
+        worker_move_heuristics,
+        search_stats,
+    )
+    return (search_result, search_stats)
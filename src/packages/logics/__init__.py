@@ -1,5 +1,12 @@
-from .check import possition_under_attack
-from .movement import get_possible_moves
+from .position import Position
+from .zobrist import ZobristKeys
+from .check import (
+    possition_under_attack,
+    get_attackers,
+    get_square_attackers,
+    get_pinned_pieces,
+)
+from .movement import get_piece_moves
 from .valid_moves import (
     is_valid,
     any_valid_moves,
@@ -0,0 +1,313 @@
+# squares are numbered the same way board_state is indexed: square = row * 8 + col,
+# so square 0 is a8 and square 63 is h1. bit n of a bitboard represents square n.
+
+WHITE: int = 0
+BLACK: int = 1
+BOTH: int = 2
+
+PAWN: int = 0
+KNIGHT: int = 1
+BISHOP: int = 2
+ROOK: int = 3
+QUEEN: int = 4
+KING: int = 5
+
+# piece index is color * 6 + piece type. EMPTY marks an empty square in the mailbox.
+WHITE_PAWN: int = 0
+WHITE_KNIGHT: int = 1
+WHITE_BISHOP: int = 2
+WHITE_ROOK: int = 3
+WHITE_QUEEN: int = 4
+WHITE_KING: int = 5
+BLACK_PAWN: int = 6
+BLACK_KNIGHT: int = 7
+BLACK_BISHOP: int = 8
+BLACK_ROOK: int = 9
+BLACK_QUEEN: int = 10
+BLACK_KING: int = 11
+EMPTY: int = 12
+
+WHITE_SHORT_CASTLE: int = 1
+WHITE_LONG_CASTLE: int = 2
+BLACK_SHORT_CASTLE: int = 4
+BLACK_LONG_CASTLE: int = 8
+
+FULL_BOARD: int = 0xFFFF_FFFF_FFFF_FFFF
+
+FILE_A: int = 0x0101_0101_0101_0101
+FILE_H: int = FILE_A << 7
+
+# string representation of each piece index, used by the pygame board.
+piece_names: list[str] = [
+    "wP",
+    "wN",
+    "wB",
+    "wR",
+    "wQ",
+    "wK",
+    "bP",
+    "bN",
+    "bB",
+    "bR",
+    "bQ",
+    "bK",
+    "__",
+]
+piece_indexes: dict[str, int] = {name: index for index, name in enumerate(piece_names)}
+
+color_names: list[str] = ["w", "b"]
+color_indexes: dict[str, int] = {"w": WHITE, "b": BLACK}
+
+square_bitboards: list[int] = [1 << square for square in range(64)]
+
+
+def get_square(pos: tuple[int, int]) -> int:
+    """convert a (row, col) possition to a square index.
+
+    Args:
+        pos (tuple[int, int]): pos
+
+    Returns:
+        int:
+    """
+    return pos[0] * 8 + pos[1]
+
+
+def get_pos(square: int) -> tuple[int, int]:
+    """convert a square index to a (row, col) possition.
+
+    Args:
+        square (int): square
+
+    Returns:
+        tuple[int, int]:
+    """
+    return (square >> 3, square & 7)
+
+
+def get_lsb(bitboard: int) -> int:
+    """return the index of the least significant set bit.
+
+    Args:
+        bitboard (int): bitboard
+
+    Returns:
+        int:
+    """
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+def get_squares(bitboard: int) -> list[int]:
+    """return the indexes of all the set bits of the bitboard.
+
+    Args:
+        bitboard (int): bitboard
+
+    Returns:
+        list[int]:
+    """
+    squares: list[int] = []
+    while bitboard:
+        lsb = bitboard & -bitboard
+        squares.append(lsb.bit_length() - 1)
+        bitboard ^= lsb
+    return squares
+
+
+def get_step_attacks(square: int, steps: list[tuple[int, int]]) -> int:
+    """return the bitboard of squares reached by one of the given (row, col) steps.
+
+    Args:
+        square (int): square
+        steps (list[tuple[int, int]]): steps
+
+    Returns:
+        int:
+    """
+    row, col = get_pos(square)
+    attacks = 0
+    for row_step, col_step in steps:
+        s_row = row + row_step
+        s_col = col + col_step
+        if 0 <= s_row < 8 and 0 <= s_col < 8:
+            attacks |= square_bitboards[s_row * 8 + s_col]
+    return attacks
+
+
+knight_steps: list[tuple[int, int]] = [
+    (-1, 2),
+    (-1, -2),
+    (-2, 1),
+    (-2, -1),
+    (1, 2),
+    (1, -2),
+    (2, -1),
+    (2, 1),
+]
+king_steps: list[tuple[int, int]] = [
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+]
+
+knight_attacks: list[int] = [get_step_attacks(sq, knight_steps) for sq in range(64)]
+king_attacks: list[int] = [get_step_attacks(sq, king_steps) for sq in range(64)]
+
+# squares attacked by a pawn of the given color standing on the square.
+# white pawns move towards row 0 and black pawns towards row 7.
+pawn_attacks: list[list[int]] = [
+    [get_step_attacks(sq, [(-1, -1), (-1, 1)]) for sq in range(64)],
+    [get_step_attacks(sq, [(1, -1), (1, 1)]) for sq in range(64)],
+]
+
+
+def get_ray(square: int, row_step: int, col_step: int) -> int:
+    """return the bitboard of squares from square (excluded) to the edge of the board.
+
+    Args:
+        square (int): square
+        row_step (int): row_step
+        col_step (int): col_step
+
+    Returns:
+        int:
+    """
+    row, col = get_pos(square)
+    ray = 0
+    row += row_step
+    col += col_step
+    while 0 <= row < 8 and 0 <= col < 8:
+        ray |= square_bitboards[row * 8 + col]
+        row += row_step
+        col += col_step
+    return ray
+
+
+# rays going towards higher square indexes. the first blocker is the least significant bit.
+south_rays: list[int] = [get_ray(sq, 1, 0) for sq in range(64)]
+east_rays: list[int] = [get_ray(sq, 0, 1) for sq in range(64)]
+south_east_rays: list[int] = [get_ray(sq, 1, 1) for sq in range(64)]
+south_west_rays: list[int] = [get_ray(sq, 1, -1) for sq in range(64)]
+
+# rays going towards lower square indexes. the first blocker is the most significant bit.
+north_rays: list[int] = [get_ray(sq, -1, 0) for sq in range(64)]
+west_rays: list[int] = [get_ray(sq, 0, -1) for sq in range(64)]
+north_west_rays: list[int] = [get_ray(sq, -1, -1) for sq in range(64)]
+north_east_rays: list[int] = [get_ray(sq, -1, 1) for sq in range(64)]
+
+
+def get_bishop_attacks(square: int, occupied: int) -> int:
+    """return the squares attacked by a bishop on square for the given occupancy.
+
+    Args:
+        square (int): square
+        occupied (int): occupied
+
+    Returns:
+        int:
+    """
+    attacks = south_east_rays[square]
+    blockers = attacks & occupied
+    if blockers:
+        attacks ^= south_east_rays[(blockers & -blockers).bit_length() - 1]
+
+    ray = south_west_rays[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= south_west_rays[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+
+    ray = north_west_rays[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= north_west_rays[blockers.bit_length() - 1]
+    attacks |= ray
+
+    ray = north_east_rays[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= north_east_rays[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def get_rook_attacks(square: int, occupied: int) -> int:
+    """return the squares attacked by a rook on square for the given occupancy.
+
+    Args:
+        square (int): square
+        occupied (int): occupied
+
+    Returns:
+        int:
+    """
+    attacks = south_rays[square]
+    blockers = attacks & occupied
+    if blockers:
+        attacks ^= south_rays[(blockers & -blockers).bit_length() - 1]
+
+    ray = east_rays[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= east_rays[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+
+    ray = north_rays[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= north_rays[blockers.bit_length() - 1]
+    attacks |= ray
+
+    ray = west_rays[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= west_rays[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def get_between_and_line(square: int, target: int) -> tuple[int, int]:
+    """return the squares between two aligned squares and the full line through them.
+
+    Args:
+        square (int): square
+        target (int): target
+
+    Returns:
+        tuple[int, int]: both are 0 if the squares are not on the same row, column or diagonal
+    """
+    for ray, opposite_ray in [
+        (south_rays, north_rays),
+        (east_rays, west_rays),
+        (south_east_rays, north_west_rays),
+        (south_west_rays, north_east_rays),
+    ]:
+        for rays in [(ray, opposite_ray), (opposite_ray, ray)]:
+            if rays[0][square] & square_bitboards[target]:
+                between = rays[0][square] ^ rays[0][target] ^ square_bitboards[target]
+                line = ray[square] | opposite_ray[square] | square_bitboards[square]
+                return (between, line)
+    return (0, 0)
+
+
+# squares between two squares on the same row, column or diagonal (used for blocking checks)
+# and the whole line going through them (used for moving pinned pieces)
+between_bitboards: list[list[int]] = [
+    [get_between_and_line(sq, target)[0] for target in range(64)] for sq in range(64)
+]
+line_bitboards: list[list[int]] = [
+    [get_between_and_line(sq, target)[1] for target in range(64)] for sq in range(64)
+]
+
+
+# castle rights that are kept when a piece moves from or to the square.
+castle_rights_masks: list[int] = [15] * 64
+castle_rights_masks[0] = 15 ^ BLACK_LONG_CASTLE
+castle_rights_masks[4] = 15 ^ (BLACK_SHORT_CASTLE | BLACK_LONG_CASTLE)
+castle_rights_masks[7] = 15 ^ BLACK_SHORT_CASTLE
+castle_rights_masks[56] = 15 ^ WHITE_LONG_CASTLE
+castle_rights_masks[60] = 15 ^ (WHITE_SHORT_CASTLE | WHITE_LONG_CASTLE)
+castle_rights_masks[63] = 15 ^ WHITE_SHORT_CASTLE
@@ -1,103 +1,211 @@
-def possition_under_attack(
-    board_state: list[list[str]], possition: tuple[int, int], turn_to_move: str
+from .bitboard import (
+    WHITE,
+    BLACK,
+    BOTH,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    FILE_A,
+    FILE_H,
+    FULL_BOARD,
+    between_bitboards,
+    knight_attacks,
+    king_attacks,
+    pawn_attacks,
+    get_bishop_attacks,
+    get_rook_attacks,
+)
+from .position import Position
+
+
+def is_square_attacked(
+    bitboards: list[int],
+    square: int,
+    turn_to_move: int,
+    occupied: int,
+    captured: int = 0,
 ) -> bool:
-    """check to see if the given possition is under attack from opponent's pieces.
+    """check to see if the square is attacked by opponent's pieces for the given occupancy.
 
     Args:
-        board_state (list[list[str]]): board_state
-        possition (tuple[int, int]): possition
-        turn_to_move (str): turn_to_move
+        bitboards (list[int]): bitboards
+        square (int): square
+        turn_to_move (int): turn_to_move
+        occupied (int): occupied
+        captured (int): bitboard of opponent pieces that are captured and can't attack
 
     Returns:
         bool:
     """
-    row, col = possition
-
-    opponent_color = "w" if turn_to_move == "b" else "b"
-
-    king_checks = [
-        (row - 1, col - 1),
-        (row - 1, col),
-        (row - 1, col + 1),
-        (row, col - 1),
-        (row, col + 1),
-        (row + 1, col - 1),
-        (row + 1, col),
-        (row + 1, col + 1),
-    ]
-
-    knight_checks = [
-        (row - 1, col + 2),
-        (row - 1, col - 2),
-        (row - 2, col + 1),
-        (row - 2, col - 1),
-        (row + 1, col + 2),
-        (row + 1, col - 2),
-        (row + 2, col - 1),
-        (row + 2, col + 1),
-    ]
-
-    bishop_directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-    rook_directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-    if turn_to_move == "w" and row - 1 in range(8):
-        if col - 1 in range(8):
-            if board_state[row - 1][col - 1] == "bP":
-                return True
-        if col + 1 in range(8):
-            if board_state[row - 1][col + 1] == "bP":
-                return True
-
-    if turn_to_move == "b" and row + 1 in range(8):
-        if col - 1 in range(8):
-            if board_state[row + 1][col - 1] == "wP":
-                return True
-        if col + 1 in range(8):
-            if board_state[row + 1][col + 1] == "wP":
-                return True
-
-    for s_row, s_col in king_checks:
-        if s_row in range(8) and s_col in range(8):
-            if board_state[s_row][s_col] == f"{opponent_color}K":
-                return True
-
-    for s_row, s_col in knight_checks:
-        if s_row in range(8) and s_col in range(8):
-            if board_state[s_row][s_col] == f"{opponent_color}N":
-                return True
-
-    for direction in bishop_directions:
-        for i in range(1, 8):
-            s_row = row + direction[0] * i
-            s_col = col + direction[1] * i
-
-            if s_row not in range(8) or s_col not in range(8):
-                break
-
-            if board_state[s_row][s_col] in [
-                f"{opponent_color}B",
-                f"{opponent_color}Q",
-            ]:
-                return True
-
-            if board_state[s_row][s_col] != "__":
-                break
-
-    for direction in rook_directions:
-        for i in range(1, 8):
-            s_row = row + direction[0] * i
-            s_col = col + direction[1] * i
-
-            if s_row not in range(8) or s_col not in range(8):
-                break
-
-            if board_state[s_row][s_col] in [
-                f"{opponent_color}R",
-                f"{opponent_color}Q",
-            ]:
-                return True
-
-            if board_state[s_row][s_col] != "__":
-                break
+    opponent = (turn_to_move ^ 1) * 6
+    not_captured = ~captured
+
+    if pawn_attacks[turn_to_move][square] & bitboards[opponent + PAWN] & not_captured:
+        return True
+    if knight_attacks[square] & bitboards[opponent + KNIGHT] & not_captured:
+        return True
+    if king_attacks[square] & bitboards[opponent + KING]:
+        return True
+
+    queens = bitboards[opponent + QUEEN]
+    if (
+        get_bishop_attacks(square, occupied)
+        & (bitboards[opponent + BISHOP] | queens)
+        & not_captured
+    ):
+        return True
+    if (
+        get_rook_attacks(square, occupied)
+        & (bitboards[opponent + ROOK] | queens)
+        & not_captured
+    ):
+        return True
 
     return False
+
+
+def possition_under_attack(position: Position, square: int, turn_to_move: int) -> bool:
+    """check to see if the given square is under attack from opponent's pieces.
+
+    Args:
+        position (Position): position
+        square (int): square
+        turn_to_move (int): turn_to_move
+
+    Returns:
+        bool:
+    """
+    return is_square_attacked(
+        position.bitboards, square, turn_to_move, position.occupancy[BOTH]
+    )
+
+
+def get_attackers(
+    bitboards: list[int], square: int, turn_to_move: int, occupied: int
+) -> int:
+    """return the bitboard of opponent pieces attacking the square for the given occupancy.
+
+    Args:
+        bitboards (list[int]): bitboards
+        square (int): square
+        turn_to_move (int): turn_to_move
+        occupied (int): occupied
+
+    Returns:
+        int:
+    """
+    opponent = (turn_to_move ^ 1) * 6
+    queens = bitboards[opponent + QUEEN]
+
+    return (
+        (pawn_attacks[turn_to_move][square] & bitboards[opponent + PAWN])
+        | (knight_attacks[square] & bitboards[opponent + KNIGHT])
+        | (king_attacks[square] & bitboards[opponent + KING])
+        | (
+            get_bishop_attacks(square, occupied)
+            & (bitboards[opponent + BISHOP] | queens)
+        )
+        | (get_rook_attacks(square, occupied) & (bitboards[opponent + ROOK] | queens))
+    )
+
+
+def get_square_attackers(bitboards: list[int], square: int, occupied: int) -> int:
+    """return the bitboard of the pieces of both sides attacking the square for the given occupancy.
+
+    Args:
+        bitboards (list[int]): bitboards
+        square (int): square
+        occupied (int): occupied
+
+    Returns:
+        int:
+    """
+    return get_attackers(bitboards, square, WHITE, occupied) | get_attackers(
+        bitboards, square, BLACK, occupied
+    )
+
+
+def get_attacked_squares(bitboards: list[int], side: int, occupied: int) -> int:
+    """return every square attacked by the pieces of side for the given occupancy.
+
+    Args:
+        bitboards (list[int]): bitboards
+        side (int): side
+        occupied (int): occupied
+
+    Returns:
+        int:
+    """
+    base = side * 6
+
+    pawns = bitboards[base + PAWN]
+    if side == WHITE:
+        attacked = ((pawns & ~FILE_A) >> 9) | ((pawns & ~FILE_H) >> 7)
+    else:
+        attacked = (((pawns & ~FILE_A) << 7) | ((pawns & ~FILE_H) << 9)) & FULL_BOARD
+
+    pieces = bitboards[base + KNIGHT]
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        attacked |= knight_attacks[lsb.bit_length() - 1]
+
+    queens = bitboards[base + QUEEN]
+
+    pieces = bitboards[base + BISHOP] | queens
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        attacked |= get_bishop_attacks(lsb.bit_length() - 1, occupied)
+
+    pieces = bitboards[base + ROOK] | queens
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        attacked |= get_rook_attacks(lsb.bit_length() - 1, occupied)
+
+    pieces = bitboards[base + KING]
+    if pieces:
+        attacked |= king_attacks[pieces.bit_length() - 1]
+
+    return attacked
+
+
+def get_pinned_pieces(position: Position, king_square: int) -> int:
+    """return the bitboard of pieces of the side to move that are pinned to their king.
+
+    Args:
+        position (Position): position
+        king_square (int): king_square
+
+    Returns:
+        int:
+    """
+    bitboards = position.bitboards
+    turn_to_move = position.turn
+    opponent = (turn_to_move ^ 1) * 6
+    opponent_pieces = position.occupancy[turn_to_move ^ 1]
+    occupied = position.occupancy[BOTH]
+    queens = bitboards[opponent + QUEEN]
+
+    # opponent sliders that would attack the king if none of our pieces were in the way
+    snipers = (
+        get_bishop_attacks(king_square, opponent_pieces)
+        & (bitboards[opponent + BISHOP] | queens)
+    ) | (
+        get_rook_attacks(king_square, opponent_pieces)
+        & (bitboards[opponent + ROOK] | queens)
+    )
+
+    pinned = 0
+    while snipers:
+        lsb = snipers & -snipers
+        snipers ^= lsb
+        blockers = between_bitboards[king_square][lsb.bit_length() - 1] & occupied
+        if blockers and not blockers & (blockers - 1):
+            pinned |= blockers
+
+    return pinned & position.occupancy[turn_to_move]
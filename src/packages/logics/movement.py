@@ -1,717 +1,295 @@
-from ..move import Move
+from .bitboard import (
+    WHITE,
+    BLACK,
+    BOTH,
+    PAWN,
+    KNIGHT,
+    BISHOP,
+    ROOK,
+    QUEEN,
+    KING,
+    EMPTY,
+    WHITE_SHORT_CASTLE,
+    WHITE_LONG_CASTLE,
+    BLACK_SHORT_CASTLE,
+    BLACK_LONG_CASTLE,
+    FULL_BOARD,
+    FILE_A,
+    FILE_H,
+    square_bitboards,
+    line_bitboards,
+    knight_attacks,
+    pawn_attacks,
+    get_bishop_attacks,
+    get_rook_attacks,
+)
 from .check import possition_under_attack
+from .position import Position
+from ..move.encoding import PROMOTION, EN_PASSANT, CASTLE
 
+# squares of the third rank from each side's point of view, used for two square pawn moves
+third_rank: list[int] = [0xFF << 40, 0xFF << 16]
 
-def get_possible_moves(
-    board_state: list[list[str]],
-    selected_pos: tuple[int, int],
-    turn_to_move: str,
-    last_move: Move | None,
-    castle_rights: dict[str, bool],
-    given_piece: str | None = None,
-) -> list[Move]:
-    """get all the possible move regardless of if they're valid or not based on turn_to_move.
+# encoded promotion flags of a pawn move for knight, bishop, rook and queen promotions
+promotion_flags: list[int] = [
+    PROMOTION << 14 | (piece_type - 1) << 12
+    for piece_type in [QUEEN, ROOK, BISHOP, KNIGHT]
+]
 
-    Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
-        last_move (Move | None): last_move
-        castle_rights (dict[str, bool]): castle_rights
-        given_piece (str | None): given_piece
-
-    Returns:
-        list[Move]:
-    """
-
-    row, col = selected_pos
-
-    selected_side, piece = board_state[row][col]
-
-    if given_piece is not None and selected_side + piece != given_piece:
-        return []
 
-    if selected_side == turn_to_move:
-
-        if piece == "P":
-            move_list = get_pawn_moves(board_state, selected_pos, turn_to_move)
-
-            move = get_en_passant(board_state, selected_pos, turn_to_move, last_move)
-
-            if move is not None:
-                move_list.append(move)
-
-            return move_list
-        if piece == "N":
-            return get_knight_moves(board_state, selected_pos, turn_to_move)
-        if piece == "B":
-            return get_bishop_moves(board_state, selected_pos, turn_to_move)
-        if piece == "R":
-            return get_rook_moves(board_state, selected_pos, turn_to_move)
-        if piece == "Q":
-            return get_queen_moves(board_state, selected_pos, turn_to_move)
-        if piece == "K":
-            return get_king_moves(board_state, selected_pos, turn_to_move) + get_castle(
-                board_state, selected_pos, turn_to_move, castle_rights
-            )
-
-    return []
-
-
-def get_pawn_moves(
-    board_state: list[list[str]], selected_pos: tuple[int, int], turn_to_move: str
-) -> list[Move]:
-    moves: list[Move] = []
-    p_row, p_col = selected_pos
-    if turn_to_move == "w":
-        try:
-            if board_state[p_row - 1][p_col] == "__":
-                moves.append(
-                    Move(selected_pos, (p_row - 1, p_col), board_state, turn_to_move)
-                )
-                if p_row == 6 and board_state[p_row - 2][p_col] == "__":
-
-                    moves.append(
-                        Move(
-                            selected_pos, (p_row - 2, p_col), board_state, turn_to_move
-                        )
-                    )
-
-        except IndexError:
-            return moves
-
-        if p_row - 1 in range(8):
-            if p_col - 1 in range(8):
-
-                if board_state[p_row - 1][p_col - 1][0] == "b":
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row - 1, p_col - 1),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-
-        if p_row - 1 in range(8):
-            if p_col + 1 in range(8):
-                if board_state[p_row - 1][p_col + 1][0] == "b":
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row - 1, p_col + 1),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-
-        return moves
-
-    if turn_to_move == "b":
-        try:
-            if board_state[p_row + 1][p_col] == "__":
-                moves.append(
-                    Move(selected_pos, (p_row + 1, p_col), board_state, turn_to_move)
-                )
-                if p_row == 1 and board_state[p_row + 2][p_col] == "__":
-
-                    moves.append(
-                        Move(
-                            selected_pos, (p_row + 2, p_col), board_state, turn_to_move
-                        )
-                    )
-
-        except IndexError:
-            return moves
-
-        if p_row + 1 in range(8):
-            if p_col - 1 in range(8):
-
-                if board_state[p_row + 1][p_col - 1][0] == "w":
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row + 1, p_col - 1),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-
-        if p_row + 1 in range(8):
-            if p_col + 1 in range(8):
-                if board_state[p_row + 1][p_col + 1][0] == "w":
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row + 1, p_col + 1),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-
-        return moves
-
-
-def get_en_passant(
-    board_state: list[list[str]],
-    selected_pos: tuple[int, int],
-    turn_to_move: str,
-    last_move: Move | None,
-) -> Move | None:
-    """return en_passant move if it's possible.
+def get_piece_moves(
+    position: Position, targets: int, pinned: int, king_square: int
+) -> list[int]:
+    """get the moves of every piece except the king that end on one of the target squares.
 
     Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
-        last_move (Move | None): last_move
+        position (Position): position
+        targets (int): squares the moves are allowed to end on
+        pinned (int): pieces pinned to the king, limited to the line between the king and the pinner
+        king_square (int): king_square
 
     Returns:
-        Move | None:
+        list[int]:
     """
-    if last_move is None:
-        return None
-
-    p_row, p_col = selected_pos
-
-    if turn_to_move == "w" and p_row == 3:
-        if p_col - 1 in range(8) and board_state[p_row][p_col - 1] == "bP":
-            if last_move.is_two_square_pawn_move():
-                return Move(
-                    selected_pos, (p_row - 1, p_col - 1), board_state, turn_to_move
-                )
-        if p_col + 1 in range(8) and board_state[p_row][p_col + 1] == "bP":
-            if last_move.is_two_square_pawn_move():
-                return Move(
-                    selected_pos, (p_row - 1, p_col + 1), board_state, turn_to_move
-                )
-
-    if turn_to_move == "b" and p_row == 4:
-        if p_col - 1 in range(8) and board_state[p_row][p_col - 1] == "wP":
-            if last_move.is_two_square_pawn_move():
-                return Move(
-                    selected_pos, (p_row + 1, p_col - 1), board_state, turn_to_move
-                )
-        if p_col + 1 in range(8) and board_state[p_row][p_col + 1] == "wP":
-            if last_move.is_two_square_pawn_move():
-                return Move(
-                    selected_pos, (p_row + 1, p_col + 1), board_state, turn_to_move
-                )
-
-    return None
-
-
-def get_knight_moves(
-    board_state: list[list[str]], selected_pos: tuple[int, int], turn_to_move: str
-) -> list[Move]:
-    """get all available knight moves.
-
-    Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
-
-    Returns:
-        list[Move]:
-    """
-    moves: list[Move] = []
-    p_row, p_col = selected_pos
-    possitions_to_check = [
-        (p_row - 1, p_col + 2),
-        (p_row - 1, p_col - 2),
-        (p_row - 2, p_col + 1),
-        (p_row - 2, p_col - 1),
-        (p_row + 1, p_col + 2),
-        (p_row + 1, p_col - 2),
-        (p_row + 2, p_col - 1),
-        (p_row + 2, p_col + 1),
-    ]
-
-    for row, col in possitions_to_check:
-        if row in range(8) and col in range(8):
-            if board_state[row][col][0] != turn_to_move:
-                moves.append(Move(selected_pos, (row, col), board_state, turn_to_move))
+    turn_to_move = position.turn
+    bitboards = position.bitboards
+    occupied = position.occupancy[BOTH]
+    mailbox = position.mailbox
+    base = turn_to_move * 6
+    king_lines = line_bitboards[king_square]
+
+    pawns = bitboards[base + PAWN]
+    moves = get_pawn_moves(position, pawns & ~pinned, targets)
+    pieces = pawns & pinned
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        moves += get_pawn_moves(
+            position, lsb, targets & king_lines[lsb.bit_length() - 1]
+        )
+
+    # a pinned knight can never stay on the line between the king and the pinner
+    pieces = bitboards[base + KNIGHT] & ~pinned
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        start = lsb.bit_length() - 1
+        add_moves(moves, start, knight_attacks[start] & targets, mailbox)
+
+    pieces = bitboards[base + BISHOP]
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        start = lsb.bit_length() - 1
+        piece_targets = targets & king_lines[start] if lsb & pinned else targets
+        add_moves(
+            moves, start, get_bishop_attacks(start, occupied) & piece_targets, mailbox
+        )
+
+    pieces = bitboards[base + ROOK]
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        start = lsb.bit_length() - 1
+        piece_targets = targets & king_lines[start] if lsb & pinned else targets
+        add_moves(
+            moves, start, get_rook_attacks(start, occupied) & piece_targets, mailbox
+        )
+
+    pieces = bitboards[base + QUEEN]
+    while pieces:
+        lsb = pieces & -pieces
+        pieces ^= lsb
+        start = lsb.bit_length() - 1
+        piece_targets = targets & king_lines[start] if lsb & pinned else targets
+        add_moves(
+            moves,
+            start,
+            (get_bishop_attacks(start, occupied) | get_rook_attacks(start, occupied))
+            & piece_targets,
+            mailbox,
+        )
 
     return moves
 
 
-def get_bishop_moves(
-    board_state: list[list[str]], selected_pos: tuple[int, int], turn_to_move: str
-) -> list[Move]:
-    """get all available bishop moves.
+def add_moves(moves: list[int], start: int, targets: int, mailbox: list[int]) -> None:
+    """add a move from start to every square of the targets bitboard.
 
     Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
+        moves (list[int]): moves
+        start (int): start
+        targets (int): targets
+        mailbox (list[int]): mailbox
 
     Returns:
-        list[Move]:
+        None:
     """
-    moves: list[Move] = []
-    directions = {
-        "upleft": True,
-        "upright": True,
-        "downleft": True,
-        "downright": True,
-    }
-    p_row, p_col = selected_pos
-
-    for i in range(1, 8):
-        if p_row + i in range(8):
-            if p_col + i in range(8):
-                possition_to_check = board_state[p_row + i][p_col + i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["downright"] = False
-                elif directions["downright"]:
-
-                    if possition_to_check != "__":
-                        directions["downright"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row + i, p_col + i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-            if p_col - i in range(8):
-                possition_to_check = board_state[p_row + i][p_col - i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["downleft"] = False
-                elif directions["downleft"]:
-
-                    if possition_to_check != "__":
-                        directions["downleft"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row + i, p_col - i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-
-        if p_row - i in range(8):
-            if p_col + i in range(8):
-                possition_to_check = board_state[p_row - i][p_col + i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["upright"] = False
-                elif directions["upright"]:
-
-                    if possition_to_check != "__":
-                        directions["upright"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row - i, p_col + i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-            if p_col - i in range(8):
-                possition_to_check = board_state[p_row - i][p_col - i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["upleft"] = False
-                elif directions["upleft"]:
-
-                    if possition_to_check != "__":
-                        directions["upleft"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row - i, p_col - i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-    return moves
+    start |= mailbox[start] << 16
+    while targets:
+        lsb = targets & -targets
+        targets ^= lsb
+        end = lsb.bit_length() - 1
+        moves.append(start | end << 6 | mailbox[end] << 20)
 
 
-def get_rook_moves(
-    board_state: list[list[str]], selected_pos: tuple[int, int], turn_to_move: str
-) -> list[Move]:
-    """get all available rook moves.
+def add_pawn_moves(
+    moves: list[int], targets: int, offset: int, mailbox: list[int]
+) -> None:
+    """add pawn moves to every square of the targets bitboard, the start square being end + offset.
 
     Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
+        moves (list[int]): moves
+        targets (int): targets
+        offset (int): offset
+        mailbox (list[int]): mailbox
 
     Returns:
-        list[Move]:
+        None:
     """
-    moves: list[Move] = []
-
-    directions = {
-        "up": True,
-        "down": True,
-        "left": True,
-        "right": True,
-    }
-
-    p_row, p_col = selected_pos
-
-    for i in range(1, 8):
-        if p_row + i in range(8):
-            possition_to_check = board_state[p_row + i][p_col]
-            if possition_to_check[0] == turn_to_move:
-                directions["down"] = False
-            elif directions["down"]:
-
-                if possition_to_check != "__":
-                    directions["down"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row + i, p_col),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
-        if p_row - i in range(8):
-            possition_to_check = board_state[p_row - i][p_col]
-            if possition_to_check[0] == turn_to_move:
-                directions["up"] = False
-            elif directions["up"]:
-
-                if possition_to_check != "__":
-                    directions["up"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row - i, p_col),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
-        if p_col + i in range(8):
-            possition_to_check = board_state[p_row][p_col + i]
-            if possition_to_check[0] == turn_to_move:
-                directions["right"] = False
-            elif directions["right"]:
-
-                if possition_to_check != "__":
-                    directions["right"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row, p_col + i),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
-        if p_col - i in range(8):
-            possition_to_check = board_state[p_row][p_col - i]
-            if possition_to_check[0] == turn_to_move:
-                directions["left"] = False
-            elif directions["left"]:
-
-                if possition_to_check != "__":
-                    directions["left"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row, p_col - i),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
-    return moves
-
-
-def get_queen_moves(
-    board_state: list[list[str]], selected_pos: tuple[int, int], turn_to_move: str
-) -> list[Move]:
-    """get all available queen moves.
+    while targets:
+        lsb = targets & -targets
+        targets ^= lsb
+        end = lsb.bit_length() - 1
+        start = end + offset
+        move = start | end << 6 | mailbox[start] << 16 | mailbox[end] << 20
+        if end < 8 or end >= 56:
+            for promotion_flag in promotion_flags:
+                moves.append(move | promotion_flag)
+        else:
+            moves.append(move)
+
+
+def get_pawn_moves(position: Position, pawns: int, targets: int) -> list[int]:
+    """get the pushes and captures of the given pawns that end on one of the target squares.
 
     Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
+        position (Position): position
+        pawns (int): pawns
+        targets (int): targets
 
     Returns:
-        list[Move]:
+        list[int]:
     """
-    moves: list[Move] = []
-    directions = {
-        "up": True,
-        "down": True,
-        "left": True,
-        "right": True,
-        "upleft": True,
-        "upright": True,
-        "downleft": True,
-        "downright": True,
-    }
-    p_row, p_col = selected_pos
-
-    for i in range(1, 8):
-        if p_row + i in range(8):
-
-            possition_to_check = board_state[p_row + i][p_col]
-            if possition_to_check[0] == turn_to_move:
-                directions["down"] = False
-            elif directions["down"]:
-
-                if possition_to_check != "__":
-                    directions["down"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row + i, p_col),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
-
-            if p_col + i in range(8):
-                possition_to_check = board_state[p_row + i][p_col + i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["downright"] = False
-                elif directions["downright"]:
-
-                    if possition_to_check != "__":
-                        directions["downright"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row + i, p_col + i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-            if p_col - i in range(8):
-                possition_to_check = board_state[p_row + i][p_col - i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["downleft"] = False
-                elif directions["downleft"]:
-
-                    if possition_to_check != "__":
-                        directions["downleft"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row + i, p_col - i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-
-        if p_row - i in range(8):
-
-            possition_to_check = board_state[p_row - i][p_col]
-            if possition_to_check[0] == turn_to_move:
-                directions["up"] = False
-            elif directions["up"]:
-
-                if possition_to_check != "__":
-                    directions["up"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row - i, p_col),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
-
-            if p_col + i in range(8):
-                possition_to_check = board_state[p_row - i][p_col + i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["upright"] = False
-                elif directions["upright"]:
-
-                    if possition_to_check != "__":
-                        directions["upright"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row - i, p_col + i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-            if p_col - i in range(8):
-                possition_to_check = board_state[p_row - i][p_col - i]
-                if possition_to_check[0] == turn_to_move:
-                    directions["upleft"] = False
-                elif directions["upleft"]:
-
-                    if possition_to_check != "__":
-                        directions["upleft"] = False
-                    moves.append(
-                        Move(
-                            selected_pos,
-                            (p_row - i, p_col - i),
-                            board_state,
-                            turn_to_move,
-                        )
-                    )
-
-        if p_col + i in range(8):
-            possition_to_check = board_state[p_row][p_col + i]
-            if possition_to_check[0] == turn_to_move:
-                directions["right"] = False
-            elif directions["right"]:
-
-                if possition_to_check != "__":
-                    directions["right"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row, p_col + i),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
-        if p_col - i in range(8):
-            possition_to_check = board_state[p_row][p_col - i]
-            if possition_to_check[0] == turn_to_move:
-                directions["left"] = False
-            elif directions["left"]:
-
-                if possition_to_check != "__":
-                    directions["left"] = False
-                moves.append(
-                    Move(
-                        selected_pos,
-                        (p_row, p_col - i),
-                        board_state,
-                        turn_to_move,
-                    )
-                )
+    moves: list[int] = []
+    turn_to_move = position.turn
+    mailbox = position.mailbox
+    empty = ~position.occupancy[BOTH] & FULL_BOARD
+    opponent_pieces = position.occupancy[turn_to_move ^ 1] & targets
+
+    if turn_to_move == WHITE:
+        single_pushes = (pawns >> 8) & empty
+        add_pawn_moves(moves, single_pushes & targets, 8, mailbox)
+        add_pawn_moves(
+            moves,
+            ((single_pushes & third_rank[WHITE]) >> 8) & empty & targets,
+            16,
+            mailbox,
+        )
+        add_pawn_moves(moves, ((pawns & ~FILE_A) >> 9) & opponent_pieces, 9, mailbox)
+        add_pawn_moves(moves, ((pawns & ~FILE_H) >> 7) & opponent_pieces, 7, mailbox)
+    else:
+        single_pushes = (pawns << 8) & empty
+        add_pawn_moves(moves, single_pushes & targets, -8, mailbox)
+        add_pawn_moves(
+            moves,
+            ((single_pushes & third_rank[BLACK]) << 8) & empty & targets,
+            -16,
+            mailbox,
+        )
+        add_pawn_moves(moves, ((pawns & ~FILE_A) << 7) & opponent_pieces, -7, mailbox)
+        add_pawn_moves(moves, ((pawns & ~FILE_H) << 9) & opponent_pieces, -9, mailbox)
+
     return moves
 
 
-def get_king_moves(
-    board_state: list[list[str]], selected_pos: tuple[int, int], turn_to_move: str
-) -> list[Move]:
-    """get all available king moves.
+def get_en_passant(position: Position) -> list[int]:
+    """return en_passant moves if they're possible.
 
     Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
+        position (Position): position
 
     Returns:
-        list[Move]:
+        list[int]:
     """
-    moves: list[Move] = []
-    p_row, p_col = selected_pos
-    possitions_to_check = [
-        (p_row - 1, p_col),
-        (p_row - 1, p_col - 1),
-        (p_row - 1, p_col + 1),
-        (p_row, p_col - 1),
-        (p_row, p_col + 1),
-        (p_row + 1, p_col),
-        (p_row + 1, p_col - 1),
-        (p_row + 1, p_col + 1),
-    ]
-
-    for row, col in possitions_to_check:
-        if row in range(8) and col in range(8):
-            if board_state[row][col][0] != turn_to_move:
-                moves.append(Move(selected_pos, (row, col), board_state, turn_to_move))
+    end = position.en_passant
+    if end == -1:
+        return []
 
+    turn_to_move = position.turn
+    # a pawn of the opponent on the en_passant square would attack the squares our pawns capture from
+    attackers = (
+        pawn_attacks[turn_to_move ^ 1][end]
+        & position.bitboards[turn_to_move * 6 + PAWN]
+    )
+    moves: list[int] = []
+    while attackers:
+        lsb = attackers & -attackers
+        attackers ^= lsb
+        moves.append(
+            (lsb.bit_length() - 1)
+            | end << 6
+            | EN_PASSANT << 14
+            | (turn_to_move * 6 + PAWN) << 16
+            | EMPTY << 20
+        )
     return moves
 
 
-def get_castle(
-    board_state: list[list[str]],
-    selected_pos: tuple[int, int],
-    turn_to_move: str,
-    castle_rights: dict[str, bool],
-) -> list[Move]:
+def get_castle(position: Position) -> list[int]:
     """get Castling moves if available.
 
     Args:
-        board_state (list[list[str]]): board_state
-        selected_pos (tuple[int, int]): selected_pos
-        turn_to_move (str): turn_to_move
-        castle_rights (dict[str, bool]): castle_rights
+        position (Position): position
 
     Returns:
-        list[Move]:
+        list[int]:
     """
+    moves: list[int] = []
+    turn_to_move = position.turn
+    occupied = position.occupancy[BOTH]
+
+    if turn_to_move == WHITE:
+        short_castle, long_castle, king_square = (
+            WHITE_SHORT_CASTLE,
+            WHITE_LONG_CASTLE,
+            60,
+        )
+    else:
+        short_castle, long_castle, king_square = (
+            BLACK_SHORT_CASTLE,
+            BLACK_LONG_CASTLE,
+            4,
+        )
+
+    if (
+        not position.castle_rights & (short_castle | long_castle)
+        or position.king_squares[turn_to_move] != king_square
+    ):
+        return moves
 
-    moves: list[Move] = []
-
-    p_row, p_col = selected_pos
-
-    if castle_rights["short"]:
-
-        if all(
-            [
-                board_state[p_row][p_col + 1] == "__",
-                board_state[p_row][p_col + 2] == "__",
-            ]
-        ):
-            if not any(
-                [
-                    possition_under_attack(board_state, (p_row, p_col), turn_to_move),
-                    possition_under_attack(
-                        board_state, (p_row, p_col + 1), turn_to_move
-                    ),
-                    possition_under_attack(
-                        board_state, (p_row, p_col + 2), turn_to_move
-                    ),
-                ]
-            ):
-
-                moves.append(
-                    Move(selected_pos, (p_row, p_col + 2), board_state, turn_to_move)
-                )
-                moves.append(
-                    Move(selected_pos, (p_row, p_col + 3), board_state, turn_to_move)
-                )
-
-    if castle_rights["long"]:
-
-        if all(
-            [
-                board_state[p_row][p_col - 1] == "__",
-                board_state[p_row][p_col - 2] == "__",
-                board_state[p_row][p_col - 3] == "__",
-            ]
-        ):
-            if not any(
-                [
-                    possition_under_attack(board_state, (p_row, p_col), turn_to_move),
-                    possition_under_attack(
-                        board_state, (p_row, p_col - 1), turn_to_move
-                    ),
-                    possition_under_attack(
-                        board_state, (p_row, p_col - 2), turn_to_move
-                    ),
-                ]
-            ):
-
-                moves.append(
-                    Move(selected_pos, (p_row, p_col - 2), board_state, turn_to_move)
-                )
-                moves.append(
-                    Move(selected_pos, (p_row, p_col - 4), board_state, turn_to_move)
-                )
-
-    return moves
+    if possition_under_attack(position, king_square, turn_to_move):
+        return moves
 
+    rooks = position.bitboards[turn_to_move * 6 + ROOK]
+    castle_flags = CASTLE << 14 | (turn_to_move * 6 + KING) << 16 | EMPTY << 20
+
+    if (
+        position.castle_rights & short_castle
+        and rooks & square_bitboards[king_square + 3]
+        and not occupied & (0b11 << (king_square + 1))
+        and not possition_under_attack(position, king_square + 1, turn_to_move)
+        and not possition_under_attack(position, king_square + 2, turn_to_move)
+    ):
+        moves.append(king_square | (king_square + 2) << 6 | castle_flags)
+
+    if (
+        position.castle_rights & long_castle
+        and rooks & square_bitboards[king_square - 4]
+        and not occupied & (0b111 << (king_square - 3))
+        and not possition_under_attack(position, king_square - 1, turn_to_move)
+        and not possition_under_attack(position, king_square - 2, turn_to_move)
+    ):
+        moves.append(king_square | (king_square - 2) << 6 | castle_flags)
 
-# def num_of_piece_moves(
-#     board_state: list[list[str]],
-#     selected_pos: tuple[int, int],
-#     king_pos: tuple[int, int],
-#     castle_rights: dict[str, bool],
-#     last_move: Move | None,
-# ) -> list[Move]:
-#     row, col = selected_pos
-#     piece = board_state[row][col]
-#
-#     if piece == "__":
-#         return []
-#     turn_to_move = piece[0]
-#
-#     possible_moves = get_possible_moves(
-#         board_state, selected_pos, turn_to_move, last_move, castle_rights
-#     )
+    return moves
@@ -0,0 +1,199 @@
+from .position import Position
+from .valid_moves import get_valid_moves
+from ..move.encoding import get_uci_notation
+
+import sys
+import time
+
+# standard perft possitions and their expected node counts for depth 1, 2, 3, ...
+perft_suite: list[tuple[str, str, list[int]]] = [
+    (
+        "start possition",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        [20, 400, 8902, 197281, 4865609],
+    ),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603],
+    ),
+    (
+        "rook endgame with en_passant pins",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624],
+    ),
+    (
+        "promotions and castling under attack",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333],
+    ),
+    (
+        "promotions and castling under attack mirrored",
+        "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+        [6, 264, 9467, 422333],
+    ),
+    (
+        "promotion with discovered check",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487],
+    ),
+    (
+        "middle game",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594],
+    ),
+    (
+        "illegal en_passant uncovering a rook check",
+        "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1",
+        [18, 92, 1670, 10138, 185429, 1134888],
+    ),
+    (
+        "en_passant capture giving check",
+        "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1",
+        [15, 126, 1928, 13931, 206379, 1440467],
+    ),
+    (
+        "short castle giving check",
+        "5k2/8/8/8/8/8/8/4K2R w K - 0 1",
+        [15, 66, 1198, 6399, 120330, 661072],
+    ),
+    (
+        "long castle giving check",
+        "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1",
+        [16, 71, 1286, 7418, 141077, 803711],
+    ),
+    (
+        "castle rights lost by captures",
+        "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1",
+        [26, 1141, 27826, 1274206],
+    ),
+    (
+        "castling prevented",
+        "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1",
+        [44, 1494, 50509, 1720476],
+    ),
+    (
+        "promotion out of check",
+        "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1",
+        [11, 133, 1442, 19174, 266199, 3821001],
+    ),
+    (
+        "discovered check",
+        "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1",
+        [29, 165, 5160, 31961, 1004658],
+    ),
+    (
+        "under promotion giving check",
+        "4k3/1P6/8/8/8/8/K7/8 w - - 0 1",
+        [9, 40, 472, 2661, 38983, 217342],
+    ),
+    (
+        "self stalemate",
+        "K1k5/8/P7/8/8/8/8/8 w - - 0 1",
+        [2, 6, 13, 63, 382, 2217],
+    ),
+    (
+        "double check",
+        "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1",
+        [37, 183, 6559, 23527],
+    ),
+]
+
+
+def perft(position: Position, depth: int) -> int:
+    """count the leaf nodes of the move tree of the possition up to the given depth.
+
+    Args:
+        position (Position): position
+        depth (int): depth
+
+    Returns:
+        int:
+    """
+    valid_moves = get_valid_moves(position)
+
+    if depth <= 1:
+        return len(valid_moves) if depth == 1 else 1
+
+    nodes = 0
+    for move in valid_moves:
+        position.push(move)
+        nodes += perft(position, depth - 1)
+        position.pop()
+    return nodes
+
+
+def divide(position: Position, depth: int) -> dict[str, int]:
+    """return the perft node count under every valid move of the possition.
+
+    Args:
+        position (Position): position
+        depth (int): depth
+
+    Returns:
+        dict[str, int]:
+    """
+    move_nodes: dict[str, int] = {}
+    for move in get_valid_moves(position):
+        position.push(move)
+        move_nodes[get_uci_notation(move)] = perft(position, depth - 1)
+        position.pop()
+    return move_nodes
+
+
+def run_perft_suite(max_depth: int) -> bool:
+    """run perft on every possition of the suite, print the node counts and nodes per second.
+
+    Args:
+        max_depth (int): max_depth
+
+    Returns:
+        bool: True if every node count matched the expected count
+    """
+    all_passed = True
+    total_nodes = 0
+    total_time = 0.0
+
+    for name, fen, expected_nodes in perft_suite:
+        position = Position.from_fen(fen)
+        for depth in range(1, min(max_depth, len(expected_nodes)) + 1):
+            start_time = time.perf_counter()
+            nodes = perft(position, depth)
+            elapsed_time = time.perf_counter() - start_time
+
+            total_nodes += nodes
+            total_time += elapsed_time
+            passed = nodes == expected_nodes[depth - 1]
+            all_passed = all_passed and passed
+
+            print(
+                f"{'ok' if passed else 'FAILED':<6} {name:<46} depth {depth}: "
+                f"{nodes:>9} / {expected_nodes[depth - 1]:>9} nodes "
+                f"{elapsed_time:8.3f}s {nodes / max(elapsed_time, 1e-9):>10.0f} nps"
+            )
+
+    print(
+        f"total: {total_nodes} nodes in {total_time:.3f}s, "
+        f"{total_nodes / max(total_time, 1e-9):.0f} nps"
+    )
+    return all_passed
+
+
+if __name__ == "__main__":
+    # python -m packages.logics.perft [max_depth]
+    # python -m packages.logics.perft divide <depth> <fen>
+    if len(sys.argv) > 3 and sys.argv[1] == "divide":
+        start_time = time.perf_counter()
+        move_nodes = divide(Position.from_fen(" ".join(sys.argv[3:])), int(sys.argv[2]))
+        elapsed_time = time.perf_counter() - start_time
+        for notation, nodes in sorted(move_nodes.items()):
+            print(f"{notation}: {nodes}")
+        total_nodes = sum(move_nodes.values())
+        print(
+            f"total: {total_nodes} nodes in {elapsed_time:.3f}s, "
+            f"{total_nodes / max(elapsed_time, 1e-9):.0f} nps"
+        )
+    else:
+        sys.exit(
+            0 if run_perft_suite(int(sys.argv[1]) if len(sys.argv) > 1 else 3) else 1
+        )
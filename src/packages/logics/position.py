@@ -0,0 +1,662 @@
+from __future__ import annotations
+
+from .bitboard import (
+    WHITE,
+    BLACK,
+    BOTH,
+    PAWN,
+    ROOK,
+    KING,
+    EMPTY,
+    WHITE_SHORT_CASTLE,
+    WHITE_LONG_CASTLE,
+    BLACK_SHORT_CASTLE,
+    BLACK_LONG_CASTLE,
+    castle_rights_masks,
+    piece_names,
+    piece_indexes,
+    color_names,
+    color_indexes,
+    square_bitboards,
+    pawn_attacks,
+    get_square,
+)
+from .zobrist import ZobristKeys
+from ..move import Move
+from ..move.encoding import PROMOTION, EN_PASSANT, CASTLE, get_square_name
+
+# recompute the hash from scratch after every move and raise if the incremental one differs
+VERIFY_HASH: bool = False
+
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# FEN letter of every piece index
+FEN_PIECES: str = "PNBRQKpnbrqk"
+
+# FEN letter of every castle right, in the order they are written
+fen_castle_rights: list[tuple[str, int]] = [
+    ("K", WHITE_SHORT_CASTLE),
+    ("Q", WHITE_LONG_CASTLE),
+    ("k", BLACK_SHORT_CASTLE),
+    ("q", BLACK_LONG_CASTLE),
+]
+
+
+class Position:
+    def __init__(self) -> None:
+        """initialize an empty possition.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        # one bitboard for each piece index (color * 6 + piece type)
+        self.bitboards: list[int] = [0] * 12
+
+        # occupied squares of white, black and both sides
+        self.occupancy: list[int] = [0, 0, 0]
+
+        # piece index of every square, EMPTY for empty squares
+        self.mailbox: list[int] = [EMPTY] * 64
+
+        self.turn: int = WHITE
+
+        # castle rights of both sides packed as WHITE_SHORT_CASTLE | WHITE_LONG_CASTLE | ...
+        self.castle_rights: int = 0
+
+        # square behind a pawn that just moved two squares if it can be captured en_passant, otherwise -1
+        self.en_passant: int = -1
+
+        self.fifty_move_rule: int = 0
+
+        # number of the move in the game, incremented after every move of black
+        self.full_move_number: int = 1
+
+        self.king_squares: list[int] = [-1, -1]
+
+        # zobrist hash of the possition, updated by push and pop when zobrist_hash_keys is set
+        self.hash: int = 0
+        self.zobrist_hash_keys: ZobristKeys | None = None
+
+        # (move, captured_piece, castle_rights, en_passant, fifty_move_rule, hash) of every pushed move
+        self.undo_stack: list[tuple[int, int, int, int, int, int]] = []
+
+        # number of times every hash occurred since the last irreversible move,
+        # the possitions before a capture or a pawn move can't be repeated.
+        self.repetition_counts: dict[int, int] = {}
+        # length of the undo_stack right after the last irreversible move
+        self.irreversible_index: int = 0
+        # (irreversible_index, repetition_counts) from before every irreversible move of the undo_stack
+        self.repetition_stack: list[tuple[int, dict[int, int]]] = []
+
+    def put_piece(self, piece: int, square: int) -> None:
+        """put the piece on the given empty square.
+
+        Args:
+            piece (int): piece
+            square (int): square
+
+        Returns:
+            None:
+        """
+        bit = square_bitboards[square]
+        self.bitboards[piece] |= bit
+        self.occupancy[piece // 6] |= bit
+        self.occupancy[BOTH] |= bit
+        self.mailbox[square] = piece
+        if piece % 6 == KING:
+            self.king_squares[piece // 6] = square
+
+    def remove_piece(self, square: int) -> int:
+        """remove the piece on the given square and return it.
+
+        Args:
+            square (int): square
+
+        Returns:
+            int:
+        """
+        piece = self.mailbox[square]
+        if piece == EMPTY:
+            return piece
+        bit = square_bitboards[square]
+        self.bitboards[piece] ^= bit
+        self.occupancy[piece // 6] ^= bit
+        self.occupancy[BOTH] ^= bit
+        self.mailbox[square] = EMPTY
+        return piece
+
+    def set_en_passant(self, en_passant_square: int) -> None:
+        """set the en_passant square after a two square pawn move if an opponent pawn can capture.
+
+        Args:
+            en_passant_square (int): en_passant_square
+
+        Returns:
+            None:
+        """
+        # the squares a pawn on the en_passant square would attack are the squares
+        # opponent pawns must stand on to capture en_passant.
+        color = BLACK if en_passant_square >= 32 else WHITE
+        if (
+            pawn_attacks[color ^ 1][en_passant_square]
+            & self.bitboards[color * 6 + PAWN]
+        ):
+            self.en_passant = en_passant_square
+        else:
+            self.en_passant = -1
+
+    def copy(self) -> Position:
+        """return a copy of the possition.
+
+        Args:
+
+        Returns:
+            Position:
+        """
+        position = Position.__new__(Position)
+        position.bitboards = self.bitboards.copy()
+        position.occupancy = self.occupancy.copy()
+        position.mailbox = self.mailbox.copy()
+        position.turn = self.turn
+        position.castle_rights = self.castle_rights
+        position.en_passant = self.en_passant
+        position.fifty_move_rule = self.fifty_move_rule
+        position.full_move_number = self.full_move_number
+        position.king_squares = self.king_squares.copy()
+        position.hash = self.hash
+        position.zobrist_hash_keys = self.zobrist_hash_keys
+        position.undo_stack = self.undo_stack.copy()
+        position.repetition_counts = self.repetition_counts.copy()
+        position.irreversible_index = self.irreversible_index
+        position.repetition_stack = [
+            (irreversible_index, repetition_counts.copy())
+            for irreversible_index, repetition_counts in self.repetition_stack
+        ]
+        return position
+
+    def compute_hash(self) -> int:
+        """compute the zobrist hash of the possition from scratch.
+
+        Args:
+
+        Returns:
+            int:
+        """
+        zobrist_hash_keys = self.zobrist_hash_keys
+        piece_keys = zobrist_hash_keys.pieces
+        board_hash = zobrist_hash_keys.castle_rights[self.castle_rights]
+        for square, piece in enumerate(self.mailbox):
+            if piece != EMPTY:
+                board_hash ^= piece_keys[piece * 64 + square]
+        if self.en_passant != -1:
+            board_hash ^= zobrist_hash_keys.en_passant[self.en_passant & 7]
+        if self.turn == BLACK:
+            board_hash ^= zobrist_hash_keys.black_to_move
+        return board_hash
+
+    def verify_hash(self) -> bool:
+        """check if the incrementally updated hash matches the hash computed from scratch.
+
+        Args:
+
+        Returns:
+            bool:
+        """
+        return self.zobrist_hash_keys is None or self.hash == self.compute_hash()
+
+    def set_zobrist_hash_keys(self, zobrist_hash_keys: ZobristKeys) -> None:
+        """set the hash keys and compute the hash of the possition with them.
+
+        Args:
+            zobrist_hash_keys (ZobristKeys): zobrist_hash_keys
+
+        Returns:
+            None:
+        """
+        self.zobrist_hash_keys = zobrist_hash_keys
+        self.hash = self.compute_hash()
+        self.repetition_counts = {self.hash: 1}
+
+    def set_hash_history(self, hash_list: list[int]) -> None:
+        """set the hashes of the possitions before this one in the game, used to detect repetitions.
+
+        only the possitions since the last capture or pawn move are counted.
+
+        Args:
+            hash_list (list[int]): hashes of the previous possitions, oldest first
+
+        Returns:
+            None:
+        """
+        repetition_counts = {self.hash: 1}
+        for board_hash in hash_list[max(len(hash_list) - self.fifty_move_rule, 0) :]:
+            repetition_counts[board_hash] = repetition_counts.get(board_hash, 0) + 1
+        self.repetition_counts = repetition_counts
+        self.irreversible_index = len(self.undo_stack)
+        self.repetition_stack = []
+
+    def add_repetition(self, irreversible: bool) -> None:
+        """count the hash of the possition after a move is pushed.
+
+        Args:
+            irreversible (bool): the move can't be undone in a game, so the earlier possitions can't repeat
+
+        Returns:
+            None:
+        """
+        if irreversible:
+            self.repetition_stack.append(
+                (self.irreversible_index, self.repetition_counts)
+            )
+            self.irreversible_index = len(self.undo_stack)
+            self.repetition_counts = {self.hash: 1}
+        else:
+            repetition_counts = self.repetition_counts
+            repetition_counts[self.hash] = repetition_counts.get(self.hash, 0) + 1
+
+    def remove_repetition(self) -> None:
+        """remove the hash of the possition before it's move is popped.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        if self.irreversible_index == len(self.undo_stack):
+            self.irreversible_index, self.repetition_counts = (
+                self.repetition_stack.pop()
+            )
+        else:
+            self.repetition_counts[self.hash] -= 1
+
+    def get_repetition_count(self) -> int:
+        """return how many times the possition occurred since the last irreversible move, itself included.
+
+        Args:
+
+        Returns:
+            int:
+        """
+        return self.repetition_counts.get(self.hash, 0)
+
+    def is_repetition(self) -> bool:
+        """check if the possition already occurred since the last irreversible move.
+
+        Args:
+
+        Returns:
+            bool:
+        """
+        return self.repetition_counts.get(self.hash, 0) > 1
+
+    def push(self, move: int) -> None:
+        """make the move in place and store what is needed to undo it.
+
+        Args:
+            move (int): move
+
+        Returns:
+            None:
+        """
+        start = move & 63
+        end = (move >> 6) & 63
+        move_type = (move >> 14) & 3
+        turn = self.turn
+        castle_rights = self.castle_rights
+        en_passant = self.en_passant
+
+        moved_piece = self.remove_piece(start)
+        captured_piece = self.remove_piece(end)
+
+        self.undo_stack.append(
+            (
+                move,
+                captured_piece,
+                castle_rights,
+                en_passant,
+                self.fifty_move_rule,
+                self.hash,
+            )
+        )
+
+        piece = moved_piece
+        if move_type == PROMOTION:
+            piece = turn * 6 + ((move >> 12) & 3) + 1
+
+        self.put_piece(piece, end)
+
+        if move_type == EN_PASSANT:
+            captured_square = end + 8 if turn == WHITE else end - 8
+            self.remove_piece(captured_square)
+        elif move_type == CASTLE:
+            if end > start:
+                rook_start, rook_end = start + 3, start + 1
+            else:
+                rook_start, rook_end = start - 4, start - 1
+            self.put_piece(self.remove_piece(rook_start), rook_end)
+
+        self.castle_rights &= castle_rights_masks[start] & castle_rights_masks[end]
+
+        if piece % 6 == PAWN and abs(end - start) == 16:
+            self.set_en_passant((start + end) // 2)
+        else:
+            self.en_passant = -1
+
+        if piece % 6 == PAWN or captured_piece != EMPTY:
+            self.fifty_move_rule = 0
+        else:
+            self.fifty_move_rule += 1
+
+        if turn == BLACK:
+            self.full_move_number += 1
+        self.turn = turn ^ 1
+
+        zobrist_hash_keys = self.zobrist_hash_keys
+        if zobrist_hash_keys is None:
+            return
+
+        # every part of the possition the move changed is xored out and in again
+        piece_keys = zobrist_hash_keys.pieces
+        board_hash = (
+            self.hash
+            ^ piece_keys[moved_piece * 64 + start]
+            ^ piece_keys[piece * 64 + end]
+            ^ zobrist_hash_keys.black_to_move
+        )
+        if captured_piece != EMPTY:
+            board_hash ^= piece_keys[captured_piece * 64 + end]
+        if move_type == EN_PASSANT:
+            board_hash ^= piece_keys[((turn ^ 1) * 6 + PAWN) * 64 + captured_square]
+        elif move_type == CASTLE:
+            rook = turn * 6 + ROOK
+            board_hash ^= piece_keys[rook * 64 + rook_start]
+            board_hash ^= piece_keys[rook * 64 + rook_end]
+        if castle_rights != self.castle_rights:
+            board_hash ^= zobrist_hash_keys.castle_rights[castle_rights]
+            board_hash ^= zobrist_hash_keys.castle_rights[self.castle_rights]
+        if en_passant != -1:
+            board_hash ^= zobrist_hash_keys.en_passant[en_passant & 7]
+        if self.en_passant != -1:
+            board_hash ^= zobrist_hash_keys.en_passant[self.en_passant & 7]
+        self.hash = board_hash
+        self.add_repetition(self.fifty_move_rule == 0)
+
+        if VERIFY_HASH and not self.verify_hash():
+            raise ValueError(f"wrong hash after {move}")
+
+    def pop(self) -> int:
+        """undo the last pushed move and return it.
+
+        Args:
+
+        Returns:
+            int:
+        """
+        if self.zobrist_hash_keys is not None:
+            self.remove_repetition()
+        (
+            move,
+            captured_piece,
+            self.castle_rights,
+            self.en_passant,
+            self.fifty_move_rule,
+            self.hash,
+        ) = self.undo_stack.pop()
+
+        start = move & 63
+        end = (move >> 6) & 63
+        move_type = (move >> 14) & 3
+        self.turn ^= 1
+        turn = self.turn
+        if turn == BLACK:
+            self.full_move_number -= 1
+
+        piece = self.remove_piece(end)
+        if move_type == PROMOTION:
+            piece = turn * 6 + PAWN
+        self.put_piece(piece, start)
+
+        if captured_piece != EMPTY:
+            self.put_piece(captured_piece, end)
+
+        if move_type == EN_PASSANT:
+            self.put_piece((turn ^ 1) * 6 + PAWN, end + 8 if turn == WHITE else end - 8)
+        elif move_type == CASTLE:
+            if end > start:
+                self.put_piece(self.remove_piece(start + 1), start + 3)
+            else:
+                self.put_piece(self.remove_piece(start - 1), start - 4)
+
+        return move
+
+    def push_null_move(self) -> None:
+        """pass the turn to the opponent without moving, used by the null move pruning.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        self.undo_stack.append(
+            (
+                0,
+                EMPTY,
+                self.castle_rights,
+                self.en_passant,
+                self.fifty_move_rule,
+                self.hash,
+            )
+        )
+        if self.zobrist_hash_keys is not None:
+            self.hash ^= self.zobrist_hash_keys.black_to_move
+            if self.en_passant != -1:
+                self.hash ^= self.zobrist_hash_keys.en_passant[self.en_passant & 7]
+        self.en_passant = -1
+        self.fifty_move_rule += 1
+        if self.turn == BLACK:
+            self.full_move_number += 1
+        self.turn ^= 1
+        if self.zobrist_hash_keys is not None:
+            # the possitions before the null move aren't repeated by the search after it
+            self.add_repetition(True)
+
+    def pop_null_move(self) -> None:
+        """undo the last pushed null move.
+
+        Args:
+
+        Returns:
+            None:
+        """
+        if self.zobrist_hash_keys is not None:
+            self.remove_repetition()
+        (
+            _,
+            _,
+            self.castle_rights,
+            self.en_passant,
+            self.fifty_move_rule,
+            self.hash,
+        ) = self.undo_stack.pop()
+        self.turn ^= 1
+        if self.turn == BLACK:
+            self.full_move_number -= 1
+
+    @property
+    def turn_to_move(self) -> str:
+        """return the side to move as "w" or "b".
+
+        Args:
+
+        Returns:
+            str:
+        """
+        return color_names[self.turn]
+
+    @property
+    def board_state(self) -> list[list[str]]:
+        """return the string representation of the board used by the pygame board.
+
+        Args:
+
+        Returns:
+            list[list[str]]:
+        """
+        return [
+            [piece_names[piece] for piece in self.mailbox[row * 8 : row * 8 + 8]]
+            for row in range(8)
+        ]
+
+    @staticmethod
+    def from_board_state(
+        board_state: list[list[str]],
+        turn_to_move: str,
+        castle_rights: dict[str, dict[str, bool]],
+        last_move: Move | None,
+        fifty_move_rule: int,
+    ) -> Position:
+        """create a possition from the string representation of the board.
+
+        Args:
+            board_state (list[list[str]]): board_state
+            turn_to_move (str): turn_to_move
+            castle_rights (dict[str, dict[str, bool]]): castle_rights
+            last_move (Move | None): last_move
+            fifty_move_rule (int): fifty_move_rule
+
+        Returns:
+            Position:
+        """
+        position = Position()
+
+        for row in range(8):
+            for col in range(8):
+                piece = piece_indexes[board_state[row][col]]
+                if piece != EMPTY:
+                    position.put_piece(piece, row * 8 + col)
+
+        position.turn = color_indexes[turn_to_move]
+
+        for side, short_castle, long_castle in [
+            ("w", WHITE_SHORT_CASTLE, WHITE_LONG_CASTLE),
+            ("b", BLACK_SHORT_CASTLE, BLACK_LONG_CASTLE),
+        ]:
+            if castle_rights[side]["short"]:
+                position.castle_rights |= short_castle
+            if castle_rights[side]["long"]:
+                position.castle_rights |= long_castle
+
+        if (
+            last_move is not None
+            and last_move.moved_piece[1] == "P"
+            and last_move.is_two_square_pawn_move()
+        ):
+            position.set_en_passant(
+                (get_square(last_move.start_pos) + get_square(last_move.end_pos)) // 2
+            )
+
+        position.fifty_move_rule = fifty_move_rule
+
+        return position
+
+    @staticmethod
+    def from_fen(fen: str, zobrist_hash_keys: ZobristKeys | None = None) -> Position:
+        """create a possition from a FEN string.
+
+        the pieces, the king squares and the hash are set in one pass over the board,
+        the halfmove clock and the fullmove number can be left out.
+
+        Args:
+            fen (str): fen
+            zobrist_hash_keys (ZobristKeys | None): keys the possition is hashed with,
+            the hash is left 0 without them
+
+        Returns:
+            Position:
+        """
+        fields = fen.split()
+        if len(fields) < 4 or fields[0].count("/") != 7:
+            raise ValueError(f"invalid FEN: {fen}")
+
+        position = Position()
+        piece_keys = zobrist_hash_keys.pieces if zobrist_hash_keys is not None else None
+        board_hash = 0
+
+        square = 0
+        for char in fields[0]:
+            if char == "/":
+                continue
+            if char.isdigit():
+                square += int(char)
+                continue
+            piece = FEN_PIECES.index(char)
+            position.put_piece(piece, square)
+            if piece_keys is not None:
+                board_hash ^= piece_keys[piece * 64 + square]
+            square += 1
+
+        position.turn = color_indexes[fields[1]]
+
+        for char, castle_right in fen_castle_rights:
+            if char in fields[2]:
+                position.castle_rights |= castle_right
+
+        if fields[3] != "-":
+            position.set_en_passant(
+                (8 - int(fields[3][1])) * 8 + "abcdefgh".index(fields[3][0])
+            )
+
+        if len(fields) > 4:
+            position.fifty_move_rule = int(fields[4])
+        if len(fields) > 5:
+            position.full_move_number = int(fields[5])
+
+        if zobrist_hash_keys is not None:
+            board_hash ^= zobrist_hash_keys.castle_rights[position.castle_rights]
+            if position.en_passant != -1:
+                board_hash ^= zobrist_hash_keys.en_passant[position.en_passant & 7]
+            if position.turn == BLACK:
+                board_hash ^= zobrist_hash_keys.black_to_move
+            position.zobrist_hash_keys = zobrist_hash_keys
+            position.hash = board_hash
+            position.repetition_counts = {board_hash: 1}
+
+        return position
+
+    def to_fen(self) -> str:
+        """return the FEN string of the possition.
+
+        Args:
+
+        Returns:
+            str:
+        """
+        ranks: list[str] = []
+        for row in range(8):
+            rank = ""
+            empty_squares = 0
+            for piece in self.mailbox[row * 8 : row * 8 + 8]:
+                if piece == EMPTY:
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    rank += str(empty_squares)
+                    empty_squares = 0
+                rank += FEN_PIECES[piece]
+            if empty_squares:
+                rank += str(empty_squares)
+            ranks.append(rank)
+
+        castle_rights = "".join(
+            char
+            for char, castle_right in fen_castle_rights
+            if self.castle_rights & castle_right
+        )
+        en_passant = get_square_name(self.en_passant) if self.en_passant != -1 else "-"
+
+        return (
+            f"{'/'.join(ranks)} {color_names[self.turn]} {castle_rights or '-'} "
+            f"{en_passant} {self.fifty_move_rule} {self.full_move_number}"
+        )
@@ -1,181 +1,119 @@
-from .movement import get_possible_moves
-from .check import possition_under_attack
-from ..move import Move
-
-
-def is_valid(
-    board_state: list[list[str]],
-    move: Move,
-    turn_to_move: str,
-    king_pos: tuple[int, int],
-) -> bool:
+from .bitboard import (
+    WHITE,
+    BOTH,
+    KING,
+    FULL_BOARD,
+    square_bitboards,
+    king_attacks,
+    between_bitboards,
+)
+from .movement import get_piece_moves, get_en_passant, get_castle, add_moves
+from .check import (
+    is_square_attacked,
+    get_attackers,
+    get_attacked_squares,
+    get_pinned_pieces,
+)
+from .position import Position
+from ..move.encoding import EN_PASSANT
+
+
+def is_valid(position: Position, move: int) -> bool:
     """check if the move is valid.
 
     Args:
-        board_state (list[list[str]]): board_state
-        move (Move): move
-        turn_to_move (str): turn_to_move
-        king_pos (tuple[int, int]): king_pos
+        position (Position): position
+        move (int): move
 
     Returns:
         bool:
     """
+    turn_to_move = position.turn
+    start = move & 63
+    end = (move >> 6) & 63
 
-    temp_board_state: list[list[str]] = [list_item.copy() for list_item in board_state]
-    if move.is_castle:
-        move.update_end_pos()
-
-    p_row, p_col = move.start_pos
-
-    temp_board_state[p_row][p_col] = "__"
-    s_row, s_col = move.end_pos
-    temp_board_state[s_row][s_col] = move.moved_piece
-
-    if move.is_en_passant:
+    start_bit = square_bitboards[start]
+    captured = square_bitboards[end]
+    occupied = (position.occupancy[BOTH] ^ start_bit) | captured
 
-        temp_board_state[move.en_passant_pos[0]][move.en_passant_pos[1]] = "__"
+    if (move >> 14) & 3 == EN_PASSANT:
+        captured = square_bitboards[end + 8 if turn_to_move == WHITE else end - 8]
+        occupied ^= captured
 
-    king_pos = move.end_pos if move.moved_piece[1] == "K" else king_pos
+    king_square = position.king_squares[turn_to_move]
+    if position.mailbox[start] == turn_to_move * 6 + KING:
+        king_square = end
 
-    if move.is_castle:
-        if move.get_castle_type() == "short":
-            temp_board_state[s_row][s_col - 1] = temp_board_state[s_row][s_col + 1]
-            temp_board_state[s_row][s_col + 1] = "__"
-        elif move.get_castle_type() == "long":
-            temp_board_state[s_row][s_col + 1] = temp_board_state[s_row][s_col - 2]
-            temp_board_state[s_row][s_col - 2] = "__"
+    return not is_square_attacked(
+        position.bitboards, king_square, turn_to_move, occupied, captured
+    )
 
-    if possition_under_attack(temp_board_state, king_pos, turn_to_move):
-        return False
-    return True
 
-
-def any_valid_moves(
-    board_state: list[list[str]],
-    turn_to_move: str,
-    king_pos: tuple[int, int],
-    last_move: Move | None,
-    castle_rights: dict[str, bool],
-) -> bool:
+def any_valid_moves(position: Position) -> bool:
     """check if there are any valid moves.
 
     Args:
-        board_state (list[list[str]]): board_state
-        turn_to_move (str): turn_to_move
-        king_pos (tuple[int, int]): king_pos
-        last_move (Move | None): last_move
-        castle_rights (dict[str, bool]): castle_rights
+        position (Position): position
 
     Returns:
         bool:
     """
-    for row in range(8):
-        for col in range(8):
-            if board_state[row][col][0] == turn_to_move:
-                move_list = get_possible_moves(
-                    board_state, (row, col), turn_to_move, last_move, castle_rights
-                )
-                for move in move_list:
-                    if is_valid(board_state, move, turn_to_move, king_pos):
-                        return True
-    return False
-
-
-def get_valid_moves(
-    board_state: list[list[str]],
-    turn_to_move: str,
-    king_pos: tuple[int, int],
-    castle_rights: dict[str, bool],
-    last_move: Move | None,
-) -> list[Move]:
-    """get valid moves from possible moves.
+    return len(get_valid_moves(position)) > 0
+
+
+def get_valid_moves(position: Position) -> list[int]:
+    """get the legal moves of the possition.
+
+    the checkers and pinned pieces are found once, so the moves don't need to be made and tested.
 
     Args:
-        board_state (list[list[str]]): board_state
-        turn_to_move (str): turn_to_move
-        king_pos (tuple[int, int]): king_pos
-        castle_rights (dict[str, bool]): castle_rights
-        last_move (Move | None): last_move
+        position (Position): position
 
     Returns:
-        list[Move]:
+        list[int]:
     """
-
-    possible_moves: list[Move] = []
-    valid_moves: list[Move] = []
-    for row in range(8):
-        for col in range(8):
-            possible_moves += get_possible_moves(
-                board_state, (row, col), turn_to_move, last_move, castle_rights
-            )
-    for move in possible_moves:
-        if is_valid(board_state, move, turn_to_move, king_pos):
-            valid_moves.append(move)
-    return valid_moves
-
-
-# def get_piece_valid_moves(
-#     board_state: list[list[str]],
-#     turn_to_move: str,
-#     selected_pos: tuple[int, int],
-#     king_pos: tuple[int, int],
-#     castle_rights: dict[str, bool],
-#     last_move: Move | None,
-# ) -> list[Move]:
-#     """get the valid moves for the piece in the given possition.
-#
-#     Args:
-#         board_state (list[list[str]]): board_state
-#         turn_to_move (str): turn_to_move
-#         selected_pos (tuple[int, int]): selected_pos
-#         king_pos (tuple[int, int]): king_pos
-#         castle_rights (dict[str, bool]): castle_rights
-#         last_move (Move | None): last_move
-#
-#     Returns:
-#         list[Move]:
-#     """
-#     row, col = selected_pos
-#     piece = board_state[row][col]
-#
-#     if piece[0] != turn_to_move:
-#         return []
-#
-#     valid_moves: list[Move] = []
-#
-#     possible_moves = get_possible_moves(
-#         board_state, selected_pos, turn_to_move, last_move, castle_rights
-#     )
-#
-#     for move in possible_moves:
-#         if is_valid(board_state, move, turn_to_move, king_pos):
-#             valid_moves.append(move)
-#
-#     return valid_moves
-#
-#
-# def num_of_piece_valid_moves(
-#     board_state: list[list[str]],
-#     selected_pos: tuple[int, int],
-#     turn_to_move: str,
-#     king_pos: tuple[int, int],
-#     castle_rights: dict[str, bool],
-#     last_move: Move | None,
-# ) -> int:
-#     row, col = selected_pos
-#     piece = board_state[row][col]
-#
-#     if piece[0] != turn_to_move:
-#         return 0
-#
-#     possible_moves = get_possible_moves(
-#         board_state, selected_pos, turn_to_move, last_move, castle_rights
-#     )
-#
-#     num_of_moves = 0
-#
-#     for move in possible_moves:
-#         if is_valid(board_state, move, turn_to_move, king_pos):
-#             num_of_moves += 1
-#
-#     return num_of_moves
+    turn_to_move = position.turn
+    bitboards = position.bitboards
+    king_square = position.king_squares[turn_to_move]
+    occupied = position.occupancy[BOTH]
+    targets = ~position.occupancy[turn_to_move] & FULL_BOARD
+
+    checkers = get_attackers(bitboards, king_square, turn_to_move, occupied)
+
+    # the king is removed from the occupancy so it can't step back along a checking ray
+    king_targets = targets & ~get_attacked_squares(
+        bitboards, turn_to_move ^ 1, occupied ^ square_bitboards[king_square]
+    )
+
+    # in double check only the king can move
+    if checkers & (checkers - 1):
+        moves: list[int] = []
+        add_moves(
+            moves,
+            king_square,
+            king_attacks[king_square] & king_targets,
+            position.mailbox,
+        )
+        return moves
+
+    # in check the other pieces have to capture the checker or block the check
+    if checkers:
+        targets &= checkers | between_bitboards[king_square][checkers.bit_length() - 1]
+
+    moves = get_piece_moves(
+        position, targets, get_pinned_pieces(position, king_square), king_square
+    )
+
+    # en_passant can uncover a check along the row of both pawns, so it's tested directly
+    for move in get_en_passant(position):
+        if is_valid(position, move):
+            moves.append(move)
+
+    add_moves(
+        moves, king_square, king_attacks[king_square] & king_targets, position.mailbox
+    )
+
+    if not checkers:
+        moves += get_castle(position)
+
+    return moves
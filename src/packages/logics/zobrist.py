@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from .bitboard import (
+    WHITE_SHORT_CASTLE,
+    WHITE_LONG_CASTLE,
+    BLACK_SHORT_CASTLE,
+    BLACK_LONG_CASTLE,
+    EMPTY,
+    piece_names,
+)
+
+import json
+
+# name of the seed key of every castle right
+castle_right_names: dict[int, str] = {
+    WHITE_SHORT_CASTLE: "wK",
+    WHITE_LONG_CASTLE: "wQ",
+    BLACK_SHORT_CASTLE: "bK",
+    BLACK_LONG_CASTLE: "bQ",
+}
+
+
+class ZobristKeys:
+    # zobrist hash keys in flat lists, so a hash update is a few xors with integer indexes
+    __slots__ = ("pieces", "castle_rights", "en_passant", "black_to_move")
+
+    def __init__(self, zobrist_hash_keys: dict[str, int]) -> None:
+        """create the key lists from the seed keys.
+
+        Args:
+            zobrist_hash_keys (dict[str, int]): seed keys by name, like "wP_(row,col)"
+
+        Returns:
+            None:
+        """
+        # key of every piece index on every square, indexed by piece * 64 + square
+        self.pieces: list[int] = [
+            zobrist_hash_keys[f"{piece_name}_({square >> 3},{square & 7})"]
+            for piece_name in piece_names[:EMPTY]
+            for square in range(64)
+        ]
+
+        # xor of the keys of every castle right in the castle rights mask, indexed by the mask
+        self.castle_rights: list[int] = [0] * 16
+        for castle_rights in range(16):
+            for castle_right, name in castle_right_names.items():
+                if castle_rights & castle_right:
+                    self.castle_rights[castle_rights] ^= zobrist_hash_keys[
+                        f"{name}_castle_rights"
+                    ]
+
+        # key of every en_passant file
+        self.en_passant: list[int] = [
+            zobrist_hash_keys[f"en_passant_file_{col}"] for col in range(8)
+        ]
+
+        self.black_to_move: int = zobrist_hash_keys["black_to_move"]
+
+    @staticmethod
+    def from_file(file_path: str) -> ZobristKeys:
+        """load the keys from the json file of seed keys.
+
+        Args:
+            file_path (str): file_path
+
+        Returns:
+            ZobristKeys:
+        """
+        with open(file_path, "r") as zobrist_hash_file:
+            return ZobristKeys(json.load(zobrist_hash_file))
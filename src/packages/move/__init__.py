@@ -1,5 +1,18 @@
 from __future__ import annotations
 
+from .encoding import (
+    PROMOTION,
+    get_move_start,
+    get_move_end,
+    get_move_type,
+    get_promotion_type,
+)
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..logics import Position
+
 
 row_to_rank: dict[int, int] = {
     0: 8,
@@ -45,6 +58,10 @@ file_to_col: dict[str, int] = {
 }
 
 
+# piece letter of the promoted piece type of an encoded move
+promotion_pieces: dict[int, str] = {1: "N", 2: "B", 3: "R", 4: "Q"}
+
+
 # symbols_notation: dict[str, str] = {
 #     "wK": "♔",
 #     "wQ": "♕",
@@ -62,6 +79,26 @@ file_to_col: dict[str, int] = {
 
 
 class Move:
+    # a move object is only created for the moves shown by the pygame board,
+    # the move generator and the engine use the encoded integer moves.
+    __slots__ = (
+        "start_pos",
+        "end_pos",
+        "turn_to_move",
+        "moved_piece",
+        "captured_piece",
+        "is_pawn_promotion",
+        "promoted_piece",
+        "is_castle",
+        "is_en_passant",
+        "encoded_move",
+        "opening_name",
+        "row_col_notation",
+        "notation_suffix",
+        "fifty_move_rule",
+        "castle_rights",
+    )
+
     def __init__(
         self,
         start_pos: tuple[int, int] | None,
@@ -91,35 +128,45 @@ class Move:
         # promoted piece type if the move is promotion
         self.promoted_piece: str | None = None
 
-        # self.castle_rights: dict[str, dict[str, bool]] = {
-        #     "w": {"short": True, "long": True},
-        #     "b": {"short": True, "long": True},
-        # }
+        self.is_castle: bool = False
+        self.is_en_passant: bool = False
 
-        if self.start_pos is not None:
-            self.moved_piece: str = board_state[self.start_pos[0]][self.start_pos[1]]
-        else:
-            self.moved_piece = None
+        # the encoded move of the move generator once the move is known to be valid
+        self.encoded_move: int | None = None
 
-        if self.end_pos is not None:
-            self.captured_piece: str = board_state[self.end_pos[0]][self.end_pos[1]]
+        self.castle_rights: dict[str, dict[str, bool]] | None = None
+
+        if self.start_pos is not None and self.end_pos is not None:
+            self.moved_piece: str | None = board_state[self.start_pos[0]][
+                self.start_pos[1]
+            ]
+            self.captured_piece: str | None = board_state[self.end_pos[0]][
+                self.end_pos[1]
+            ]
+            row_step = self.end_pos[0] - self.start_pos[0]
+            col_step = self.end_pos[1] - self.start_pos[1]
+
+            if self.moved_piece[1] == "P":
+                if self.end_pos[0] in [0, 7]:
+                    self.is_pawn_promotion = True
+                    self.promoted_piece = f"{self.moved_piece[0]}Q"
+                self.is_en_passant = (
+                    abs(row_step) == 1
+                    and abs(col_step) == 1
+                    and self.captured_piece == "__"
+                )
+            elif self.moved_piece[1] == "K":
+                self.is_castle = row_step == 0 and col_step in [2, -2, 3, -4]
         else:
+            self.moved_piece = None
             self.captured_piece = None
 
-        if self.moved_piece == "wP" and self.end_pos[0] == 0:
-            self.is_pawn_promotion = True
-            self.promoted_piece = "wQ"
-
-        if self.moved_piece == "bP" and self.end_pos[0] == 7:
-            self.is_pawn_promotion = True
-            self.promoted_piece = "bQ"
-
         self.opening_name: str | None = None
 
         self.row_col_notation: str = ""
 
-        # chess notation of the move
-        self.notation: str = self.get_notation()
+        # check or checkmate sign added to the notation
+        self.notation_suffix: str = ""
 
         self.fifty_move_rule: int | None = None
 
@@ -151,27 +198,6 @@ class Move:
                 return True
         return False
 
-    @property
-    def is_en_passant(self) -> bool:
-        """check to see if the move is en_passant.
-
-        Args:
-
-        Returns:
-            bool:
-        """
-        if self.start_pos is None or self.end_pos is None:
-            return False
-        if (
-            self.moved_piece[1] == "P"
-            and abs(self.start_pos[0] - self.end_pos[0]) == 1
-            and abs(self.start_pos[1] - self.end_pos[1]) == 1
-            and self.captured_piece == "__"
-        ):
-            return True
-
-        return False
-
     @property
     def en_passant_pos(self) -> tuple[int, int] | None:
         """return the possition of opponent's pawn if the move is en_passant.
@@ -185,22 +211,6 @@ class Move:
             return (self.start_pos[0], self.end_pos[1])
         return None
 
-    @property
-    def is_castle(self) -> bool:
-        """check to see if the move is Castling.
-
-        Args:
-
-        Returns:
-            bool:
-        """
-        if self.start_pos is None or self.end_pos is None:
-            return False
-        if self.moved_piece[1] == "K" and self.start_pos[0] == self.end_pos[0]:
-            if self.end_pos[1] - self.start_pos[1] in [2, -2, 3, -4]:
-                return True
-        return False
-
     def get_castle_type(self) -> str | None:
         """get the type of Castling if the move is Castling.
 
@@ -269,6 +279,20 @@ class Move:
             + promotion
         )
 
+    @property
+    def notation(self) -> str | None:
+        """return the chess notation of the move. it's only built when it's needed.
+
+        Args:
+
+        Returns:
+            str | None:
+        """
+        notation = self.get_notation()
+        if notation is None:
+            return None
+        return notation + self.notation_suffix
+
     def update_notation(self, notation_part: str) -> None:
         """update the notaion based on the given notation_part.
 
@@ -278,7 +302,7 @@ class Move:
         Returns:
             None:
         """
-        self.notation = self.get_notation() + notation_part
+        self.notation_suffix = notation_part
 
     # def get_symbols_notation(self):
     #     if self.notation[0] in ["K", "Q", "R", "B", "N"]:
@@ -337,53 +361,70 @@ class Move:
         return not self == other
 
     @staticmethod
-    def set_row_col_move_notation(
-        move: Move,
-        board_state: list[list[str]],
-        turn_to_move: str,
-        castle_rights: dict[str, bool],
-        king_pos: tuple[int, int],
-        last_move: Move | None,
-    ) -> str:
+    def from_encoded(
+        encoded_move: int, board_state: list[list[str]], turn_to_move: str
+    ) -> Move:
+        """return the move object of the encoded move used by the move generator and the engine.
+
+        Args:
+            encoded_move (int): encoded_move
+            board_state (list[list[str]]): board_state
+            turn_to_move (str): turn_to_move
+
+        Returns:
+            Move:
+        """
+        start = get_move_start(encoded_move)
+        end = get_move_end(encoded_move)
+
+        move = Move(
+            (start >> 3, start & 7), (end >> 3, end & 7), board_state, turn_to_move
+        )
+
+        if get_move_type(encoded_move) == PROMOTION:
+            move.promoted_piece = (
+                f"{turn_to_move}{promotion_pieces[get_promotion_type(encoded_move)]}"
+            )
+        move.encoded_move = encoded_move
 
-        from ..logics import get_possible_moves, is_valid
+        return move
+
+    @staticmethod
+    def set_row_col_move_notation(move: Move, position: Position) -> str:
+        """return move notaition modification based on the other pieces that can reach the end_pos.
+
+        Args:
+            move (Move): move
+            position (Position): position
+
+        Returns:
+            str:
+        """
+
+        from ..logics import get_valid_moves
 
         row_col_notation: str = ""
-        move_list: list[Move] = []
         row_flag: bool = False
         col_flag: bool = False
 
         if move.moved_piece[1] in ["P", "K"]:
             return row_col_notation
 
-        for row in range(8):
-            for col in range(8):
-
-                if (
-                    board_state[row][col] == move.moved_piece
-                    and (row, col) != move.start_pos
-                ):
-
-                    moves_to_check = get_possible_moves(
-                        board_state,
-                        (row, col),
-                        turn_to_move,
-                        last_move,
-                        castle_rights,
-                    )
-                    for check_move in moves_to_check:
-                        if move.end_pos == check_move.end_pos and is_valid(
-                            board_state,
-                            check_move,
-                            turn_to_move,
-                            king_pos,
-                        ):
-                            move_list.append(check_move)
-
-        for check_move in move_list:
-            if col_flag is False and move.start_pos[0] == check_move.start_pos[0]:
+        start_square = move.start_pos[0] * 8 + move.start_pos[1]
+        end_square = move.end_pos[0] * 8 + move.end_pos[1]
+
+        for check_move in get_valid_moves(position):
+            check_start = get_move_start(check_move)
+            if (
+                get_move_end(check_move) != end_square
+                or check_start == start_square
+                or position.mailbox[check_start] != position.mailbox[start_square]
+            ):
+                continue
+
+            if col_flag is False and move.start_pos[0] == check_start >> 3:
                 col_flag = True
-            if row_flag is False and move.start_pos[1] == check_move.start_pos[1]:
+            if row_flag is False and move.start_pos[1] == check_start & 7:
                 row_flag = True
 
             if row_flag and col_flag:
@@ -398,59 +439,38 @@ class Move:
         return row_col_notation
 
     @staticmethod
-    def from_notation(
-        notation: str,
-        board_state: list[list[str]],
-        turn_to_move: str,
-        last_move: Move | None,
-        castle_rights: dict[str, bool],
-        king_pos: tuple[int, int],
-    ) -> Move | None:
+    def from_notation(notation: str, position: Position) -> Move | None:
         """return the move based on the given notaion.
 
         Args:
             notation (str): notation
-            board_state (list[list[str]]): board_state
-            turn_to_move (str): turn_to_move
-            last_move (Move | None): last_move
-            castle_rights (dict[str, bool]): castle_rights
-            king_pos (tuple[int, int]): king_pos
+            position (Position): position
 
         Returns:
             Move | None:
         """
 
-        from ..logics import get_possible_moves
+        from ..logics import get_valid_moves
 
+        turn_to_move = position.turn_to_move
         piece = (
             f"{turn_to_move}{notation[0]}"
             if notation[0] in ["K", "Q", "R", "B", "N"]
             else f"{turn_to_move}P"
         )
 
-        move_notation = notation if notation[-1] != "+" else notation[:-1]
-
-        for row in range(8):
-            for col in range(8):
-                move_list = get_possible_moves(
-                    board_state,
-                    (row, col),
-                    turn_to_move,
-                    last_move,
-                    castle_rights,
-                    piece,
-                )
+        move_notation = notation if notation[-1] not in ["+", "#"] else notation[:-1]
+
+        board_state = position.board_state
+
+        for encoded_move in get_valid_moves(position):
+            start = get_move_start(encoded_move)
+            if board_state[start >> 3][start & 7] != piece:
+                continue
+
+            move = Move.from_encoded(encoded_move, board_state, turn_to_move)
+            move.row_col_notation = Move.set_row_col_move_notation(move, position)
 
-                for move in move_list:
-                    move.row_col_notation = Move.set_row_col_move_notation(
-                        move,
-                        board_state,
-                        turn_to_move,
-                        castle_rights,
-                        king_pos,
-                        last_move,
-                    )
-
-                    if move.notation == move_notation:
-                        return move
+            if move.notation == move_notation:
+                return move
         return None
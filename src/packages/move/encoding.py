@@ -0,0 +1,148 @@
+# moves used by the move generator and the engine are packed in an integer:
+#   bits 0-5   start square
+#   bits 6-11  end square
+#   bits 12-13 promotion piece type - 1 (knight, bishop, rook, queen)
+#   bits 14-15 move type
+#   bits 16-19 moved piece index
+#   bits 20-23 captured piece index (12 for no capture, en_passant included)
+
+NORMAL_MOVE: int = 0
+PROMOTION: int = 1
+EN_PASSANT: int = 2
+CASTLE: int = 3
+
+# the 16 bit part of the move (squares, promotion and move type) that identifies it in a possition
+SHORT_MOVE_MASK: int = 0xFFFF
+
+# piece index of an empty square, same as EMPTY in packages.logics.bitboard
+NO_PIECE: int = 12
+
+
+def encode_move(
+    start: int,
+    end: int,
+    move_type: int = NORMAL_MOVE,
+    promotion_type: int = 1,
+    moved_piece: int = NO_PIECE,
+    captured_piece: int = NO_PIECE,
+) -> int:
+    """pack the move into an integer.
+
+    Args:
+        start (int): start
+        end (int): end
+        move_type (int): move_type
+        promotion_type (int): promotion_type
+        moved_piece (int): moved_piece
+        captured_piece (int): captured_piece
+
+    Returns:
+        int:
+    """
+    return (
+        start
+        | end << 6
+        | (promotion_type - 1) << 12
+        | move_type << 14
+        | moved_piece << 16
+        | captured_piece << 20
+    )
+
+
+def get_move_start(move: int) -> int:
+    """return the start square of the move.
+
+    Args:
+        move (int): move
+
+    Returns:
+        int:
+    """
+    return move & 63
+
+
+def get_move_end(move: int) -> int:
+    """return the end square of the move.
+
+    Args:
+        move (int): move
+
+    Returns:
+        int:
+    """
+    return (move >> 6) & 63
+
+
+def get_move_type(move: int) -> int:
+    """return the type of the move.
+
+    Args:
+        move (int): move
+
+    Returns:
+        int:
+    """
+    return (move >> 14) & 3
+
+
+def get_promotion_type(move: int) -> int:
+    """return the promoted piece type if the move is a promotion.
+
+    Args:
+        move (int): move
+
+    Returns:
+        int:
+    """
+    return ((move >> 12) & 3) + 1
+
+
+def get_moved_piece(move: int) -> int:
+    """return the piece index of the moved piece.
+
+    Args:
+        move (int): move
+
+    Returns:
+        int:
+    """
+    return (move >> 16) & 15
+
+
+def get_captured_piece(move: int) -> int:
+    """return the piece index of the captured piece, NO_PIECE if the move isn't a capture.
+
+    Args:
+        move (int): move
+
+    Returns:
+        int:
+    """
+    return (move >> 20) & 15
+
+
+def get_square_name(square: int) -> str:
+    """return the name of the square on the chess board, for example "e4".
+
+    Args:
+        square (int): square
+
+    Returns:
+        str:
+    """
+    return f"{'abcdefgh'[square & 7]}{8 - (square >> 3)}"
+
+
+def get_uci_notation(move: int) -> str:
+    """return the long algebraic notation of the move, for example "e2e4" or "e7e8q".
+
+    Args:
+        move (int): move
+
+    Returns:
+        str:
+    """
+    notation = get_square_name(move & 63) + get_square_name((move >> 6) & 63)
+    if (move >> 14) & 3 == PROMOTION:
+        notation += "nbrq"[(move >> 12) & 3]
+    return notation
@@ -171,3 +171,77 @@ bK_end_game_table = [
     [0.3, 0.2, 0.1, -0.0, -0.0, 0.1, 0.2, 0.3],
     [0.5, 0.4, 0.3, 0.2, 0.2, 0.3, 0.4, 0.5],
 ]
+
+
+# value of each piece type indexed the same way as the move generator (P, N, B, R, Q, K)
+piece_type_evaluation: list[float] = [
+    piece_evaluation[piece] for piece in ["P", "N", "B", "R", "Q", "K"]
+]
+
+# square tables flattened to 64 squares and indexed by piece index (wP ... wK, bP ... bK)
+middle_game_square_tables: list[list[float]] = [
+    [value for row in table for value in row]
+    for table in [
+        wP_table,
+        wN_table,
+        wB_table,
+        wR_table,
+        wQ_table,
+        wK_middle_game_table,
+        bP_table,
+        bN_table,
+        bB_table,
+        bR_table,
+        bQ_table,
+        bK_middle_game_table,
+    ]
+]
+
+end_game_square_tables: list[list[float]] = [
+    [value for row in table for value in row]
+    for table in [
+        wP_table,
+        wN_table,
+        wB_table,
+        wR_table,
+        wQ_table,
+        wK_end_game_table,
+        bP_table,
+        bN_table,
+        bB_table,
+        bR_table,
+        bQ_table,
+        bK_end_game_table,
+    ]
+]
+
+# material plus square value of every piece index on every square, positive for white.
+# the values are indexed by square then by piece, the piece EMPTY is 0, so the values
+# of a mailbox are summed with one map over it's squares.
+middle_game_piece_square_values: list[list[float]] = [
+    [
+        (
+            piece_type_evaluation[piece % 6]
+            if piece < 6
+            else -piece_type_evaluation[piece % 6]
+        )
+        + table[square]
+        for piece, table in enumerate(middle_game_square_tables)
+    ]
+    + [0.0]
+    for square in range(64)
+]
+
+end_game_piece_square_values: list[list[float]] = [
+    [
+        (
+            piece_type_evaluation[piece % 6]
+            if piece < 6
+            else -piece_type_evaluation[piece % 6]
+        )
+        + table[square]
+        for piece, table in enumerate(end_game_square_tables)
+    ]
+    + [0.0]
+    for square in range(64)
+]
@@ -0,0 +1,43 @@
+# python -m pytest tests, from the src directory
+from packages.logics import Position, ZobristKeys, get_valid_moves
+from packages.engine.best_move import get_best_move
+from packages.engine.worker_pool import create_worker_pool
+from packages.engine.transposition_table import TranspositionTable
+from packages.engine.time_control import MOVE_OVERHEAD
+
+import time
+
+# time the search may take after it's hard deadline, to unwind and collect the results
+DEADLINE_TOLERANCE: float = 0.15
+
+# middle game possitions where a depth takes longer than the time of the search
+test_positions: list[str] = [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+]
+
+
+def test_search_stops_at_hard_deadline() -> None:
+    zobrist_hash_keys = ZobristKeys.from_file(
+        r"./packages/utils/zobrist_hash_keys.json"
+    )
+    worker_pool = create_worker_pool(zobrist_hash_keys)
+    try:
+        for fen in test_positions:
+            for move_time in [1.0, 2.0]:
+                position = Position.from_fen(fen, zobrist_hash_keys)
+                start_time = time.time()
+                best_move, _ = get_best_move(
+                    get_valid_moves(position),
+                    position,
+                    None,
+                    worker_pool,
+                    TranspositionTable(4),
+                    move_time=move_time,
+                )
+                elapsed_time = time.time() - start_time
+
+                assert best_move is not None
+                assert elapsed_time <= move_time - MOVE_OVERHEAD + DEADLINE_TOLERANCE
+    finally:
+        worker_pool.shutdown()
@@ -0,0 +1,57 @@
+# python -m pytest tests, from the src directory
+from packages.logics import Position, ZobristKeys, get_valid_moves
+from packages.engine.best_move import get_best_move
+from packages.engine.worker_pool import create_worker_pool
+from packages.engine.transposition_table import (
+    TranspositionTable,
+    EXACT,
+    get_table_score,
+)
+
+
+def test_stored_score_is_table_score() -> None:
+    transposition_table = TranspositionTable(1)
+    transposition_table.store(1, 3, 0.1, EXACT, 0)
+    hash_entry = transposition_table.probe(1)
+
+    assert hash_entry is not None
+    assert hash_entry[1] != 0.1
+    assert hash_entry[1] == get_table_score(0.1)
+
+
+def test_root_table_only_holds_root_moves() -> None:
+    zobrist_hash_keys = ZobristKeys.from_file(
+        r"./packages/utils/zobrist_hash_keys.json"
+    )
+    position = Position.from_fen(
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10",
+        zobrist_hash_keys,
+    )
+    valid_moves = get_valid_moves(position)
+    root_move_hashes: set[int] = set()
+    for move in valid_moves:
+        position.push(move)
+        root_move_hashes.add(position.hash)
+        position.pop()
+
+    transposition_table = TranspositionTable(1)
+    worker_pool = create_worker_pool(zobrist_hash_keys)
+    try:
+        get_best_move(
+            valid_moves,
+            position,
+            None,
+            worker_pool,
+            transposition_table,
+            max_depth=3,
+        )
+    finally:
+        worker_pool.shutdown()
+
+    entries = transposition_table.entries
+    stored_hashes = {
+        entries[index] ^ entries[index + 1]
+        for index in range(0, len(entries), 2)
+        if entries[index + 1]
+    }
+    assert stored_hashes == root_move_hashes